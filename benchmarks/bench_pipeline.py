@@ -0,0 +1,180 @@
+"""
+Wall time, API requests and stage timings of `main.run`, end to end, offline.
+
+    python -m benchmarks.bench_pipeline [--runs 2] [--latency 0.05] [--report PATH]
+
+The football-data and Nominatim clients are pointed at a local
+`benchmarks.stub_server`, with their caches and venue store in a temporary
+directory shared by the runs: the first run starts cold, the later ones show
+what the caches save. The client-side quotas default to the production ones;
+raise them to measure the rest of the pipeline.
+"""
+
+import argparse
+import io
+import json
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple
+
+import profiling
+import venues
+from connectors import football_data, open_street_map
+from main import run
+from travel.search import SearchEngine
+from venues.venues import REQUESTS_PER_SECOND
+from .stub_server import StubServer, add_stub_arguments, stub_server
+
+# The client-side counters worth a column, in report order
+COUNTERS = [
+    "football_data.requests",
+    "football_data.retries",
+    "football_data.cache_hits",
+    "football_data.rate_limit_wait_seconds",
+    "nominatim.requests",
+    "geocode.cache_hits",
+    "geocode.rate_limit_wait_seconds",
+]
+
+
+class PipelineOptions(NamedTuple):
+    min_games: int = 3
+    max_days: int = 5
+    max_dist: float = 50.0
+    days_ahead: int = 30
+    engine: SearchEngine = SearchEngine.DFS
+    football_requests_per_minute: float = football_data.REQUESTS_PER_MINUTE
+    nominatim_requests_per_second: float = REQUESTS_PER_SECOND
+
+
+class RunResult(NamedTuple):
+    seconds: float
+    stub_requests: dict[str, int]  # "api status" -> answers
+    report: dict[str, Any]  # `profiling.Profiler.report()` of the run
+
+
+@contextmanager
+def stub_clients(server: StubServer, state_dir: Path) -> Iterator[None]:
+    """
+    Point the API clients at `server`, with their caches and venue store in
+    `state_dir`; the defaults are restored on exit.
+    """
+    football_data.set_base_url(f"{server.url}/v4")
+    football_data.set_cache_dir(state_dir / "football_data")
+    open_street_map.set_url(f"{server.url}/search")
+    venues.set_store(venues.SqliteVenueStore(state_dir / "venues.sqlite3"))
+    venues.set_distance_matrix(venues.DistanceMatrix())
+    try:
+        yield
+    finally:
+        football_data.set_base_url(None)
+        football_data.set_cache_dir(None)
+        football_data.set_rate_limit(None)
+        open_street_map.set_url(None)
+        venues.set_store(None)
+        venues.set_distance_matrix(None)
+        venues.set_rate_limit(None)
+
+
+def run_pipeline(server: StubServer, options: PipelineOptions) -> RunResult:
+    """
+    One `main.run` against `server`, through clients set up by `stub_clients`.
+    The options are printed to a buffer, not the terminal.
+    """
+    football_data.set_rate_limit(options.football_requests_per_minute)
+    venues.set_rate_limit(options.nominatim_requests_per_second)
+    before = server.requests.copy()
+    with profiling.profile() as profiler, redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        run(
+            min_games=options.min_games,
+            max_days=options.max_days,
+            max_dist=options.max_dist,
+            days_ahead=options.days_ahead,
+            engine=options.engine,
+        )
+        seconds = time.perf_counter() - started
+    requests = server.requests - before
+    return RunResult(
+        seconds,
+        {f"{api} {status}": n for (api, status), n in sorted(requests.items())},
+        profiler.report(),
+    )
+
+
+def print_run(index: int, result: RunResult) -> None:
+    report = result.report
+    options = report["gauges"].get("output.options", 0)
+    print(f"run {index}: {result.seconds:.3f}s, {options:g} options")
+    print("  stub answers")
+    for name, count in result.stub_requests.items() or [("none", 0)]:
+        print(f"    {name:<40} {count:>9}")
+    print("  client counters")
+    for name in COUNTERS:
+        print(f"    {name:<40} {report['counters'].get(name, 0):>9.6g}")
+    print("  stages (s)")
+    for name, stats in report["stages"].items():
+        print(f"    {name:<40} {stats['seconds']:>9.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    defaults = PipelineOptions()
+    parser.add_argument("--runs", type=int, default=2)
+    parser.add_argument("--min-games", type=int, default=defaults.min_games)
+    parser.add_argument("--max-days", type=int, default=defaults.max_days)
+    parser.add_argument("--max-dist", type=float, default=defaults.max_dist)
+    parser.add_argument("--days-ahead", type=int, default=defaults.days_ahead)
+    parser.add_argument(
+        "--engine",
+        type=SearchEngine,
+        choices=list(SearchEngine),
+        default=defaults.engine,
+    )
+    parser.add_argument(
+        "--football-requests-per-minute",
+        type=float,
+        default=defaults.football_requests_per_minute,
+        help="Client-side football-data quota",
+    )
+    parser.add_argument(
+        "--nominatim-requests-per-second",
+        type=float,
+        default=defaults.nominatim_requests_per_second,
+        help="Client-side geocoder throttle",
+    )
+    parser.add_argument(
+        "--report", type=Path, help="Write the runs' full results to this JSON file"
+    )
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+    options = PipelineOptions(
+        **{name: getattr(args, name) for name in PipelineOptions._fields}
+    )
+
+    server = stub_server(("127.0.0.1", 0), args)
+    server.start()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as state_dir, stub_clients(
+            server, Path(state_dir)
+        ):
+            for index in range(1, args.runs + 1):
+                results.append(run_pipeline(server, options))
+                print_run(index, results[-1])
+    finally:
+        server.shutdown()
+        server.server_close()
+    if args.report:
+        args.report.write_text(
+            json.dumps([r._asdict() for r in results], indent=2) + "\n",
+            encoding="utf-8",
+        )
+        print(f"Report written to {args.report}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
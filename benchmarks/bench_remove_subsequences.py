@@ -0,0 +1,80 @@
+"""
+Scaling of travel.utils.remove_subsequences against the original quadratic scan.
+
+    python -m benchmarks.bench_remove_subsequences [--sizes 1000 5000 20000]
+
+Sample run (paths / maximal / indexed s / quadratic s):
+    1000     485   0.007    0.224
+    5000    2446   0.029    6.308
+   20000    9843   0.139  skipped
+  100000   49213   0.916  skipped
+"""
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from data_classes import Candidate
+from travel.utils import is_subsequence, remove_subsequences
+
+
+def remove_subsequences_quadratic(tuples_set: set[Candidate]) -> set[Candidate]:
+    result: set[Candidate] = set()
+    for tpl in sorted(tuples_set, key=len, reverse=True):
+        if any(is_subsequence(tpl, other) for other in result):
+            continue
+        result.add(tpl)
+    return result
+
+
+def random_paths(size: int, seed: int = 0) -> set[Candidate]:
+    """
+    Raw DFS-like output: increasing node sequences inside sliding time windows,
+    plus many of their sub-paths.
+    """
+    rng = random.Random(seed)
+    nodes = max(size // 4, 10)
+    paths: set[Candidate] = set()
+    while len(paths) < size:
+        start = rng.randrange(nodes)
+        window = range(start, min(start + 25, nodes))
+        path = tuple(sorted(rng.sample(window, min(rng.randint(2, 7), len(window)))))
+        paths.add(path)
+        if len(path) > 2 and len(paths) < size:
+            paths.add(path[: rng.randint(1, len(path) - 1)])
+    return paths
+
+
+def _time(function: Callable[[set[Candidate]], set[Candidate]], paths) -> float:
+    started = time.perf_counter()
+    function(paths)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument(
+        "--quadratic-limit",
+        type=int,
+        default=5000,
+        help="Skip the quadratic reference above this many paths",
+    )
+    args = parser.parse_args()
+
+    print(f"{'paths':>8} {'maximal':>8} {'indexed (s)':>12} {'quadratic (s)':>14}")
+    for size in args.sizes:
+        paths = random_paths(size)
+        maximal = len(remove_subsequences(paths))
+        indexed = _time(remove_subsequences, paths)
+        quadratic = (
+            f"{_time(remove_subsequences_quadratic, paths):14.3f}"
+            if size <= args.quadratic_limit
+            else f"{'skipped':>14}"
+        )
+        print(f"{size:>8} {maximal:>8} {indexed:12.3f} {quadratic}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Time and peak memory of each travel engine stage on synthetic seasons.
+
+    python -m benchmarks.bench_travel [--tiers small medium] [--update-baseline]
+
+Every stage runs twice: once timed, once under tracemalloc for its peak
+allocation. Results are compared with benchmarks/baselines.json; a stage whose
+output changed, or whose time or memory grew past the tolerance, is reported
+and makes the run exit with status 1. Fully offline.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import venues
+from data_classes import Match
+from travel import search
+from travel.builders import GraphBuilder, build_graph
+from travel.travel import TravelGraph
+from travel.utils import all_equivalent_paths, remove_subsequences
+from .fixtures import FixtureSpec, synthetic_matches
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines.json"
+MAX_DIST = 50.0
+MAX_DAYS = 5
+MIN_GAMES = 3
+# Slower or larger than baseline by this factor counts as a regression...
+TOLERANCE = 1.5
+# ...unless the difference is below these, which is measurement noise
+MIN_SECONDS = 0.05
+MIN_BYTES = 1 << 20
+
+TIERS = {
+    "small": FixtureSpec(leagues=4, horizon_days=60),
+    "medium": FixtureSpec(leagues=12, horizon_days=150),
+    "large": FixtureSpec(leagues=24, horizon_days=300, rounds_per_week=1.5),
+}
+
+
+class StageResult(NamedTuple):
+    seconds: float
+    peak_bytes: int
+    output: int  # size of the stage's result, to catch behaviour changes
+
+
+def run_tier(matches: list[Match], builder: GraphBuilder) -> dict[str, StageResult]:
+    """
+    Run every stage of `TravelGraph.find_paths` once, feeding each the output
+    of the previous ones.
+    """
+    results: dict[str, StageResult] = {}
+
+    def stage(name: str, function: Callable[[], Any]) -> Any:
+        output, results[name] = _measure(function)
+        return output
+
+    graph = stage(
+        "build_graph", lambda: build_graph(matches, MAX_DIST, MAX_DAYS, builder)
+    )
+    travel_graph = TravelGraph.from_parts(
+        matches, graph, {}, max_dist=MAX_DIST, max_days=MAX_DAYS
+    )
+    groups = stage("group_equivalent_nodes", travel_graph.group_equivalent_nodes)
+    travel_graph.equiv_dict = {min(group): group for group in groups}
+    problem = travel_graph._search_problem()  # pylint: disable=protected-access
+
+    raw_paths = stage("dfs_paths", lambda: search.dfs_paths(problem, MIN_GAMES))
+    stage("remove_subsequences", lambda: remove_subsequences(raw_paths))
+    paths = stage(
+        "dag_maximal_paths",
+        lambda: search.maximal_paths(problem, MIN_GAMES, search.SearchEngine.DAG),
+    )
+    stage(
+        "all_equivalent_paths",
+        lambda: all_equivalent_paths(paths, travel_graph.equiv_dict),
+    )
+    return results
+
+
+def _measure(function: Callable[[], Any]) -> tuple[Any, StageResult]:
+    started = time.perf_counter()
+    output = function()
+    seconds = time.perf_counter() - started
+    del output
+    tracemalloc.start()
+    output = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output, StageResult(seconds, peak, _size(output))
+
+
+def _size(output: Any) -> int:
+    if isinstance(output, list) and output and hasattr(output[0], "outgoing"):
+        return sum(len(node.outgoing) for node in output)
+    return len(output)
+
+
+def regressions(
+    results: dict[str, StageResult], baseline: dict[str, list], tolerance: float
+) -> list[str]:
+    problems = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = StageResult(*baseline[name])
+        if result.output != expected.output:
+            problems.append(f"{name}: output {result.output} != {expected.output}")
+        if _worse(result.seconds, expected.seconds, tolerance, MIN_SECONDS):
+            problems.append(f"{name}: {result.seconds:.3f}s vs {expected.seconds:.3f}s")
+        if _worse(result.peak_bytes, expected.peak_bytes, tolerance, MIN_BYTES):
+            problems.append(
+                f"{name}: {_mib(result.peak_bytes)} vs {_mib(expected.peak_bytes)}"
+            )
+    return problems
+
+
+def _worse(value: float, expected: float, tolerance: float, noise: float) -> bool:
+    return value > expected * tolerance and value - expected > noise
+
+
+def _mib(size: int) -> str:
+    return f"{size / (1 << 20):.1f} MiB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tiers", nargs="+", choices=list(TIERS), default=list(TIERS))
+    parser.add_argument(
+        "--builder", type=GraphBuilder, choices=list(GraphBuilder), default="grid"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store this run's results as the new baseline",
+    )
+    args = parser.parse_args()
+    # keep --builder matrix from writing the shared matrix files
+    venues.set_distance_matrix(venues.DistanceMatrix())
+
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    problems = []
+    for tier in args.tiers:
+        matches = synthetic_matches(TIERS[tier])
+        results = run_tier(matches, args.builder)
+        print(f"{tier}: {len(matches)} matches")
+        print(f"  {'stage':<24} {'time (s)':>9} {'peak':>11} {'output':>9}")
+        for name, result in results.items():
+            print(
+                f"  {name:<24} {result.seconds:9.3f} "
+                f"{_mib(result.peak_bytes):>11} {result.output:>9}"
+            )
+        key = f"{tier}/{args.builder}"
+        problems += [
+            f"{key} {problem}"
+            for problem in regressions(results, baselines.get(key, {}), args.tolerance)
+        ]
+        baselines[key] = {name: list(result) for name, result in results.items()}
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+    elif problems:
+        print("Regressions:", *problems, sep="\n  ")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Seeded synthetic fixture lists, shaped like a multi-league season: every league
+plays in a few cities, each city has a handful of stadiums scattered around
+its centre, and teams play weekly rounds spread over the weekend.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from data_classes import Location, Match
+
+EARTH_KM_PER_DEGREE = 111.2
+# Kick-off slots of a round: (days after Friday, hour)
+KICKOFFS = [(0, 20), (1, 13), (1, 15), (1, 18), (2, 14), (2, 16), (2, 20), (3, 20)]
+# Some rounds are played midweek instead
+MIDWEEK_KICKOFFS = [(4, 19), (4, 21), (5, 19), (5, 21)]
+SEASON_START = datetime(2025, 8, 15)  # a Friday
+
+
+class FixtureSpec(NamedTuple):
+    leagues: int = 4
+    leagues_per_country: int = 2  # leagues of a country share its cities
+    teams_per_league: int = 20
+    cities_per_league: int = 6
+    venues_per_city: int = 3
+    city_radius_km: float = 15.0
+    horizon_days: int = 90
+    rounds_per_week: float = 1.0  # match density: rounds per team per week
+    midweek_share: float = 0.2
+    seed: int = 0
+
+
+def synthetic_matches(spec: FixtureSpec) -> list[Match]:
+    """
+    Matches of `spec.leagues` leagues over `spec.horizon_days` from the
+    season start, sorted by date. The same spec always gives the same list.
+    """
+    rng = random.Random(spec.seed)
+    matches = []
+    for league in range(spec.leagues):
+        grounds = _home_grounds(rng, spec, league)
+        teams = [f"L{league} Team {t}" for t in range(spec.teams_per_league)]
+        for round_start in _round_starts(rng, spec):
+            order = rng.sample(range(len(teams)), len(teams))
+            slots = MIDWEEK_KICKOFFS if rng.random() < spec.midweek_share else KICKOFFS
+            for home, away in zip(order[::2], order[1::2]):
+                day, hour = rng.choice(slots)
+                date = round_start + timedelta(days=day, hours=hour)
+                if (date - SEASON_START).days < spec.horizon_days:
+                    matches.append(Match(teams[home], teams[away], date, grounds[home]))
+    return sorted(matches, key=lambda m: m.date)
+
+
+def _home_grounds(rng: random.Random, spec: FixtureSpec, league: int) -> list[Location]:
+    # Countries sit on a coarse grid, far enough apart not to mix
+    country = league // spec.leagues_per_country
+    centre = Location(40 + 4 * (country % 4), -5 + 8 * (country // 4))
+    country_rng = random.Random(f"{spec.seed}-{country}")
+    cities = [_offset(country_rng, centre, 300) for _ in range(spec.cities_per_league)]
+    venues = [
+        _offset(rng, city, spec.city_radius_km)
+        for city in cities
+        for _ in range(spec.venues_per_city)
+    ]
+    return [rng.choice(venues) for _ in range(spec.teams_per_league)]
+
+
+def _round_starts(rng: random.Random, spec: FixtureSpec) -> list[datetime]:
+    rounds = int(spec.horizon_days / 7 * spec.rounds_per_week) + 1
+    step = 7 / spec.rounds_per_week
+    return [
+        SEASON_START + timedelta(days=round(i * step + rng.random() * 0.5))
+        for i in range(rounds)
+    ]
+
+
+def _offset(rng: random.Random, centre: Location, radius_km: float) -> Location:
+    distance = radius_km * math.sqrt(rng.random())
+    bearing = rng.uniform(0, 2 * math.pi)
+    lat = centre.latitude + distance * math.cos(bearing) / EARTH_KM_PER_DEGREE
+    lon = centre.longitude + distance * math.sin(bearing) / (
+        EARTH_KM_PER_DEGREE * math.cos(math.radians(centre.latitude))
+    )
+    return Location(round(lat, 6), round(lon, 6))
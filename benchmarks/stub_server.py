@@ -0,0 +1,383 @@
+"""
+Local stand-in for football-data.org and Nominatim, for offline end-to-end runs.
+
+    python -m benchmarks.stub_server [--port 8001] [--latency 0.05] [--jitter 0.02]
+    FOOTBALL_API_URL=http://127.0.0.1:8001/v4 \\
+    NOMINATIM_URL=http://127.0.0.1:8001/search python main.py
+
+Serves GET /v4/competitions/{id}/matches, /v4/competitions/{id}/teams and
+/search from synthetic fixtures, or from responses recorded in a football-data
+cache directory and a venue store. Each API can be given a latency with
+jitter, a request quota and a share of random 429 answers.
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import suppress
+from datetime import date, datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+from connectors.fixture_store import FixtureStore, match_key
+from connectors.football_data import LeagueId
+from connectors.rate_limit import TokenBucket
+from data_classes import Location
+from venues import VenueStore
+from .fixtures import SEASON_START, FixtureSpec, synthetic_matches
+
+logger = logging.getLogger(__name__)
+
+FOOTBALL_PREFIX = "/v4/competitions/"
+SEARCH_PATH = "/search"
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class StubConfig(NamedTuple):
+    latency: float = 0.0  # seconds added to every answer...
+    jitter: float = 0.0  # ...give or take up to this much
+    requests_per_minute: float | None = None  # beyond it, 429 with Retry-After
+    throttle_share: float = 0.0  # share of requests answered 429 regardless
+    retry_after: float = 1.0  # Retry-After of those random 429s
+
+
+class Competition(NamedTuple):
+    matches: list[dict[str, Any]]
+    teams: list[dict[str, Any]]
+
+
+class StubData(NamedTuple):
+    competitions: dict[str, Competition]
+    places: dict[str, Location]  # Nominatim query -> result
+
+    @classmethod
+    def synthetic(
+        cls,
+        spec: FixtureSpec,
+        start: datetime,
+        competitions: list[str] | None = None,
+    ) -> "StubData":
+        """
+        League `i` of `synthetic_matches(spec)` as competition `competitions[i]`
+        (the `LeagueId`s by default), its season moved to begin on `start`.
+        Grounds are named after their position, so teams sharing one share
+        its name.
+        """
+        competitions = competitions or list(LeagueId)
+        shift = start.replace(tzinfo=None) - SEASON_START
+        venue_names: dict[Location, str] = {}
+        matches: dict[str, list[dict[str, Any]]] = {c: [] for c in competitions}
+        grounds: dict[str, dict[str, str]] = {c: {} for c in competitions}
+        fixtures = synthetic_matches(spec._replace(leagues=len(competitions)))
+        for match_id, m in enumerate(fixtures):
+            competition = competitions[int(m.home_team.split()[0][1:])]
+            venue = venue_names.setdefault(m.location, f"Stadium {len(venue_names)}")
+            grounds[competition][m.home_team] = venue
+            matches[competition].append(
+                {
+                    "id": match_id,
+                    "utcDate": (m.date + shift).strftime(TIME_FORMAT),
+                    "homeTeam": {"name": m.home_team},
+                    "awayTeam": {"name": m.away_team},
+                }
+            )
+        return cls(
+            {
+                c: Competition(
+                    matches[c],
+                    [{"name": t, "venue": v} for t, v in grounds[c].items()],
+                )
+                for c in competitions
+            },
+            {name: location for location, name in venue_names.items()},
+        )
+
+    @classmethod
+    def recorded(cls, cache_dir: Path, store: VenueStore) -> "StubData":
+        """
+        Responses of a football-data cache directory: the teams in its
+        `ResponseCache`, the fixtures in its `FixtureStore` or, from before
+        there was one, every cached date range merged. Places are those of
+        `store`.
+        """
+        matches: dict[str, dict[str, dict[str, Any]]] = {}
+        teams: dict[str, list[dict[str, Any]]] = {}
+        for path in sorted(cache_dir.glob("*.json")):
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            resource = urlsplit(entry["url"]).path.rstrip("/").split("/")
+            competition, kind = resource[-2], resource[-1]
+            body = entry["response"]["body"]
+            if kind == "teams":
+                teams[competition] = body["teams"]
+            elif kind == "matches":
+                merged = matches.setdefault(competition, {})
+                merged.update((match_key(f), f) for f in body["matches"])
+        fixture_store = FixtureStore(cache_dir / "fixtures")
+        for path in sorted(fixture_store.directory.glob("*.json")):
+            matches.setdefault(path.stem, {}).update(
+                (match_key(f), f)
+                for f in fixture_store.matches(path.stem, date.min, date.max)
+            )
+        return cls(
+            {
+                c: Competition(list(matches.get(c, {}).values()), teams.get(c, []))
+                for c in sorted(set(matches) | set(teams))
+            },
+            {
+                query: entry.location
+                for query, entry in store.items()
+                if entry.location is not None
+            },
+        )
+
+    def fixtures(self, competition: str, date_from: str, date_to: str) -> list[dict]:
+        """
+        Matches of `competition` on days `date_from` to `date_to`, both included.
+        """
+        return sorted(
+            (
+                f
+                for f in self.competitions[competition].matches
+                if date_from <= f["utcDate"][:10] <= date_to
+            ),
+            key=lambda f: f["utcDate"],
+        )
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Serves `data`, each API behaving as its `StubConfig` says. `requests`
+    counts answers by (API, status).
+    """
+
+    daemon_threads = True
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        address: tuple[str, int],
+        data: StubData,
+        *,
+        football: StubConfig = StubConfig(),
+        nominatim: StubConfig = StubConfig(),
+        seed: int = 0,
+    ):
+        super().__init__(address, StubRequestHandler)
+        self.data = data
+        self.configs = {"football_data": football, "nominatim": nominatim}
+        self.quotas = {
+            api: TokenBucket.per_minute(config.requests_per_minute)
+            for api, config in self.configs.items()
+            if config.requests_per_minute
+        }
+        self.requests: Counter[tuple[str, int]] = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def delay(self, api: str) -> float:
+        config = self.configs[api]
+        with self._lock:
+            return max(config.latency + self._rng.uniform(-1, 1) * config.jitter, 0.0)
+
+    def throttled(self, api: str) -> float | None:
+        """
+        Retry-After of a 429 for this request, or None to answer it.
+        """
+        quota = self.quotas.get(api)
+        wait = quota.try_acquire() if quota else 0.0
+        if wait > 0:
+            return wait
+        with self._lock:
+            if self._rng.random() < self.configs[api].throttle_share:
+                return self.configs[api].retry_after
+        return None
+
+    def count(self, api: str, status: int) -> None:
+        with self._lock:
+            self.requests[api, status] += 1
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        url = urlsplit(self.path)
+        query = {key: value[-1] for key, value in parse_qs(url.query).items()}
+        if url.path.startswith(FOOTBALL_PREFIX):
+            self._answer("football_data", lambda: self._football(url.path, query))
+        elif url.path == SEARCH_PATH:
+            self._answer("nominatim", lambda: self._search(query))
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"message": f"Unknown path {url.path}"})
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=W0622
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _answer(self, api: str, body: Any) -> None:
+        time.sleep(self.server.delay(api))
+        retry_after = self.server.throttled(api)
+        if retry_after is not None:
+            self.server.count(api, HTTPStatus.TOO_MANY_REQUESTS)
+            self._send(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                {"message": "Too many requests"},
+                {"Retry-After": str(math.ceil(retry_after))},
+            )
+            return
+        status, payload = body()
+        self.server.count(api, status)
+        self._send(status, payload)
+
+    def _football(self, path: str, query: dict[str, str]) -> tuple[HTTPStatus, Any]:
+        competition, _, resource = path[len(FOOTBALL_PREFIX) :].partition("/")
+        if competition not in self.server.data.competitions:
+            return HTTPStatus.NOT_FOUND, {"message": f"No competition {competition}"}
+        if resource == "teams":
+            return HTTPStatus.OK, {
+                "teams": self.server.data.competitions[competition].teams
+            }
+        if resource == "matches":
+            fixtures = self.server.data.fixtures(
+                competition, query.get("dateFrom", ""), query.get("dateTo", "~")
+            )
+            return HTTPStatus.OK, {
+                "resultSet": {"count": len(fixtures)},
+                "matches": fixtures,
+            }
+        return HTTPStatus.NOT_FOUND, {"message": f"Unknown resource {resource}"}
+
+    def _search(self, query: dict[str, str]) -> tuple[HTTPStatus, Any]:
+        location = self.server.data.places.get(query.get("q", ""))
+        if location is None:
+            return HTTPStatus.OK, []
+        return HTTPStatus.OK, [
+            {
+                "lat": str(location.latitude),
+                "lon": str(location.longitude),
+                "display_name": query["q"],
+            }
+        ]
+
+    def _send(
+        self, status: HTTPStatus, body: Any, headers: dict[str, str] | None = None
+    ) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def stub_server(address: tuple[str, int], args: argparse.Namespace) -> StubServer:
+    """
+    Server set up by `add_stub_arguments` options. Nominatim only gets the
+    latency: the geocoder gives up on a 429 rather than retrying.
+    """
+    latency = StubConfig(latency=args.latency, jitter=args.jitter)
+    return StubServer(
+        address,
+        stub_data(args),
+        football=latency._replace(
+            requests_per_minute=args.requests_per_minute,
+            throttle_share=args.throttle_share,
+            retry_after=args.retry_after,
+        ),
+        nominatim=latency,
+        seed=args.seed,
+    )
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Options for the fixtures served and how the stub answers.
+    """
+    parser.add_argument(
+        "--recorded",
+        type=Path,
+        metavar="CACHE_DIR",
+        help="Serve the football-data responses cached in this directory, and "
+        "the venues of the default venue store, instead of synthetic fixtures",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the synthetic fixtures"
+    )
+    parser.add_argument(
+        "--horizon-days",
+        type=int,
+        default=90,
+        help="Days of synthetic fixtures, from today",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Seconds per answer"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.02, help="Latency varies by up to this"
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        help="football-data quota, answered with 429 beyond it",
+    )
+    parser.add_argument(
+        "--throttle-share",
+        type=float,
+        default=0.0,
+        help="Share of football-data requests answered 429 at random",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=1.0,
+        help="Retry-After of the random 429s, in seconds",
+    )
+
+
+def stub_data(args: argparse.Namespace) -> StubData:
+    if args.recorded:
+        # imported here: opening the default store creates it
+        from venues import get_store  # pylint: disable=import-outside-toplevel
+
+        return StubData.recorded(args.recorded, get_store())
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0)
+    return StubData.synthetic(
+        FixtureSpec(horizon_days=args.horizon_days, seed=args.seed),
+        today.replace(microsecond=0),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    with stub_server((args.host, args.port), args) as server, suppress(
+        KeyboardInterrupt
+    ):
+        logger.info("Stub serving on %s", server.url)
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
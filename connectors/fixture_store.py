@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import threading
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, NamedTuple
+
+# Seconds a fetched day stays fresh, by day
+DayTtl = Callable[[date], float]
+
+
+class HeldRange(NamedTuple):
+    first: date
+    last: date  # included
+    fetched_at: float
+
+
+class LeagueFixtures(NamedTuple):
+    ranges: list[HeldRange]  # sorted, not overlapping
+    matches: dict[str, dict[str, Any]]  # by `match_key`
+
+
+class FixtureStore:
+    """
+    On-disk fixtures of each league, one file per league, with the day ranges
+    they were fetched for and when. A window is served from the days held, so
+    only the days missing from it, or held for longer than their TTL, need a
+    request; those come back as a few contiguous ranges.
+    """
+
+    def __init__(self, directory: Path, clock: Callable[[], float] = time.time):
+        self.directory = directory
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return self._clock()
+
+    def today(self) -> date:
+        return datetime.fromtimestamp(self._clock(), timezone.utc).date()
+
+    def missing(
+        self, league: str, first: date, last: date, ttl: DayTtl
+    ) -> list[tuple[date, date]]:
+        """
+        Ranges of the days from `first` to `last` not held, or held for
+        `ttl(day)` seconds or more.
+        """
+        fixtures = self._load(league)
+        now = self._clock()
+        gaps: list[tuple[date, date]] = []
+        for day in _days(first, last):
+            held = _covering(fixtures.ranges, day)
+            if held and now - held.fetched_at < ttl(day):
+                continue
+            if gaps and gaps[-1][1] == day - timedelta(days=1):
+                gaps[-1] = (gaps[-1][0], day)
+            else:
+                gaps.append((day, day))
+        return gaps
+
+    def store(
+        self, league: str, first: date, last: date, matches: list[dict[str, Any]]
+    ) -> set[str]:
+        """
+        Record `matches` as all the fixtures from `first` to `last`, fetched
+        now. Held fixtures of those days, or moved there, are replaced; days
+        both past and before `first` are dropped. Returns the keys of the
+        fixtures held on those days but no longer among `matches`: cancelled,
+        or moved to another day.
+        """
+        with self._lock:
+            fixtures = self._load(league)
+            fetched = {match_key(m): m for m in matches}
+            left = {
+                key
+                for key, m in fixtures.matches.items()
+                if first <= match_day(m) <= last and key not in fetched
+            }
+            keep_from = min(first, self.today())
+            ranges = [
+                piece
+                for held in fixtures.ranges
+                for piece in _cut(held, first, last)
+                if piece.last >= keep_from
+            ]
+            ranges.append(HeldRange(first, last, self._clock()))
+            held_matches = {
+                key: m
+                for key, m in fixtures.matches.items()
+                if key not in fetched
+                and not first <= match_day(m) <= last
+                and match_day(m) >= keep_from
+            }
+            self._save(
+                league,
+                LeagueFixtures(sorted(ranges), {**held_matches, **fetched}),
+            )
+        return left
+
+    def matches(self, league: str, first: date, last: date) -> list[dict[str, Any]]:
+        """
+        Held fixtures from `first` to `last`, by kickoff.
+        """
+        return sorted(
+            (
+                m
+                for m in self._load(league).matches.values()
+                if first <= match_day(m) <= last
+            ),
+            key=lambda m: m["utcDate"],
+        )
+
+    def _load(self, league: str) -> LeagueFixtures:
+        try:
+            with open(self._path(league), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            return LeagueFixtures(
+                [
+                    HeldRange(date.fromisoformat(a), date.fromisoformat(b), t)
+                    for a, b, t in entry["ranges"]
+                ],
+                entry["matches"],
+            )
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return LeagueFixtures([], {})
+
+    def _save(self, league: str, fixtures: LeagueFixtures) -> None:
+        path = self._path(league)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        entry = {
+            "ranges": [
+                [r.first.isoformat(), r.last.isoformat(), r.fetched_at]
+                for r in fixtures.ranges
+            ],
+            "matches": fixtures.matches,
+        }
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _path(self, league: str) -> Path:
+        return self.directory / f"{league}.json"
+
+
+def match_key(match: dict[str, Any]) -> str:
+    """
+    The API's match id; teams and kickoff for fixtures without one.
+    """
+    if "id" in match:
+        return str(match["id"])
+    return "|".join(
+        (match["homeTeam"]["name"], match["awayTeam"]["name"], match["utcDate"])
+    )
+
+
+def match_day(match: dict[str, Any]) -> date:
+    return date.fromisoformat(match["utcDate"][:10])
+
+
+def _days(first: date, last: date) -> Iterator[date]:
+    for offset in range((last - first).days + 1):
+        yield first + timedelta(days=offset)
+
+
+def _covering(ranges: list[HeldRange], day: date) -> HeldRange | None:
+    return next((r for r in ranges if r.first <= day <= r.last), None)
+
+
+def _cut(held: HeldRange, first: date, last: date) -> list[HeldRange]:
+    """
+    The parts of `held` outside `first` to `last`.
+    """
+    pieces = []
+    if held.first < first:
+        pieces.append(held._replace(last=min(held.last, first - timedelta(days=1))))
+    if held.last > last:
+        pieces.append(held._replace(first=max(held.first, last + timedelta(days=1))))
+    return pieces
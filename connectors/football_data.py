@@ -1,13 +1,96 @@
 import os
-from typing import Any, NamedTuple
+import math
+import logging
+from typing import Any, Callable, NamedTuple
 from enum import StrEnum
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 
+import profiling
+from .rate_limit import TokenBucket, retry_after_seconds
+from .http_cache import CacheMode, CacheMissError, CachedResponse, ResponseCache
+from .fixture_store import FixtureStore
 
 API_KEY = os.environ.get("FOOTBALL_API_KEY")
-BASE_URL = "https://api.football-data.org/v4"
+# Another server speaking the same API, e.g. the benchmarks' local stub
+BASE_URL = os.environ.get("FOOTBALL_API_URL", "https://api.football-data.org/v4")
+# Free tier quota, override for paid plans
+REQUESTS_PER_MINUTE = int(os.environ.get("FOOTBALL_API_REQUESTS_PER_MINUTE", "10"))
+MAX_WORKERS = 4
+MAX_RETRIES = 3
+DEFAULT_RETRY_AFTER = 60.0
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(
+    os.environ.get("FOOTBALL_CACHE_DIR", PROJECT_ROOT / ".cache" / "football_data")
+)
+# Team venues change about once a season, fixtures mostly get rescheduled
+CACHE_TTL_SECONDS = {"/teams": 7 * 24 * 3600.0, "/matches": 3600.0}
+DEFAULT_CACHE_TTL_SECONDS = 3600.0
+# Fixtures of the next few days get refreshed on the "/matches" TTL; later ones
+# are rarely rescheduled, so a daily run only fetches the day it adds
+FIXTURES_NEAR_DAYS = 3
+FIXTURES_FAR_TTL_SECONDS = 7 * 24 * 3600.0
+
+logger = logging.getLogger(__name__)
+
+
+def _make_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = _make_session()
+_base_url = BASE_URL
+_limiter = TokenBucket.per_minute(REQUESTS_PER_MINUTE)
+_cache = ResponseCache(CACHE_DIR)
+_fixtures = FixtureStore(CACHE_DIR / "fixtures")
+_cache_mode = CacheMode.NORMAL
+
+
+def set_cache_mode(mode: CacheMode) -> None:
+    global _cache_mode  # pylint: disable=global-statement
+    _cache_mode = CacheMode(mode)
+
+
+def set_base_url(url: str | None) -> None:
+    """
+    Send requests to another server, e.g. a local stub; `None` restores
+    `BASE_URL`.
+    """
+    global _base_url  # pylint: disable=global-statement
+    _base_url = url or BASE_URL
+
+
+def set_rate_limit(requests_per_minute: float | None) -> None:
+    """
+    Replace the request quota; `None` restores `REQUESTS_PER_MINUTE`.
+    """
+    global _limiter  # pylint: disable=global-statement
+    _limiter = TokenBucket.per_minute(requests_per_minute or REQUESTS_PER_MINUTE)
+
+
+def set_cache_dir(directory: Path | None) -> None:
+    """
+    Keep cached responses in another directory; `None` restores `CACHE_DIR`.
+    """
+    global _cache, _fixtures  # pylint: disable=global-statement
+    _cache = ResponseCache(directory or CACHE_DIR)
+    _fixtures = FixtureStore((directory or CACHE_DIR) / "fixtures")
+
+
+def cache_ttl(url: str) -> float:
+    return next(
+        (ttl for suffix, ttl in CACHE_TTL_SECONDS.items() if url.endswith(suffix)),
+        DEFAULT_CACHE_TTL_SECONDS,
+    )
 
 
 class LeagueId(StrEnum):
@@ -21,33 +104,165 @@ class FixturesParams(NamedTuple):
     end_date: datetime
 
 
+class LeagueData(NamedTuple):
+    fixtures: dict[str, Any]
+    teams: dict[str, Any]
+
+
 def get_football_data(
     url: str, headers: dict[str, Any], params: dict[str, Any]
 ) -> dict[str, Any]:
-    response = requests.get(url, headers=headers, params=params, timeout=10)
+    if _cache_mode is CacheMode.DISABLED:
+        return _request(url, headers, params).json()
+
+    cached = _cache.load(url, params)
+    if cached and (
+        _cache_mode is CacheMode.OFFLINE or _cache.is_fresh(cached, cache_ttl(url))
+    ):
+        profiling.count("football_data.cache_hits")
+        return cached.body
+    if _cache_mode is CacheMode.OFFLINE:
+        raise CacheMissError(f"No cached response for {url} {params}")
+
+    validators = cached.validators() if cached else {}
+    response = _request(url, {**headers, **validators}, params)
+    if response.status_code == 304 and cached:
+        profiling.count("football_data.not_modified")
+        _cache.store(url, params, cached._replace(fetched_at=_cache.now()))
+        return cached.body
+
+    body = response.json()
+    _cache.store(
+        url,
+        params,
+        CachedResponse(
+            body,
+            fetched_at=_cache.now(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        ),
+    )
+    return body
+
+
+def _request(
+    url: str, headers: dict[str, Any], params: dict[str, Any]
+) -> requests.Response:
+    for attempt in range(MAX_RETRIES + 1):
+        profiling.count("football_data.rate_limit_wait_seconds", _limiter.acquire())
+        response = _session.get(url, headers=headers, params=params, timeout=10)
+        profiling.count("football_data.requests")
+        profiling.count("football_data.bytes", len(response.content))
+        if response.status_code != 429 or attempt == MAX_RETRIES:
+            break
+        profiling.count("football_data.retries")
+        delay = retry_after_seconds(
+            response.headers.get("Retry-After"), DEFAULT_RETRY_AFTER
+        )
+        logger.warning("Rate limited by football-data, retrying in %.0fs", delay)
+        _limiter.pause(delay)
     response.raise_for_status()
-    return response.json()
+    return response
 
 
 def get_upcoming_fixtures(params: FixturesParams) -> dict[str, Any]:
-    return get_football_data(
-        url=f"{BASE_URL}/competitions/{params.league_id}/matches",
-        headers={"X-Auth-Token": API_KEY},
-        params={
-            "dateFrom": params.start_date.strftime("%Y-%m-%d"),
-            "dateTo": params.end_date.strftime("%Y-%m-%d"),
-        },
+    """
+    Fixtures of the window, from the league's `FixtureStore`: only the days it
+    lacks, or holds past their `fixtures_ttl`, are requested, a contiguous
+    range per request. When a held match is missing from the days fetched, the
+    whole window is fetched again.
+    """
+    url = f"{_base_url}/competitions/{params.league_id}/matches"
+    headers = {"X-Auth-Token": API_KEY}
+    first, last = params.start_date.date(), params.end_date.date()
+    if _cache_mode is CacheMode.DISABLED:
+        return get_football_data(url, headers, _date_params(first, last))
+
+    league = str(params.league_id)
+    offline = _cache_mode is CacheMode.OFFLINE
+    gaps = _fixtures.missing(
+        league, first, last, (lambda day: math.inf) if offline else fixtures_ttl
     )
+    if gaps and offline:
+        raise CacheMissError(f"Fixtures of {league} not held for {first}..{last}")
+    if not gaps:
+        profiling.count("football_data.cache_hits")
+    left: set[str] = set()
+    for gap_first, gap_last in gaps:
+        left |= _fetch_fixtures(url, headers, league, gap_first, gap_last)
+    if left and gaps != [(first, last)]:
+        # A held match left the days refetched: it may have moved to a day
+        # still held as fresh, so the whole window is fetched again
+        _fetch_fixtures(url, headers, league, first, last)
+    return {"matches": _fixtures.matches(league, first, last)}
+
+
+def _fetch_fixtures(
+    url: str, headers: dict[str, Any], league: str, first: date, last: date
+) -> set[str]:
+    body = _request(url, headers, _date_params(first, last)).json()
+    profiling.count("football_data.fixture_days", (last - first).days + 1)
+    return _fixtures.store(league, first, last, body["matches"])
+
+
+def fixtures_ttl(day: date) -> float:
+    if day < _fixtures.today() + timedelta(days=FIXTURES_NEAR_DAYS):
+        return CACHE_TTL_SECONDS["/matches"]
+    return FIXTURES_FAR_TTL_SECONDS
+
+
+def _date_params(first: date, last: date) -> dict[str, str]:
+    return {"dateFrom": first.isoformat(), "dateTo": last.isoformat()}
 
 
 def get_competition_teams(league_id: LeagueId) -> dict[str, Any]:
     return get_football_data(
-        url=f"{BASE_URL}/competitions/{league_id}/teams",
+        url=f"{_base_url}/competitions/{league_id}/teams",
         headers={"X-Auth-Token": API_KEY},
         params={},  # optional, current season by default
     )
 
 
+def get_leagues_data(
+    league_ids: list[LeagueId],
+    start_date: datetime,
+    end_date: datetime,
+    on_teams: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[LeagueId, LeagueData]:
+    """
+    Fetch fixtures and teams of all leagues concurrently over the shared session.
+    Requests still go through the per-minute quota, so a burst of leagues is
+    spread out rather than throttled by the server. `on_teams` is called with
+    each teams response as soon as it arrives, while fixtures may still be
+    downloading.
+    """
+
+    def fetch_teams(league_id: LeagueId) -> dict[str, Any]:
+        teams = get_competition_teams(league_id)
+        if on_teams:
+            on_teams(teams)
+        return teams
+
+    with profiling.stage("football_data.fetch"), ThreadPoolExecutor(
+        max_workers=MAX_WORKERS
+    ) as pool:
+        teams = {
+            league_id: pool.submit(fetch_teams, league_id) for league_id in league_ids
+        }
+        fixtures = {
+            league_id: pool.submit(
+                get_upcoming_fixtures, FixturesParams(league_id, start_date, end_date)
+            )
+            for league_id in league_ids
+        }
+        return {
+            league_id: LeagueData(
+                fixtures[league_id].result(), teams[league_id].result()
+            )
+            for league_id in league_ids
+        }
+
+
 def get_champions_league_fixtures(
     start_date: datetime, end_date: datetime
 ) -> dict[str, Any]:
@@ -0,0 +1,77 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+
+class CacheMode(StrEnum):
+    NORMAL = "normal"  # serve fresh entries, revalidate stale ones
+    OFFLINE = "offline"  # serve whatever is cached, never touch the network
+    DISABLED = "disabled"  # always download, never store
+
+
+class CacheMissError(LookupError):
+    pass
+
+
+class CachedResponse(NamedTuple):
+    body: dict[str, Any]
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def validators(self) -> dict[str, str]:
+        """
+        Conditional request headers, so an unchanged resource costs a 304.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    On-disk JSON response cache, one file per (url, params) pair.
+    """
+
+    def __init__(self, directory: Path, clock: Callable[[], float] = time.time):
+        self.directory = directory
+        self._clock = clock
+
+    @staticmethod
+    def key(url: str, params: dict[str, Any]) -> str:
+        raw = json.dumps([url, params], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def load(self, url: str, params: dict[str, Any]) -> CachedResponse | None:
+        path = self._path(url, params)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return CachedResponse(**json.load(f)["response"])
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+    def store(self, url: str, params: dict[str, Any], response: CachedResponse) -> None:
+        path = self._path(url, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        entry = {"url": url, "params": params, "response": response._asdict()}
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+
+    def is_fresh(self, response: CachedResponse, ttl: float) -> bool:
+        return self._clock() - response.fetched_at < ttl
+
+    def now(self) -> float:
+        return self._clock()
+
+    def _path(self, url: str, params: dict[str, Any]) -> Path:
+        return self.directory / f"{self.key(url, params)}.json"
@@ -1,13 +1,29 @@
+import os
 from typing import Any
 import requests
 
-URL = "https://nominatim.openstreetmap.org/search"
+import profiling
+
+# Another server speaking the same API, e.g. the benchmarks' local stub
+URL = os.environ.get("NOMINATIM_URL", "https://nominatim.openstreetmap.org/search")
+
+_url = URL
+
+
+def set_url(url: str | None) -> None:
+    """
+    Send searches to another server; `None` restores `URL`.
+    """
+    global _url  # pylint: disable=global-statement
+    _url = url or URL
 
 
 def venue_location(query: str) -> list[dict[str, Any]]:
     params = {"q": query, "format": "json", "limit": 1}
     response = requests.get(
-        URL, params=params, headers={"User-Agent": "travel-foot"}, timeout=10
+        _url, params=params, headers={"User-Agent": "travel-foot"}, timeout=10
     )
+    profiling.count("nominatim.requests")
+    profiling.count("nominatim.bytes", len(response.content))
     response.raise_for_status()
     return response.json()
@@ -8,4 +8,7 @@ from .data_classes import (
     EquivalenceDict,
     Candidate,
     WeightedAdjacencyDict,
+    MatchGroup,
+    GroupedPath,
 )
+from .match_table import MatchTable
@@ -1,5 +1,7 @@
-from typing import NamedTuple, TypeAlias
+import math
+from typing import Iterator, NamedTuple, TypeAlias
 from datetime import datetime
+from itertools import product
 
 
 Candidate: TypeAlias = tuple[int, ...]
@@ -39,3 +41,27 @@ class Matchday(NamedTuple):
 
 
 MatchPath: TypeAlias = list[Matchday]
+
+
+MatchGroup: TypeAlias = tuple[Match, ...]
+
+
+class GroupedPath(NamedTuple):
+    """
+    A path whose every stop is a group of interchangeable matches; it stands for
+    all the paths picking one match per group.
+    """
+
+    groups: tuple[MatchGroup, ...]
+
+    def num_paths(self) -> int:
+        return math.prod(len(group) for group in self.groups)
+
+    def expand(self) -> Iterator[list[Match]]:
+        for path in product(*self.groups):
+            yield list(path)
+
+    def __repr__(self) -> str:
+        return " -> ".join(
+            "{" + " | ".join(map(str, group)) + "}" for group in self.groups
+        )
@@ -0,0 +1,186 @@
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, overload
+
+import numpy as np
+
+from .data_classes import Location, Match
+
+# utc_offset of naive kickoffs
+NAIVE_OFFSET = np.iinfo(np.int32).min
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+class MatchTable(Sequence[Match]):  # pylint: disable=too-many-instance-attributes
+    """
+    Matches stored as columns: interned team and venue ids, kickoffs as
+    wall-clock microseconds since the epoch with their UTC offset in seconds,
+    day ordinals and venue coordinates, all contiguous arrays. Indexing gives
+    a `Match`, built on demand, so the table stands in for a match list.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        teams: list[str],
+        home: np.ndarray,
+        away: np.ndarray,
+        kickoff: np.ndarray,
+        utc_offset: np.ndarray,
+        venues: list[Location],
+        venue_ids: np.ndarray,
+    ):
+        self.teams = teams
+        self.home = np.asarray(home, dtype=np.int32)
+        self.away = np.asarray(away, dtype=np.int32)
+        self.kickoff = np.asarray(kickoff, dtype=np.int64)
+        self.utc_offset = np.asarray(utc_offset, dtype=np.int32)
+        self.venues = venues
+        self.venue_ids = np.asarray(venue_ids, dtype=np.int32)
+        self.days = (EPOCH_ORDINAL + self.kickoff // MICROSECONDS_PER_DAY).astype(
+            np.int32
+        )
+        coords = np.array(venues, dtype=np.float64).reshape(-1, 2)[self.venue_ids]
+        self.latitude = np.ascontiguousarray(coords[:, 0])
+        self.longitude = np.ascontiguousarray(coords[:, 1])
+        # matches built so far, by row; output often asks for the same ones
+        self._rows: dict[int, Match] = {}
+
+    @classmethod
+    def from_columns(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        cls,
+        home: Iterable[str],
+        away: Iterable[str],
+        kickoff: np.ndarray,
+        utc_offset: np.ndarray,
+        locations: Iterable[Location],
+    ) -> "MatchTable":
+        """
+        Table from per-match team names and locations, which get interned.
+        """
+        team_ids: dict[str, int] = {}
+        venue_ids: dict[Location, int] = {}
+        home_ids = np.fromiter(
+            (team_ids.setdefault(t, len(team_ids)) for t in home), np.int32
+        )
+        away_ids = np.fromiter(
+            (team_ids.setdefault(t, len(team_ids)) for t in away), np.int32
+        )
+        venue_idx = np.fromiter(
+            (venue_ids.setdefault(v, len(venue_ids)) for v in locations), np.int32
+        )
+        return cls(
+            list(team_ids),
+            home_ids,
+            away_ids,
+            kickoff,
+            utc_offset,
+            list(venue_ids),
+            venue_idx,
+        )
+
+    @classmethod
+    def from_matches(cls, matches: Iterable[Match]) -> "MatchTable":
+        matches = list(matches)
+        return cls.from_columns(
+            (m.home_team for m in matches),
+            (m.away_team for m in matches),
+            np.fromiter((wall_clock(m.date) for m in matches), np.int64, len(matches)),
+            np.fromiter(
+                (offset_seconds(m.date) for m in matches), np.int32, len(matches)
+            ),
+            (m.location for m in matches),
+        )
+
+    @classmethod
+    def of(cls, matches: "Iterable[Match] | MatchTable") -> "MatchTable":
+        return matches if isinstance(matches, MatchTable) else cls.from_matches(matches)
+
+    def __len__(self) -> int:
+        return len(self.kickoff)
+
+    @overload
+    def __getitem__(self, i: int) -> Match: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> "MatchTable": ...
+
+    def __getitem__(self, i: int | slice) -> "Match | MatchTable":
+        if isinstance(i, slice):
+            return self.take(np.arange(len(self))[i])
+        row = self._rows.get(i)
+        if row is None:
+            i = range(len(self))[i]
+            row = self._rows[i] = Match(
+                self.teams[self.home[i]],
+                self.teams[self.away[i]],
+                self.date(i),
+                self.location(i),
+            )
+        return row
+
+    def __iter__(self) -> Iterator[Match]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, MatchTable)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def date(self, i: int) -> datetime:
+        return to_datetime(int(self.kickoff[i]), int(self.utc_offset[i]))
+
+    def location(self, i: int) -> Location:
+        return self.venues[self.venue_ids[i]]
+
+    def locations(self) -> list[Location]:
+        return [self.venues[v] for v in self.venue_ids.tolist()]
+
+    def to_matches(self) -> list[Match]:
+        return list(self)
+
+    def instants(self) -> np.ndarray:
+        """
+        Kickoffs on one time line, for ordering matches of different offsets.
+        """
+        offset = np.where(self.utc_offset == NAIVE_OFFSET, 0, self.utc_offset)
+        return self.kickoff - offset.astype(np.int64) * 1_000_000
+
+    def take(self, indices: np.ndarray) -> "MatchTable":
+        return MatchTable(
+            self.teams,
+            self.home[indices],
+            self.away[indices],
+            self.kickoff[indices],
+            self.utc_offset[indices],
+            self.venues,
+            self.venue_ids[indices],
+        )
+
+    def sorted(self) -> "MatchTable":
+        """
+        The table in kickoff order; matches kicking off together keep theirs.
+        """
+        return self.take(np.argsort(self.instants(), kind="stable"))
+
+
+def wall_clock(date: datetime) -> int:
+    return (date.replace(tzinfo=None) - EPOCH) // timedelta(microseconds=1)
+
+
+def offset_seconds(date: datetime) -> int:
+    offset = date.utcoffset()
+    return NAIVE_OFFSET if offset is None else int(offset.total_seconds())
+
+
+def to_datetime(kickoff: int, offset: int) -> datetime:
+    date = EPOCH + timedelta(microseconds=kickoff)
+    if offset == NAIVE_OFFSET:
+        return date
+    if offset == 0:
+        return date.replace(tzinfo=timezone.utc)
+    return date.replace(tzinfo=timezone(timedelta(seconds=offset)))
@@ -1,15 +1,127 @@
+import sys
+import json
 import argparse
+import logging
+from contextlib import nullcontext
+from pathlib import Path
 from datetime import datetime, timezone, timedelta
 
-from travel import match, travel
+import profiling
+import service
+from connectors import football_data
+from connectors.http_cache import CacheMode
+from travel import match, travel, snapshot
+from travel.builders import GraphBackend, GraphBuilder
+from travel.output import OutputFormat, write_paths
+from travel.ranking import PathScore
+from travel.search import SearchEngine
+from travel.sweep import ParameterSweep
 
+logger = logging.getLogger(__name__)
 
-def run(min_games: int, max_days: int, max_dist: float, days_ahead: int) -> None:
+
+def run(  # pylint: disable=too-many-arguments,too-many-locals
+    min_games: int,
+    max_days: int,
+    max_dist: float,
+    days_ahead: int,
+    builder: GraphBuilder = GraphBuilder.GRID,
+    *,
+    backend: GraphBackend = GraphBackend.DICT,
+    load_snapshot: Path | None = None,
+    snapshot_dir: Path | None = None,
+    engine: SearchEngine = SearchEngine.DFS,
+    grouped: bool = False,
+    count_only: bool = False,
+    output_format: OutputFormat = OutputFormat.TEXT,
+    stream: bool = False,
+    workers: int = 1,
+    top: int | None = None,
+    score: PathScore = PathScore.GAMES,
+    deadline: float | None = None,
+) -> None:
+    graph = _load_graph(
+        max_days,
+        max_dist,
+        days_ahead,
+        builder,
+        backend=backend,
+        load_snapshot=load_snapshot,
+        snapshot_dir=snapshot_dir,
+    )
+
+    if count_only:
+        print(graph.count_paths(min_games=min_games, engine=engine, workers=workers))
+        return
+    if top is not None:
+        ranked = graph.find_top_paths(top, min_games, score=score, deadline=deadline)
+        if not ranked.complete:
+            logger.warning("Deadline reached, showing the best options found so far")
+        paths = ranked.paths
+    elif stream:
+        paths = graph.iter_paths(min_games=min_games, grouped=grouped)
+    else:
+        paths = graph.find_paths(
+            min_games=min_games, engine=engine, grouped=grouped, workers=workers
+        )
+    with profiling.stage("output"):
+        written = write_paths(paths, output_format, sys.stdout)
+    profiling.gauge("output.options", written)
+
+
+def _load_graph(  # pylint: disable=too-many-arguments
+    max_days: int,
+    max_dist: float,
+    days_ahead: int,
+    builder: GraphBuilder,
+    *,
+    backend: GraphBackend,
+    load_snapshot: Path | None,
+    snapshot_dir: Path | None,
+) -> travel.TravelGraph:
+    if load_snapshot:
+        return snapshot.load_snapshot(load_snapshot, max_dist, max_days)
     today = datetime.now(timezone.utc)
     matches = match.get_all_matches(today, today + timedelta(days=days_ahead))
-    graph = travel.TravelGraph(matches, max_dist=max_dist, max_days=max_days)
-    paths = graph.find_paths(min_games=min_games)
-    print(graph.format_paths(paths))
+    graph = travel.TravelGraph(
+        matches, max_dist=max_dist, max_days=max_days, builder=builder, backend=backend
+    )
+    if snapshot_dir:
+        path = snapshot.save_snapshot(
+            graph, snapshot.snapshot_path(snapshot_dir, graph)
+        )
+        logger.info("Saved graph snapshot to %s", path)
+    return graph
+
+
+def sweep(  # pylint: disable=too-many-arguments
+    max_dists: list[float],
+    max_days: list[int],
+    min_games: list[int],
+    days_ahead: int,
+    builder: GraphBuilder = GraphBuilder.GRID,
+    *,
+    engine: SearchEngine = SearchEngine.DAG,
+    output_format: OutputFormat = OutputFormat.TEXT,
+) -> None:
+    """
+    Print the number of options for every combination of the limits.
+    """
+    today = datetime.now(timezone.utc)
+    matches = match.get_all_matches(today, today + timedelta(days=days_ahead))
+    counts = ParameterSweep(matches, max_dists, max_days, builder).count_paths(
+        min_games, engine=engine
+    )
+    if OutputFormat(output_format) is OutputFormat.TEXT:
+        print(f"{'max_dist':>9} {'max_days':>9} {'min_games':>9} {'options':>9}")
+    for point, count in counts.items():
+        if OutputFormat(output_format) is OutputFormat.JSONL:
+            print(json.dumps({**point._asdict(), "options": count}))
+        else:
+            print(
+                f"{point.max_dist:>9g} {point.max_days:>9} "
+                f"{point.min_games:>9} {count:>9}"
+            )
 
 
 def main():
@@ -34,14 +146,215 @@ def main():
         default=30,
         help="Number of days to look ahead for fixtures",
     )
+    parser.add_argument(
+        "--builder",
+        type=GraphBuilder,
+        choices=list(GraphBuilder),
+        default=GraphBuilder.GRID,
+        help="Graph construction backend",
+    )
+    parser.add_argument(
+        "--backend",
+        type=GraphBackend,
+        choices=list(GraphBackend),
+        default=GraphBackend.DICT,
+        help="Graph storage: dicts per node, or compact CSR arrays",
+    )
+    parser.add_argument(
+        "--engine",
+        type=SearchEngine,
+        choices=list(SearchEngine),
+        default=SearchEngine.DFS,
+        help="Path search engine",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes to search independent parts of the graph with",
+    )
+    parser.add_argument(
+        "--grouped",
+        action="store_true",
+        help="Print interchangeable matches of a path together instead of "
+        "one option per combination",
+    )
+    parser.add_argument(
+        "--count",
+        action="store_true",
+        help="Only print the number of options",
+    )
+    parser.add_argument(
+        "--format",
+        type=OutputFormat,
+        choices=list(OutputFormat),
+        default=OutputFormat.TEXT,
+        help="Output format: text, or one JSON object per line",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print options as soon as they are found, not sorted; always uses "
+        "the chunked engine, so --engine and --workers are ignored",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        metavar="K",
+        help="Only print the K best options, ranked by --score",
+    )
+    parser.add_argument(
+        "--score",
+        type=PathScore,
+        choices=list(PathScore),
+        default=PathScore.GAMES,
+        help="Ranking for --top: most games then least travel, or least travel",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="With --top, stop searching after this long and print the best "
+        "options found so far",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        metavar="PATH",
+        help="Write a JSON report of stage timings and counters to PATH "
+        "(stderr if omitted); not supported with --serve",
+    )
+    parser.add_argument(
+        "--sweep-dist",
+        type=float,
+        nargs="+",
+        metavar="KM",
+        help="Count options for each of these --max-dist values (sweep mode)",
+    )
+    parser.add_argument(
+        "--sweep-days",
+        type=int,
+        nargs="+",
+        metavar="DAYS",
+        help="Count options for each of these --max-days values (sweep mode)",
+    )
+    parser.add_argument(
+        "--sweep-games",
+        type=int,
+        nargs="+",
+        metavar="GAMES",
+        help="Count options for each of these --min-games values (sweep mode)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run an HTTP/JSON server answering path queries from graphs kept "
+        "in memory, instead of a single search",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to serve on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to serve on")
+    parser.add_argument(
+        "--refresh-minutes",
+        type=float,
+        default=15.0,
+        help="How often the server fetches fixtures again",
+    )
+    parser.add_argument(
+        "--stub-fixtures",
+        type=Path,
+        metavar="PATH",
+        help="Serve fixtures from a JSON(L) file of matches instead of "
+        "football-data, for offline runs",
+    )
+    parser.add_argument(
+        "--cache",
+        type=CacheMode,
+        choices=list(CacheMode),
+        default=CacheMode.NORMAL,
+        help="football-data response cache: normal, offline (cache only) or disabled",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        type=Path,
+        help="Save the built graph to this directory, keyed by fixtures and limits",
+    )
+    parser.add_argument(
+        "--load-snapshot",
+        type=Path,
+        help="Load a saved graph instead of fetching fixtures and building it; "
+        "it must have been built with the same --max-dist and --max-days, "
+        "--days-ahead is then taken from the snapshot",
+    )
 
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    football_data.set_cache_mode(args.cache)
+    if args.serve:
+        if args.profile:
+            parser.error("--profile is not supported with --serve")
+        _serve(args)
+        return
+    # the report is written even when the run fails or is interrupted
+    with profiling.profile() if args.profile else nullcontext() as profiler:
+        try:
+            _search(args)
+        finally:
+            if profiler is not None:
+                _write_report(profiler.report(), args.profile)
+
+
+def _search(args: argparse.Namespace) -> None:
+    if args.sweep_dist or args.sweep_days or args.sweep_games:
+        sweep(
+            args.sweep_dist or [args.max_dist],
+            args.sweep_days or [args.max_days],
+            args.sweep_games or [args.min_games],
+            args.days_ahead,
+            args.builder,
+            engine=args.engine,
+            output_format=args.format,
+        )
+        return
     run(
         min_games=args.min_games,
         max_days=args.max_days,
         max_dist=args.max_dist,
         days_ahead=args.days_ahead,
+        builder=args.builder,
+        backend=args.backend,
+        load_snapshot=args.load_snapshot,
+        snapshot_dir=args.snapshot_dir,
+        engine=args.engine,
+        grouped=args.grouped,
+        count_only=args.count,
+        output_format=args.format,
+        stream=args.stream,
+        workers=args.workers,
+        top=args.top,
+        score=args.score,
+        deadline=args.deadline,
+    )
+
+
+def _serve(args: argparse.Namespace) -> None:
+    source = (
+        service.StubFixtureSource.from_file(args.stub_fixtures)
+        if args.stub_fixtures
+        else service.live_fixtures
+    )
+    travel_service = service.TravelService(
+        source, builder=args.builder, engine=args.engine
     )
+    service.serve(travel_service, args.host, args.port, args.refresh_minutes * 60)
+
+
+def _write_report(report: dict, path: str) -> None:
+    text = json.dumps(report, indent=2)
+    if path == "-":
+        print(text, file=sys.stderr)
+    else:
+        Path(path).write_text(text + "\n", encoding="utf-8")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+from .profiler import (
+    Event,
+    EventKind,
+    Hook,
+    Profiler,
+    StageStats,
+    add_hook,
+    remove_hook,
+    count,
+    gauge,
+    stage,
+    profiled,
+    profile,
+    peak_rss_bytes,
+)
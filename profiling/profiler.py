@@ -0,0 +1,154 @@
+import sys
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from enum import StrEnum
+from typing import Any, Callable, Iterator, NamedTuple, ParamSpec, TypeVar
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+class EventKind(StrEnum):
+    STAGE = "stage"  # value: seconds spent in one run of the stage
+    COUNT = "count"  # value: amount to add to the counter
+    GAUGE = "gauge"  # value: latest reading, e.g. a size
+
+
+class Event(NamedTuple):
+    kind: EventKind
+    name: str
+    value: float
+
+
+Hook = Callable[[Event], None]
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_hooks: list[Hook] = []
+_hooks_lock = threading.Lock()
+
+
+def add_hook(hook: Hook) -> None:
+    """
+    Call `hook` with every instrumentation event, from whichever thread emits
+    it. Instrumentation costs next to nothing while no hook is installed.
+    """
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    with _hooks_lock:
+        _hooks.remove(hook)
+
+
+def emit(event: Event) -> None:
+    for hook in tuple(_hooks):
+        hook(event)
+
+
+def count(name: str, value: float = 1) -> None:
+    if _hooks:
+        emit(Event(EventKind.COUNT, name, value))
+
+
+def gauge(name: str, value: float) -> None:
+    if _hooks:
+        emit(Event(EventKind.GAUGE, name, value))
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    if not _hooks:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        emit(Event(EventKind.STAGE, name, time.perf_counter() - started))
+
+
+def profiled(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Decorator running every call of the function as stage `name`.
+    """
+
+    def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with stage(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class StageStats(NamedTuple):
+    seconds: float = 0.0
+    calls: int = 0
+    peak_rss_bytes: int | None = None  # process peak when the stage last ended
+
+
+class Profiler:
+    """
+    Hook that aggregates events into a report: total time and calls per
+    stage, summed counters and the last value of each gauge.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, StageStats] = {}
+        self.counters: dict[str, float] = {}
+        self.gauges: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            if event.kind is EventKind.STAGE:
+                stats = self.stages.get(event.name, StageStats())
+                self.stages[event.name] = StageStats(
+                    stats.seconds + event.value, stats.calls + 1, peak_rss_bytes()
+                )
+            elif event.kind is EventKind.COUNT:
+                self.counters[event.name] = (
+                    self.counters.get(event.name, 0) + event.value
+                )
+            else:
+                self.gauges[event.name] = event.value
+
+    def report(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "stages": {
+                    name: stats._asdict() for name, stats in self.stages.items()
+                },
+                "counters": dict(sorted(self.counters.items())),
+                "gauges": dict(sorted(self.gauges.items())),
+                "peak_rss_bytes": peak_rss_bytes(),
+            }
+
+
+@contextmanager
+def profile() -> Iterator[Profiler]:
+    """
+    Collect the events of the enclosed code into a `Profiler`.
+    """
+    profiler = Profiler()
+    add_hook(profiler)
+    try:
+        yield profiler
+    finally:
+        remove_hook(profiler)
+
+
+def peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,8 @@
+from .service import (
+    FixtureSource,
+    PathQuery,
+    StubFixtureSource,
+    TravelService,
+    live_fixtures,
+)
+from .server import TravelServer, parse_query, serve
@@ -0,0 +1,103 @@
+import json
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from .service import PathQuery, TravelService
+
+logger = logging.getLogger(__name__)
+# Least value of the numeric query fields
+MINIMUMS = {"days_ahead": 0, "max_days": 1, "min_games": 1, "offset": 0, "limit": 0}
+# Greatest value of the numeric query fields; every refresh fetches each
+# resident days_ahead window again
+MAXIMUMS = {"days_ahead": 90}
+
+
+class TravelServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: TravelService):
+        super().__init__(address, TravelRequestHandler)
+        self.service = service
+
+
+class TravelRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET /paths?days_ahead=&max_dist=&max_days=&min_games=&grouped=&offset=&limit=
+    GET /health
+    """
+
+    server: TravelServer
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            self._send(HTTPStatus.OK, self.server.service.status())
+        elif url.path == "/paths":
+            try:
+                query = parse_query(url.query)
+            except ValueError as e:
+                self._send(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+                return
+            try:
+                body = self.server.service.find_paths(query)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.exception("Query %s failed", url.query)
+                self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": repr(e)})
+                return
+            self._send(HTTPStatus.OK, body)
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {url.path}"})
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=W0622
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status: HTTPStatus, body: dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def parse_query(query: str) -> PathQuery:
+    """
+    `PathQuery` from a URL query string, defaults for missing fields.
+    """
+    values = {key: value[-1] for key, value in parse_qs(query).items()}
+    unknown = set(values) - set(PathQuery._fields)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    fields: dict[str, Any] = {}
+    for name, value in values.items():
+        default = getattr(PathQuery(), name)
+        if isinstance(default, bool):
+            if value.lower() not in ("true", "false", "1", "0"):
+                raise ValueError(f"{name} must be true or false")
+            fields[name] = value.lower() in ("true", "1")
+        else:
+            try:
+                fields[name] = type(default)(value)
+            except ValueError as e:
+                raise ValueError(f"Invalid {name}: {value!r}") from e
+            if name in MINIMUMS and fields[name] < MINIMUMS[name]:
+                raise ValueError(f"{name} must be at least {MINIMUMS[name]}")
+            if name in MAXIMUMS and fields[name] > MAXIMUMS[name]:
+                raise ValueError(f"{name} must be at most {MAXIMUMS[name]}")
+    return PathQuery(**fields)
+
+
+def serve(service: TravelService, host: str, port: int, refresh_seconds: float) -> None:
+    server = TravelServer((host, port), service)
+    service.start_refresh(refresh_seconds)
+    logger.info("Serving on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
@@ -0,0 +1,248 @@
+import json
+import logging
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, NamedTuple
+
+from data_classes import Match
+from travel import match
+from travel.builders import GraphBuilder
+from travel.output import PathOption, match_from_dict, option_to_dict
+from travel.search import SearchEngine
+from travel.travel import TravelGraph
+
+MAX_GRAPHS = 8
+REFRESH_SECONDS = 15 * 60.0
+MAX_PAGE_SIZE = 500
+
+# Fixtures between two datetimes
+FixtureSource = Callable[[datetime, datetime], list[Match]]
+# (days_ahead, max_dist, max_days)
+GraphKey = tuple[int, float, int]
+
+logger = logging.getLogger(__name__)
+
+
+def live_fixtures(start_date: datetime, end_date: datetime) -> list[Match]:
+    return match.get_all_matches(start_date, end_date).to_matches()
+
+
+class StubFixtureSource:
+    """
+    A fixed fixture list standing in for football-data, for offline runs.
+    """
+
+    def __init__(self, matches: Iterable[Match]):
+        self.matches = list(matches)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "StubFixtureSource":
+        """
+        Read a JSON array, or JSON lines, of matches in the `--format jsonl`
+        match layout.
+        """
+        text = path.read_text(encoding="utf-8").strip()
+        if text.startswith("["):
+            records = json.loads(text)
+        else:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        return cls(match_from_dict(record) for record in records)
+
+    def __call__(self, start_date: datetime, end_date: datetime) -> list[Match]:
+        return [m for m in self.matches if start_date <= m.date <= end_date]
+
+
+class PathQuery(NamedTuple):
+    days_ahead: int = 30
+    max_dist: float = 50.0
+    max_days: int = 5
+    min_games: int = 3
+    grouped: bool = False
+    offset: int = 0
+    limit: int = 50
+
+    def graph_key(self) -> GraphKey:
+        return self.days_ahead, self.max_dist, self.max_days
+
+
+class _GraphEntry:  # pylint: disable=too-few-public-methods
+    def __init__(self, graph: TravelGraph, matches: list[Match]):
+        self.graph = graph
+        self.matches = matches  # the fixture list the graph is in sync with
+        self.lock = threading.Lock()
+        # sorted find_paths results by (min_games, grouped), for paging
+        self.results: dict[tuple[int, bool], list[PathOption]] = {}
+
+
+class TravelService:  # pylint: disable=too-many-instance-attributes
+    """
+    Keeps fetched fixtures and built graphs in memory between queries. Graphs
+    live in an LRU keyed by `(days_ahead, max_dist, max_days)`; fixtures are
+    fetched once per `days_ahead`, kept while a resident graph uses them, and
+    refreshed in the background, and a refresh is applied to the resident
+    graphs as an incremental update.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        source: FixtureSource = live_fixtures,
+        *,
+        max_graphs: int = MAX_GRAPHS,
+        builder: GraphBuilder = GraphBuilder.GRID,
+        engine: SearchEngine = SearchEngine.DAG,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.source = source
+        self.max_graphs = max_graphs
+        self.builder = builder
+        self.engine = engine
+        self.clock = clock
+        self._matches: dict[int, list[Match]] = {}
+        self._graphs: OrderedDict[GraphKey, _GraphEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._build_locks: dict[GraphKey, threading.Lock] = {}
+        self._stop = threading.Event()
+        self._refresher: threading.Thread | None = None
+
+    def find_paths(self, query: PathQuery) -> dict[str, Any]:
+        """
+        One page of `find_paths` options, numbered from `offset + 1`.
+        """
+        limit = min(max(query.limit, 0), MAX_PAGE_SIZE)
+        offset = max(query.offset, 0)
+        entry = self._graph(query.graph_key())
+        with entry.lock:
+            self._sync(entry, query.days_ahead)
+            results = entry.results.get((query.min_games, query.grouped))
+            if results is None:
+                results = entry.graph.find_paths(
+                    query.min_games, engine=self.engine, grouped=query.grouped
+                )
+                entry.results[(query.min_games, query.grouped)] = results
+        return {
+            "total": len(results),
+            "offset": offset,
+            "limit": limit,
+            "options": [
+                option_to_dict(offset + i, option)
+                for i, option in enumerate(results[offset : offset + limit], start=1)
+            ],
+        }
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "fixtures": {str(d): len(m) for d, m in self._matches.items()},
+                "graphs": [list(key) for key in self._graphs],
+            }
+
+    def refresh(self) -> None:
+        """
+        Fetch the fixtures of every resident `days_ahead` again and apply the
+        differences to the graphs built from them.
+        """
+        with self._lock:
+            windows = list(self._matches)
+        for days_ahead in windows:
+            matches = self._fetch(days_ahead)
+            with self._lock:
+                if days_ahead not in self._matches:
+                    continue  # its last graph was evicted meanwhile
+                self._matches[days_ahead] = matches
+                entries = [e for k, e in self._graphs.items() if k[0] == days_ahead]
+            for entry in entries:
+                with entry.lock:
+                    self._sync(entry, days_ahead)
+
+    def _sync(self, entry: _GraphEntry, days_ahead: int) -> None:
+        """
+        Bring a graph up to date with the latest fixtures of its window; must
+        be called with `entry.lock` held.
+        """
+        with self._lock:
+            # an evicted graph keeps serving the fixtures it was built from
+            matches = self._matches.get(days_ahead, entry.matches)
+        if entry.matches is matches:
+            return
+        removed = list((Counter(entry.matches) - Counter(matches)).elements())
+        added = list((Counter(matches) - Counter(entry.matches)).elements())
+        if removed or added:
+            logger.info(
+                "Fixtures for %d days: %d removed, %d added",
+                days_ahead,
+                len(removed),
+                len(added),
+            )
+            entry.graph.remove_matches(removed)
+            entry.graph.add_matches(added)
+            entry.results.clear()
+        entry.matches = matches
+
+    def start_refresh(self, interval: float = REFRESH_SECONDS) -> None:
+        def loop() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception:  # pylint: disable=broad-exception-caught
+                    logger.exception("Fixture refresh failed")
+
+        self._stop.clear()
+        self._refresher = threading.Thread(target=loop, daemon=True)
+        self._refresher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._refresher:
+            self._refresher.join()
+            self._refresher = None
+
+    def _graph(self, key: GraphKey) -> _GraphEntry:
+        with self._lock:
+            if key in self._graphs:
+                self._graphs.move_to_end(key)
+                return self._graphs[key]
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        # one build per key; queries for other keys are not held up
+        with build_lock:
+            with self._lock:
+                if key in self._graphs:
+                    return self._graphs[key]
+            days_ahead, max_dist, max_days = key
+            matches = self._window_matches(days_ahead)
+            graph = TravelGraph(
+                matches, max_dist=max_dist, max_days=max_days, builder=self.builder
+            )
+            entry = _GraphEntry(graph, matches)
+            with self._lock:
+                self._graphs[key] = entry
+                self._build_locks.pop(key, None)
+                while len(self._graphs) > self.max_graphs:
+                    evicted, _ = self._graphs.popitem(last=False)
+                    self._drop_unused_matches(evicted[0])
+        return entry
+
+    def _drop_unused_matches(self, days_ahead: int) -> None:
+        """
+        Forget the fixtures of `days_ahead` once no graph, resident or being
+        built, uses them, so refreshes stop fetching them; must be called with
+        `self._lock` held.
+        """
+        if not any(key[0] == days_ahead for key in [*self._graphs, *self._build_locks]):
+            self._matches.pop(days_ahead, None)
+
+    def _window_matches(self, days_ahead: int) -> list[Match]:
+        with self._fetch_lock:
+            with self._lock:
+                if days_ahead in self._matches:
+                    return self._matches[days_ahead]
+            matches = self._fetch(days_ahead)
+            with self._lock:
+                self._matches[days_ahead] = matches
+            return matches
+
+    def _fetch(self, days_ahead: int) -> list[Match]:
+        now = self.clock()
+        return self.source(now, now + timedelta(days=days_ahead))
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+from benchmarks import bench_pipeline, fixtures, stub_server
+from connectors import football_data
+
+
+def test_run_pipeline__second_run_served_from_caches(tmp_path) -> None:
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0)
+    data = stub_server.StubData.synthetic(
+        fixtures.FixtureSpec(horizon_days=30), today.replace(microsecond=0)
+    )
+    server = stub_server.StubServer(("127.0.0.1", 0), data)
+    server.start()
+    options = bench_pipeline.PipelineOptions(
+        days_ahead=14,
+        football_requests_per_minute=6000,
+        nominatim_requests_per_second=1000,
+    )
+
+    try:
+        with bench_pipeline.stub_clients(server, tmp_path):
+            cold = bench_pipeline.run_pipeline(server, options)
+            warm = bench_pipeline.run_pipeline(server, options)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    competitions = len(football_data.LeagueId)
+    assert cold.stub_requests["football_data 200"] == 2 * competitions
+    assert cold.stub_requests["nominatim 200"] == len(data.places)
+    assert cold.report["gauges"]["output.options"] > 0
+    assert "matches.fetch" in cold.report["stages"]
+    assert not warm.stub_requests
+    assert warm.report["counters"]["football_data.cache_hits"] == 2 * competitions
+    assert warm.report["gauges"] == cold.report["gauges"]
@@ -0,0 +1,55 @@
+from benchmarks import bench_travel, fixtures
+
+
+def test_synthetic_matches__seeded() -> None:
+    spec = fixtures.FixtureSpec(leagues=3, teams_per_league=10, horizon_days=30)
+
+    matches = fixtures.synthetic_matches(spec)
+
+    assert matches == fixtures.synthetic_matches(spec)
+    assert matches != fixtures.synthetic_matches(spec._replace(seed=1))
+    assert matches == sorted(matches, key=lambda m: m.date)
+    assert {m.home_team.split()[0] for m in matches} == {"L0", "L1", "L2"}
+    assert all((m.date - fixtures.SEASON_START).days < 30 for m in matches)
+
+
+def test_synthetic_matches__density() -> None:
+    spec = fixtures.FixtureSpec(leagues=1, teams_per_league=10, horizon_days=70)
+
+    weekly = fixtures.synthetic_matches(spec)
+    twice_weekly = fixtures.synthetic_matches(spec._replace(rounds_per_week=2))
+
+    assert 40 <= len(weekly) <= 55
+    assert len(twice_weekly) > 1.8 * len(weekly)
+
+
+def test_run_tier__stages_agree() -> None:
+    matches = fixtures.synthetic_matches(fixtures.FixtureSpec(leagues=2))
+
+    results = bench_travel.run_tier(matches, bench_travel.GraphBuilder.GRID)
+
+    assert list(results) == [
+        "build_graph",
+        "group_equivalent_nodes",
+        "dfs_paths",
+        "remove_subsequences",
+        "dag_maximal_paths",
+        "all_equivalent_paths",
+    ]
+    assert results["remove_subsequences"].output == (
+        results["dag_maximal_paths"].output
+    )
+
+
+def test_regressions() -> None:
+    result = bench_travel.StageResult(seconds=1.0, peak_bytes=1 << 20, output=7)
+    baseline = {"stage": [0.5, 1 << 20, 7], "gone": [0.1, 1, 1]}
+
+    assert bench_travel.regressions({"stage": result}, baseline, 1.5) == [
+        "stage: 1.000s vs 0.500s"
+    ]
+    assert not bench_travel.regressions({"stage": result}, baseline, 2.5)
+    assert bench_travel.regressions(
+        {"stage": result._replace(output=8)}, baseline, 2.5
+    ) == ["stage: output 8 != 7"]
+    assert not bench_travel.regressions({"new": result}, baseline, 1.5)
@@ -0,0 +1,118 @@
+from datetime import date, datetime
+
+import pytest
+import requests
+
+from benchmarks import fixtures, stub_server
+from connectors.fixture_store import FixtureStore
+from connectors.http_cache import CachedResponse, ResponseCache
+from data_classes import Location
+from venues import JsonVenueStore, VenueEntry
+
+START = datetime(2026, 3, 2)
+SPEC = fixtures.FixtureSpec(teams_per_league=6, horizon_days=21)
+
+
+@pytest.fixture(name="serve")
+def fixture_serve():
+    servers = []
+
+    def serve(**configs) -> stub_server.StubServer:
+        data = stub_server.StubData.synthetic(SPEC, START, ["PL", "CL"])
+        server = stub_server.StubServer(("127.0.0.1", 0), data, **configs)
+        server.start()
+        servers.append(server)
+        return server
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_synthetic__leagues_as_competitions() -> None:
+    data = stub_server.StubData.synthetic(SPEC, START, ["PL", "CL"])
+
+    assert list(data.competitions) == ["PL", "CL"]
+    pl = data.competitions["PL"]
+    assert {f["homeTeam"]["name"].split()[0] for f in pl.matches} == {"L0"}
+    assert min(f["utcDate"] for f in pl.matches) >= "2026-03-02"
+    assert {team["venue"] for team in pl.teams} <= set(data.places)
+    fixtures_ = data.fixtures("PL", "2026-03-09", "2026-03-10")
+    assert fixtures_
+    assert all("2026-03-09" <= f["utcDate"] < "2026-03-11" for f in fixtures_)
+
+
+def test_stub_server__football_data_and_search(serve) -> None:
+    server = serve()
+
+    matches = requests.get(
+        f"{server.url}/v4/competitions/CL/matches",
+        params={"dateFrom": "2026-03-02", "dateTo": "2026-03-08"},
+        timeout=5,
+    )
+    teams = requests.get(f"{server.url}/v4/competitions/CL/teams", timeout=5)
+    venue = teams.json()["teams"][0]["venue"]
+    found = requests.get(f"{server.url}/search", params={"q": venue}, timeout=5)
+    missing = requests.get(f"{server.url}/search", params={"q": "Nowhere"}, timeout=5)
+    unknown = requests.get(f"{server.url}/v4/competitions/XX/teams", timeout=5)
+
+    assert matches.json()["resultSet"]["count"] == len(matches.json()["matches"]) > 0
+    location = server.data.places[venue]
+    assert found.json()[0]["lat"] == str(location.latitude)
+    assert not missing.json()
+    assert unknown.status_code == 404
+    assert server.requests == {
+        ("football_data", 200): 2,
+        ("football_data", 404): 1,
+        ("nominatim", 200): 2,
+    }
+
+
+def test_stub_server__quota_and_random_429(serve) -> None:
+    limited = serve(football=stub_server.StubConfig(requests_per_minute=1))
+    throttled = serve(
+        nominatim=stub_server.StubConfig(throttle_share=1.0, retry_after=7)
+    )
+
+    url = f"{limited.url}/v4/competitions/PL/teams"
+    first, second = (requests.get(url, timeout=5) for _ in range(2))
+    search = requests.get(f"{throttled.url}/search", params={"q": "x"}, timeout=5)
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "60"
+    assert search.status_code == 429
+    assert search.headers["Retry-After"] == "7"
+
+
+def test_recorded__merges_cached_fixtures(tmp_path) -> None:
+    cache = ResponseCache(tmp_path / "cache")
+    base = "https://api.football-data.org/v4/competitions/PL"
+    fixture = {
+        "homeTeam": {"name": "A"},
+        "awayTeam": {"name": "B"},
+        "utcDate": "2026-03-07T15:00:00Z",
+    }
+    later = {**fixture, "utcDate": "2026-03-14T15:00:00Z"}
+    teams = {"teams": [{"name": "A", "venue": "Ground"}]}
+    cache.store(f"{base}/matches", {"to": 1}, CachedResponse({"matches": [fixture]}, 0))
+    cache.store(
+        f"{base}/matches", {"to": 2}, CachedResponse({"matches": [fixture, later]}, 0)
+    )
+    cache.store(f"{base}/teams", {}, CachedResponse(teams, 0))
+    held = {**fixture, "id": 7}
+    FixtureStore(tmp_path / "cache" / "fixtures").store(
+        "CL", date(2026, 3, 1), date(2026, 3, 31), [held]
+    )
+    store = JsonVenueStore(tmp_path / "venues.json", tmp_path / "missing.json")
+    store.put_many(
+        {"Ground": VenueEntry(Location(51.5, -0.1)), "Lost": VenueEntry(None, 1.0)}
+    )
+
+    data = stub_server.StubData.recorded(tmp_path / "cache", store)
+
+    assert data.competitions["PL"].matches == [fixture, later]
+    assert data.competitions["PL"].teams == [{"name": "A", "venue": "Ground"}]
+    assert data.competitions["CL"] == stub_server.Competition([held], [])
+    assert data.places == {"Ground": Location(51.5, -0.1)}
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from connectors import football_data, http_cache
+from connectors.fixture_store import FixtureStore
+
+# 2026-03-02 00:00 UTC
+START = datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    """
+    Stands in for both a clock and `time.sleep`: sleeping moves it forward.
+    """
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(tmp_path, monkeypatch) -> FakeClock:
+    """
+    The clock of a football-data response cache and fixture store in
+    `tmp_path`, used instead of the real ones.
+    """
+    clock = FakeClock(START.timestamp())
+    monkeypatch.setattr(
+        football_data, "_cache", http_cache.ResponseCache(tmp_path, clock=clock)
+    )
+    monkeypatch.setattr(
+        football_data, "_fixtures", FixtureStore(tmp_path / "fixtures", clock)
+    )
+    monkeypatch.setattr(football_data, "_cache_mode", http_cache.CacheMode.NORMAL)
+    return clock
@@ -0,0 +1,174 @@
+# pylint: disable=protected-access
+
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors import football_data, http_cache
+from connectors.fixture_store import FixtureStore, HeldRange
+from .conftest import START, FakeClock
+
+DAY = 24 * 3600.0
+
+
+def _fixture(match_id: int, day: date, hour: int = 15) -> dict:
+    return {
+        "id": match_id,
+        "utcDate": f"{day.isoformat()}T{hour:02}:00:00Z",
+        "homeTeam": {"name": f"Home {match_id}"},
+        "awayTeam": {"name": f"Away {match_id}"},
+    }
+
+
+def _day(offset: int) -> date:
+    return START.date() + timedelta(days=offset)
+
+
+def test_fixture_store__missing_ranges(tmp_path) -> None:
+    clock = FakeClock(START.timestamp())
+    store = FixtureStore(tmp_path, clock=clock)
+    store.store("PL", _day(2), _day(4), [])
+    store.store("PL", _day(7), _day(8), [])
+    clock.now += 2 * DAY
+
+    assert store.missing("PL", _day(0), _day(9), lambda day: 3 * DAY) == [
+        (_day(0), _day(1)),
+        (_day(5), _day(6)),
+        (_day(9), _day(9)),
+    ]
+    # held for two days: stale on a one day TTL
+    assert store.missing("PL", _day(3), _day(8), lambda day: DAY) == [
+        (_day(3), _day(8))
+    ]
+    assert store.missing("CL", _day(0), _day(0), lambda day: DAY) == [
+        (_day(0), _day(0))
+    ]
+
+
+def test_fixture_store__store_replaces_days_and_moved_matches(tmp_path) -> None:
+    clock = FakeClock(START.timestamp())
+    store = FixtureStore(tmp_path, clock=clock)
+    store.store(
+        "PL",
+        _day(0),
+        _day(9),
+        [_fixture(1, _day(1)), _fixture(2, _day(3)), _fixture(3, _day(8))],
+    )
+    clock.now += DAY
+    # match 2 is cancelled, match 3 moved into the refreshed days
+    left = store.store(
+        "PL", _day(2), _day(4), [_fixture(3, _day(4)), _fixture(4, _day(2))]
+    )
+
+    assert left == {"2"}
+
+    held = store.matches("PL", _day(0), _day(9))
+
+    assert [(m["id"], m["utcDate"][:10]) for m in held] == [
+        (1, "2026-03-03"),
+        (4, "2026-03-04"),
+        (3, "2026-03-06"),
+    ]
+    assert store._load("PL").ranges == [
+        HeldRange(_day(0), _day(1), START.timestamp()),
+        HeldRange(_day(2), _day(4), START.timestamp() + DAY),
+        HeldRange(_day(5), _day(9), START.timestamp()),
+    ]
+
+
+def test_fixture_store__drops_past_days(tmp_path) -> None:
+    clock = FakeClock(START.timestamp())
+    store = FixtureStore(tmp_path, clock=clock)
+    store.store("PL", _day(0), _day(3), [_fixture(1, _day(0)), _fixture(2, _day(2))])
+    clock.now += 2 * DAY
+
+    store.store("PL", _day(2), _day(4), [_fixture(2, _day(2))])
+
+    assert store._load("PL").ranges[0].first == _day(2)
+    assert [m["id"] for m in store.matches("PL", _day(0), _day(4))] == [2]
+
+
+def _serve_fixtures(fixtures: list[dict]) -> MagicMock:
+    def request(_url, _headers, params):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {
+            "matches": [
+                f
+                for f in fixtures
+                if params["dateFrom"] <= f["utcDate"][:10] <= params["dateTo"]
+            ]
+        }
+        return response
+
+    return MagicMock(side_effect=request)
+
+
+def test_get_upcoming_fixtures__daily_window_fetches_new_days(
+    clock, monkeypatch
+) -> None:
+    fixtures = [_fixture(i, _day(i)) for i in range(40)]
+    request = _serve_fixtures(fixtures)
+    monkeypatch.setattr(football_data, "_request", request)
+
+    def window(offset: int) -> dict:
+        return football_data.get_upcoming_fixtures(
+            football_data.FixturesParams(
+                football_data.LeagueId.PREMIER_LEAGUE,
+                START + timedelta(days=offset),
+                START + timedelta(days=offset + 29),
+            )
+        )
+
+    assert window(0)["matches"] == fixtures[:30]
+    clock.now += DAY
+    assert window(1)["matches"] == fixtures[1:31]
+
+    near = football_data.FIXTURES_NEAR_DAYS
+    assert [call.args[2] for call in request.call_args_list] == [
+        {"dateFrom": "2026-03-02", "dateTo": "2026-03-31"},
+        {"dateFrom": "2026-03-03", "dateTo": _day(near).isoformat()},
+        {"dateFrom": "2026-04-01", "dateTo": "2026-04-01"},
+    ]
+    assert window(1)["matches"] == fixtures[1:31]
+    assert request.call_count == 3
+
+
+def test_get_upcoming_fixtures__match_moved_out_of_refreshed_days(
+    clock, monkeypatch
+) -> None:
+    fixtures = [_fixture(1, _day(1)), _fixture(2, _day(10))]
+    request = _serve_fixtures(fixtures)
+    monkeypatch.setattr(football_data, "_request", request)
+    params = football_data.FixturesParams(
+        football_data.LeagueId.PREMIER_LEAGUE, START, START + timedelta(days=18)
+    )
+    football_data.get_upcoming_fixtures(params)
+    # match 1 moves from a near day to a far one, which is still held as fresh
+    fixtures[0] = _fixture(1, _day(15))
+    clock.now += 2 * 3600
+
+    matches = football_data.get_upcoming_fixtures(params)["matches"]
+
+    assert [(m["id"], m["utcDate"][:10]) for m in matches] == [
+        (2, "2026-03-12"),
+        (1, "2026-03-17"),
+    ]
+    assert request.call_count == 3
+
+
+def test_get_upcoming_fixtures__offline(clock, monkeypatch) -> None:
+    monkeypatch.setattr(football_data, "_request", _serve_fixtures([]))
+    params = football_data.FixturesParams(
+        football_data.LeagueId.PREMIER_LEAGUE, START, START + timedelta(days=5)
+    )
+    football_data.get_upcoming_fixtures(params)
+    clock.now += 365 * DAY
+
+    monkeypatch.setattr(football_data, "_cache_mode", http_cache.CacheMode.OFFLINE)
+    football_data._request.side_effect = AssertionError("network used")
+    assert football_data.get_upcoming_fixtures(params) == {"matches": []}
+    with pytest.raises(http_cache.CacheMissError):
+        football_data.get_upcoming_fixtures(
+            params._replace(end_date=START + timedelta(days=6))
+        )
@@ -1,8 +1,14 @@
 from datetime import datetime, timedelta
+from unittest.mock import MagicMock
 
+import pytest
+
+import profiling
 from connectors import football_data
+from connectors.http_cache import CacheMode
 
 
+@pytest.mark.live
 def test_get_upcoming_fixtures__sanity():
     today = datetime(2025, 9, 1)
     data = football_data.get_upcoming_fixtures(
@@ -17,6 +23,7 @@ def test_get_upcoming_fixtures__sanity():
     assert all(match["awayTeam"] for match in data["matches"])
 
 
+@pytest.mark.live
 def test_get_champions_league_fixtures__sanity():
     today = datetime(2025, 9, 1)
     data = football_data.get_champions_league_fixtures(
@@ -30,6 +37,7 @@ def test_get_champions_league_fixtures__sanity():
     assert all(match["awayTeam"] for match in data["matches"])
 
 
+@pytest.mark.live
 def test_get_competition_teams__sanity():
     threshold = 5  # TODO: decrease threshold
 
@@ -42,3 +50,66 @@ def test_get_competition_teams__sanity():
             missing_venue[team["name"]] = team["venue"]
 
     assert len(missing_venue) < threshold, "Some clubs are missing venues"
+
+
+def test_get_football_data__retries_after_429(monkeypatch):
+    throttled = MagicMock(status_code=429, headers={"Retry-After": "7"})
+    ok = MagicMock(status_code=200, headers={})
+    ok.json.return_value = {"matches": []}
+    session = MagicMock()
+    session.get.side_effect = [throttled, ok]
+    limiter = MagicMock()
+    monkeypatch.setattr(football_data, "_cache_mode", CacheMode.DISABLED)
+    monkeypatch.setattr(football_data, "_session", session)
+    monkeypatch.setattr(football_data, "_limiter", limiter)
+
+    data = football_data.get_football_data("url", headers={}, params={})
+
+    assert data == {"matches": []}
+    assert session.get.call_count == 2
+    assert limiter.acquire.call_count == 2
+    limiter.pause.assert_called_once_with(7.0)
+
+
+def test_get_football_data__profiled(monkeypatch):
+    ok = MagicMock(status_code=200, headers={}, content=b"{}")
+    ok.json.return_value = {}
+    session = MagicMock()
+    session.get.return_value = ok
+    limiter = MagicMock()
+    limiter.acquire.return_value = 0.5
+    monkeypatch.setattr(football_data, "_cache_mode", CacheMode.DISABLED)
+    monkeypatch.setattr(football_data, "_session", session)
+    monkeypatch.setattr(football_data, "_limiter", limiter)
+
+    with profiling.profile() as profiler:
+        football_data.get_football_data("url", headers={}, params={})
+        football_data.get_football_data("url", headers={}, params={})
+
+    assert profiler.counters == {
+        "football_data.bytes": 4,
+        "football_data.rate_limit_wait_seconds": 1.0,
+        "football_data.requests": 2,
+    }
+
+
+def test_get_leagues_data__fetches_every_league(monkeypatch):
+    monkeypatch.setattr(
+        football_data,
+        "get_upcoming_fixtures",
+        lambda params: {"matches": [params.league_id]},
+    )
+    monkeypatch.setattr(
+        football_data, "get_competition_teams", lambda league_id: {"teams": [league_id]}
+    )
+    today = datetime(2025, 9, 1)
+
+    leagues = football_data.get_leagues_data(
+        list(football_data.LeagueId), today, today + timedelta(days=30)
+    )
+
+    assert list(leagues) == list(football_data.LeagueId)
+    for league_id, league in leagues.items():
+        assert league == football_data.LeagueData(
+            {"matches": [league_id]}, {"teams": [league_id]}
+        )
@@ -0,0 +1,83 @@
+# pylint: disable=protected-access
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors import football_data, http_cache
+
+
+def _response(status_code: int, body=None, headers=None) -> MagicMock:
+    response = MagicMock(status_code=status_code, headers=headers or {})
+    response.json.return_value = body
+    return response
+
+
+def test_response_cache__roundtrip(tmp_path) -> None:
+    cache = http_cache.ResponseCache(tmp_path)
+    response = http_cache.CachedResponse({"teams": []}, fetched_at=1.0, etag='"v1"')
+
+    assert cache.load("url", {"a": 1}) is None
+    cache.store("url", {"a": 1}, response)
+
+    assert cache.load("url", {"a": 1}) == response
+    assert cache.load("url", {"a": 2}) is None
+
+
+def test_cache_ttl__per_endpoint() -> None:
+    teams_ttl = football_data.cache_ttl(
+        f"{football_data.BASE_URL}/competitions/CL/teams"
+    )
+    matches_ttl = football_data.cache_ttl(
+        f"{football_data.BASE_URL}/competitions/CL/matches"
+    )
+    assert teams_ttl > matches_ttl
+
+
+def test_get_football_data__serves_fresh_entry(clock, monkeypatch) -> None:
+    request = MagicMock(return_value=_response(200, {"teams": ["A"]}))
+    monkeypatch.setattr(football_data, "_request", request)
+    url = "https://example.com/competitions/CL/teams"
+
+    assert football_data.get_football_data(url, {}, {}) == {"teams": ["A"]}
+    clock.now += 3600
+    assert football_data.get_football_data(url, {}, {}) == {"teams": ["A"]}
+    assert request.call_count == 1
+
+
+def test_get_football_data__revalidates_stale_entry(clock, monkeypatch) -> None:
+    request = MagicMock(
+        side_effect=[
+            _response(200, {"matches": ["A"]}, {"ETag": '"v1"'}),
+            _response(304),
+        ]
+    )
+    monkeypatch.setattr(football_data, "_request", request)
+    url = "https://example.com/competitions/CL/matches"
+
+    football_data.get_football_data(url, {"X-Auth-Token": "key"}, {"dateFrom": "x"})
+    clock.now += football_data.cache_ttl(url) + 1
+    data = football_data.get_football_data(
+        url, {"X-Auth-Token": "key"}, {"dateFrom": "x"}
+    )
+
+    assert data == {"matches": ["A"]}
+    assert request.call_args.args[1] == {"X-Auth-Token": "key", "If-None-Match": '"v1"'}
+    # the 304 renewed the entry, so it is served without a request again
+    football_data.get_football_data(url, {}, {"dateFrom": "x"})
+    assert request.call_count == 2
+
+
+def test_get_football_data__offline(clock, monkeypatch) -> None:
+    monkeypatch.setattr(
+        football_data, "_request", MagicMock(return_value=_response(200, {"teams": []}))
+    )
+    url = "https://example.com/competitions/CL/teams"
+    football_data.get_football_data(url, {}, {})
+    clock.now += 365 * 24 * 3600
+
+    football_data.set_cache_mode(http_cache.CacheMode.OFFLINE)
+    football_data._request.side_effect = AssertionError("network used")
+    assert football_data.get_football_data(url, {}, {}) == {"teams": []}
+    with pytest.raises(http_cache.CacheMissError):
+        football_data.get_football_data(url, {}, {"season": 2024})
@@ -1,6 +1,9 @@
+import pytest
+
 from connectors import open_street_map
 
 
+@pytest.mark.live
 def test_venue_location__sanity() -> None:
     venue_name = "Allianz Arena"
     data = open_street_map.venue_location(venue_name)
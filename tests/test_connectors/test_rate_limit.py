@@ -0,0 +1,45 @@
+from connectors import rate_limit
+from .conftest import FakeClock
+
+
+def test_token_bucket__burst_then_spaced() -> None:
+    clock = FakeClock()
+    bucket = rate_limit.TokenBucket(
+        rate=1.0, capacity=2, clock=clock, sleep=clock.sleep
+    )
+
+    waits = [bucket.acquire() for _ in range(4)]
+    assert waits == [0.0, 0.0, 1.0, 1.0]
+    assert clock.now == 2.0
+
+
+def test_token_bucket__pause_blocks_next_acquire() -> None:
+    clock = FakeClock()
+    bucket = rate_limit.TokenBucket(
+        rate=0.5, capacity=5, clock=clock, sleep=clock.sleep
+    )
+
+    bucket.pause(30)
+    assert bucket.acquire() == 32.0
+
+
+def test_token_bucket__try_acquire_does_not_wait() -> None:
+    clock = FakeClock()
+    bucket = rate_limit.TokenBucket(
+        rate=0.5, capacity=1, clock=clock, sleep=clock.sleep
+    )
+
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 2.0
+    clock.now = 1.5
+    assert bucket.try_acquire() == 0.5
+    clock.now = 2.0
+    assert bucket.try_acquire() == 0.0
+    assert not clock.sleeps
+
+
+def test_retry_after_seconds() -> None:
+    assert rate_limit.retry_after_seconds("12", default=60) == 12
+    assert rate_limit.retry_after_seconds(None, default=60) == 60
+    assert rate_limit.retry_after_seconds("not a date", default=60) == 60
+    assert rate_limit.retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT", 60) == 0
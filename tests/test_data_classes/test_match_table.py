@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from data_classes import Location, Match, MatchTable
+
+PARIS = timezone(timedelta(hours=2))
+MATCHES = [
+    Match("B", "C", datetime(2025, 9, 2, 23, 30, tzinfo=PARIS), Location(48.8, 2.3)),
+    Match("A", "B", datetime(2025, 9, 1, 19, tzinfo=timezone.utc), Location(51.5, 0.0)),
+    Match("C", "A", datetime(2025, 9, 1, 18, tzinfo=timezone.utc), Location(48.8, 2.3)),
+]
+
+
+def test_from_matches__round_trip() -> None:
+    table = MatchTable.from_matches(MATCHES)
+
+    assert table == MATCHES
+    assert table[-1] == MATCHES[-1]
+    assert [m.date.utcoffset() for m in table] == [m.date.utcoffset() for m in MATCHES]
+    assert table.teams == ["B", "A", "C"]
+    assert table.venues == [Location(48.8, 2.3), Location(51.5, 0.0)]
+    assert table.venue_ids.tolist() == [0, 1, 0]
+
+
+def test_columns() -> None:
+    table = MatchTable.from_matches(MATCHES)
+
+    # day ordinals follow the local date, like `date.date().toordinal()`
+    assert table.days.tolist() == [m.date.date().toordinal() for m in MATCHES]
+    assert table.days.dtype == np.int32
+    assert table.latitude.tolist() == [48.8, 51.5, 48.8]
+    assert table.longitude.flags["C_CONTIGUOUS"]
+
+
+def test_sorted__by_kickoff_instant() -> None:
+    table = MatchTable.from_matches(MATCHES).sorted()
+
+    assert table == sorted(MATCHES, key=lambda m: m.date)
+    assert table[1:] == sorted(MATCHES, key=lambda m: m.date)[1:]
+
+
+def test_naive_dates() -> None:
+    matches = [Match("A", "B", datetime(1969, 12, 31, 23), Location(0.0, 0.0))]
+
+    table = MatchTable.from_matches(matches)
+
+    assert table == matches
+    assert table.days.tolist() == [datetime(1969, 12, 31).toordinal()]
+
+
+def test_empty() -> None:
+    table = MatchTable.from_matches([])
+
+    assert not table
+    assert table.sorted() == []
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import profiling
+from data_classes import Location, Match
+from travel import travel
+
+STAMFORD_BRIDGE = Location(51.4816869, -0.1910336)
+
+
+def test_no_hooks__nothing_recorded() -> None:
+    profiler = profiling.Profiler()
+
+    profiling.count("ignored")
+    with profiling.stage("ignored"):
+        pass
+
+    assert not profiler.counters
+    assert not profiler.stages
+
+
+def test_hooks__receive_events() -> None:
+    events = []
+    profiling.add_hook(events.append)
+    try:
+        profiling.count("requests", 2)
+        profiling.gauge("size", 7)
+        with profiling.stage("build"):
+            pass
+    finally:
+        profiling.remove_hook(events.append)
+    profiling.count("after")
+
+    assert [(e.kind, e.name) for e in events] == [
+        (profiling.EventKind.COUNT, "requests"),
+        (profiling.EventKind.GAUGE, "size"),
+        (profiling.EventKind.STAGE, "build"),
+    ]
+    assert events[-1].value >= 0
+
+
+def test_profiler__aggregates() -> None:
+    with profiling.profile() as profiler:
+        profiling.count("requests")
+        profiling.count("requests", 2)
+        profiling.gauge("size", 7)
+        profiling.gauge("size", 5)
+        for _ in range(3):
+            with profiling.stage("build"):
+                pass
+
+    report = profiler.report()
+    assert report["counters"] == {"requests": 3}
+    assert report["gauges"] == {"size": 5}
+    assert report["stages"]["build"]["calls"] == 3
+
+
+def test_profiler__travel_graph() -> None:
+    day = datetime(2025, 9, 1)
+    matches = [
+        Match(f"A{i}", f"B{i}", day + timedelta(days=i // 2, hours=i), STAMFORD_BRIDGE)
+        for i in range(6)
+    ]
+
+    with profiling.profile() as profiler:
+        travel_graph = travel.TravelGraph(matches, max_dist=10, max_days=3)
+        paths = travel_graph.find_paths(min_games=2)
+
+    report = profiler.report()
+    assert {"graph.build", "graph.group", "search", "search.dfs"} <= set(
+        report["stages"]
+    )
+    assert report["gauges"]["graph.matches"] == 6
+    assert report["gauges"]["graph.edges"] == travel_graph.num_edges()
+    assert report["gauges"]["graph.equivalence_classes"] == 3
+    assert report["counters"]["paths.expanded"] == len(paths)
+    assert report["counters"]["paths.maximal"] <= report["counters"]["paths.raw"]
+    assert report["counters"]["dfs.visited"] <= report["counters"]["dfs.calls"]
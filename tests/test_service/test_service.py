@@ -0,0 +1,163 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+import pytest
+
+from data_classes import Location, Match
+from service import PathQuery, StubFixtureSource, TravelServer, TravelService
+from service.server import parse_query
+from travel import travel
+from travel.output import match_to_dict
+
+NOW = datetime(2025, 9, 1)
+# Highbury, Stamford Bridge, Tottenham
+VENUES = [
+    Location(51.5550403, -0.1083997),
+    Location(51.4816869, -0.1910336),
+    Location(51.604157, -0.0662604),
+]
+
+
+def _matches(n: int) -> list[Match]:
+    return [
+        Match(
+            home_team=f"A{i}",
+            away_team=f"B{i}",
+            date=NOW + timedelta(days=i // 2, hours=12 + i % 2),
+            location=VENUES[i % len(VENUES)],
+        )
+        for i in range(n)
+    ]
+
+
+def _service(matches: list[Match], **kwargs) -> TravelService:
+    return TravelService(StubFixtureSource(matches), clock=lambda: NOW, **kwargs)
+
+
+def test_find_paths__pages() -> None:
+    matches = _matches(12)
+    expected = travel.TravelGraph(matches, max_dist=50, max_days=5).find_paths(3)
+    travel_service = _service(matches)
+
+    first = travel_service.find_paths(PathQuery(offset=0, limit=2))
+    rest = travel_service.find_paths(PathQuery(offset=2, limit=500))
+
+    assert first["total"] == rest["total"] == len(expected)
+    assert [o["option"] for o in first["options"]] == [1, 2]
+    assert rest["options"][0]["option"] == 3
+    assert [o["matches"] for o in first["options"] + rest["options"]] == [
+        [match_to_dict(m) for m in path] for path in expected
+    ]
+
+
+def test_find_paths__evicts_least_recently_used() -> None:
+    travel_service = _service(_matches(6), max_graphs=2)
+
+    for max_days in (1, 2, 1, 3):
+        travel_service.find_paths(PathQuery(max_days=max_days))
+
+    assert travel_service.status()["graphs"] == [[30, 50.0, 1], [30, 50.0, 3]]
+
+
+def test_find_paths__evicts_unused_fixtures() -> None:
+    source = StubFixtureSource(_matches(6))
+    calls = []
+
+    def fetch(start: datetime, end: datetime) -> list[Match]:
+        calls.append(end)
+        return source(start, end)
+
+    travel_service = TravelService(fetch, clock=lambda: NOW, max_graphs=2)
+
+    for days_ahead in (10, 20, 10, 30):
+        travel_service.find_paths(PathQuery(days_ahead=days_ahead))
+    travel_service.refresh()
+
+    assert travel_service.status()["fixtures"] == {"10": 6, "30": 6}
+    assert calls[-2:] == [NOW + timedelta(days=10), NOW + timedelta(days=30)]
+
+
+def test_refresh__applies_changed_fixtures() -> None:
+    matches = _matches(10)
+    source = StubFixtureSource(matches)
+    travel_service = TravelService(source, clock=lambda: NOW)
+    travel_service.find_paths(PathQuery())
+
+    source.matches = matches[1:] + _matches(14)[10:]
+    travel_service.refresh()
+
+    expected = travel.TravelGraph(source.matches, max_dist=50, max_days=5)
+    assert travel_service.find_paths(PathQuery(limit=500))["options"] == [
+        {"option": i, "matches": [match_to_dict(m) for m in path]}
+        for i, path in enumerate(expected.find_paths(3), start=1)
+    ]
+
+
+def test_stub_fixtures__from_file(tmp_path) -> None:
+    matches = _matches(4)
+    path = tmp_path / "fixtures.jsonl"
+    path.write_text("\n".join(json.dumps(match_to_dict(m)) for m in matches))
+
+    source = StubFixtureSource.from_file(path)
+
+    assert source.matches == matches
+    assert source(NOW, NOW + timedelta(days=1)) == matches[:2]
+
+
+def test_parse_query() -> None:
+    assert parse_query("max_days=2&grouped=true&max_dist=10") == PathQuery(
+        max_days=2, grouped=True, max_dist=10.0
+    )
+    with pytest.raises(ValueError):
+        parse_query("min_games=three")
+    with pytest.raises(ValueError):
+        parse_query("colour=red")
+    for query in ("max_days=0", "min_games=0", "days_ahead=-1"):
+        with pytest.raises(ValueError, match="must be at least"):
+            parse_query(query)
+    with pytest.raises(ValueError, match="must be at most"):
+        parse_query("days_ahead=91")
+
+
+def test_server() -> None:
+    server = TravelServer(("127.0.0.1", 0), _service(_matches(8)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{url}/paths?limit=1") as response:
+            body = json.load(response)
+        assert body["limit"] == 1 and len(body["options"]) == 1
+        with urllib.request.urlopen(f"{url}/health") as response:
+            assert json.load(response)["graphs"] == [[30, 50.0, 5]]
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/paths?limit=x")  # pylint: disable=R1732
+        assert error.value.code == 400
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/paths?max_days=0")  # pylint: disable=R1732
+        assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_server__failed_query() -> None:
+    def failing_source(start: datetime, end: datetime) -> list[Match]:
+        raise ConnectionError(f"No fixtures for {start:%Y-%m-%d}..{end:%Y-%m-%d}")
+
+    service = TravelService(failing_source, clock=lambda: NOW)
+    server = TravelServer(("127.0.0.1", 0), service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/paths")  # pylint: disable=R1732
+        assert error.value.code == 500
+        assert "ConnectionError" in json.load(error.value)["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,46 @@
+import random
+from datetime import datetime, timedelta
+
+from data_classes import Location, Match
+
+LONDON_VENUES = [
+    Location(51.5550403, -0.1083997),
+    Location(51.4816869, -0.1910336),
+    Location(51.604157, -0.0662604),
+    Location(51.4749218, -0.2217448),
+]
+# London, Madrid and Munich
+CITY_VENUES = [Location(51.5, -0.12), Location(40.42, -3.7), Location(48.14, 11.58)]
+START = datetime(2025, 9, 1)
+
+
+def random_matches(  # pylint: disable=too-many-arguments
+    rng: random.Random | int,
+    n: int,
+    *,
+    days: int,
+    venues: list[Location] | None = None,
+    hour_step: int = 1,
+    jitter: float = 0.0,
+    first_index: int = 0,
+) -> list[Match]:
+    """
+    `n` matches by kickoff, at a random multiple of `hour_step` hours within
+    `days` of `START`, each at one of `venues` (London's by default) moved by
+    up to `jitter` degrees. Teams are numbered from `first_index`.
+    """
+    rng = rng if isinstance(rng, random.Random) else random.Random(rng)
+    venues = venues or LONDON_VENUES
+    matches = []
+    for index in range(first_index, first_index + n):
+        hours = hour_step * rng.randrange(24 * days // hour_step)
+        venue = rng.choice(venues)
+        if jitter:
+            venue = Location(
+                venue.latitude + rng.uniform(-jitter, jitter),
+                venue.longitude + rng.uniform(-jitter, jitter),
+            )
+        matches.append(
+            Match(f"A{index}", f"B{index}", START + timedelta(hours=hours), venue)
+        )
+    return sorted(matches, key=lambda m: m.date)
@@ -0,0 +1,43 @@
+import pytest
+
+from travel import builders
+import venues
+from .conftest import CITY_VENUES, random_matches
+
+
+@pytest.fixture(autouse=True)
+def fixture_distance_matrix():
+    venues.set_distance_matrix(venues.DistanceMatrix())
+    yield
+    venues.set_distance_matrix(None)
+
+
+@pytest.mark.parametrize(
+    "builder",
+    [
+        builders.GraphBuilder.NUMPY,
+        builders.GraphBuilder.GRID,
+        builders.GraphBuilder.MATRIX,
+    ],
+)
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("max_dist, max_days", [(20, 3), (50, 5), (2000, 1)])
+def test_build_graph__matches_python(builder, seed, max_dist, max_days) -> None:
+    matches = random_matches(seed, n=120, days=20, venues=CITY_VENUES, jitter=0.3)
+
+    expected = builders.build_graph_python(matches, max_dist, max_days)
+    graph = builders.build_graph(matches, max_dist, max_days, builder)
+
+    assert graph == expected
+    # insertion order feeds the equivalence keys, so it must match as well
+    assert [list(node.incoming) for node in graph] == [
+        list(node.incoming) for node in expected
+    ]
+    assert [list(node.outgoing) for node in graph] == [
+        list(node.outgoing) for node in expected
+    ]
+
+
+def test_build_graph__empty() -> None:
+    for builder in builders.GraphBuilder:
+        assert not builders.build_graph([], 10, 3, builder)
@@ -0,0 +1,60 @@
+import pytest
+
+from travel import builders, csr, travel
+from travel.search import SearchEngine
+from .conftest import CITY_VENUES, random_matches
+
+
+def test_from_edges() -> None:
+    graph = csr.CsrGraph.from_edges(4, [(0, 1, 1), (0, 3, 2), (1, 3, 1), (2, 3, 1)])
+
+    assert len(graph) == 4
+    assert graph.num_edges() == 4
+    assert graph.outgoing.items(0) == ((1, 1), (3, 2))
+    assert graph.incoming.items(3) == ((0, 2), (1, 1), (2, 1))
+    assert graph[2] == ({}, {3: 1})
+    assert graph.subgraph([0, 3]) == {0: {3: 2}, 3: {}}
+    assert graph.subgraph([1, 2]) == {1: {}, 2: {}}
+    assert not graph.subgraph([])
+
+
+def test_from_edges__empty() -> None:
+    assert not csr.CsrGraph.from_edges(0, []).to_match_graph()
+    assert csr.CsrGraph.from_edges(2, []).to_match_graph() == [({}, {}), ({}, {})]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_build_graph__csr_view_matches_dict(seed) -> None:
+    matches = random_matches(seed, n=150, days=20, venues=CITY_VENUES, jitter=0.3)
+
+    expected = builders.build_graph(matches, 50, 4)
+    graph = builders.build_graph(matches, 50, 4, backend=builders.GraphBackend.CSR)
+
+    assert isinstance(graph, csr.CsrGraph)
+    view = graph.to_match_graph()
+    assert view == expected
+    assert [list(node.incoming) for node in view] == [
+        list(node.incoming) for node in expected
+    ]
+    assert csr.CsrGraph.from_match_graph(expected).to_match_graph() == expected
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_travel_graph__csr_backend(seed) -> None:
+    matches = random_matches(seed, n=80, days=20, venues=CITY_VENUES, jitter=0.3)
+    dict_graph = travel.TravelGraph(matches, max_dist=50, max_days=4)
+    csr_graph = travel.TravelGraph(
+        matches, max_dist=50, max_days=4, backend=builders.GraphBackend.CSR
+    )
+
+    assert csr_graph.equiv_dict == dict_graph.equiv_dict
+    for engine in SearchEngine:
+        assert csr_graph.find_paths(2, engine=engine) == dict_graph.find_paths(
+            2, engine=engine
+        )
+
+    csr_graph.remove_matches(matches[:5])
+    dict_graph.remove_matches(matches[:5])
+    assert isinstance(csr_graph.graph, csr.CsrGraph)
+    assert csr_graph.graph.to_match_graph() == dict_graph.graph
+    assert csr_graph.find_paths(2) == dict_graph.find_paths(2)
@@ -0,0 +1,88 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from travel import incremental, travel
+from travel.search import SearchEngine
+from data_classes import Match
+from .conftest import random_matches
+
+
+def _edges(travel_graph: travel.TravelGraph) -> set[tuple[Match, Match, int]]:
+    return {
+        (travel_graph.matches[i], travel_graph.matches[j], days)
+        for i, node in enumerate(travel_graph.graph)
+        for j, days in node.outgoing.items()
+    }
+
+
+def _groups(travel_graph: travel.TravelGraph) -> set[frozenset[Match]]:
+    return {
+        frozenset(travel_graph.matches[i] for i in group)
+        for group in travel_graph.equiv_dict.values()
+    }
+
+
+def _assert_same_as_rebuild(
+    travel_graph: travel.TravelGraph, matches: list[Match], min_games: int
+) -> None:
+    rebuilt = travel.TravelGraph(
+        matches, max_dist=travel_graph.max_dist, max_days=travel_graph.total_days
+    )
+    assert _edges(travel_graph) == _edges(rebuilt)
+    assert _groups(travel_graph) == _groups(rebuilt)
+    for engine in SearchEngine:
+        paths = travel_graph.find_paths(min_games, engine=engine)
+        expected = rebuilt.find_paths(min_games, engine=engine)
+        assert sorted(map(tuple, paths)) == sorted(map(tuple, expected))
+
+
+def test_day_intervals() -> None:
+    assert incremental.day_intervals({10, 12, 30}, reach=2) == [(8, 14), (28, 32)]
+    assert not incremental.day_intervals(set(), reach=2)
+
+
+def test_remove_matches__missing_match() -> None:
+    rng = random.Random(0)
+    travel_graph = travel.TravelGraph(
+        random_matches(rng, 5, days=10), max_dist=10, max_days=3
+    )
+
+    with pytest.raises(ValueError):
+        travel_graph.remove_matches(random_matches(rng, 1, days=10, first_index=99))
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("span", [True, False])
+def test_updates__same_as_rebuild(seed, span) -> None:
+    rng = random.Random(seed)
+    matches = random_matches(rng, rng.randrange(1, 20), days=10)
+    travel_graph = travel.TravelGraph(
+        matches,
+        max_dist=rng.choice([5, 10, 20]),
+        max_days=rng.randrange(1, 5) if span else 0,
+    )
+    # without a span every path is a single match
+    min_games = 2 if span else 1
+    for engine in SearchEngine:
+        travel_graph.find_paths(min_games, engine=engine)
+
+    for step in range(6):
+        index = 100 * (step + 1)
+        action = rng.choice(["add", "remove", "update"]) if matches else "add"
+        if action == "add":
+            added = random_matches(rng, rng.randrange(1, 4), days=10, first_index=index)
+            travel_graph.add_matches(added)
+            matches = matches + added
+        elif action == "remove":
+            removed = rng.sample(matches, rng.randrange(1, len(matches) + 1))
+            travel_graph.remove_matches(removed)
+            matches = [m for m in matches if m not in removed]
+        else:
+            old = rng.choice(matches)
+            new = old._replace(date=old.date + timedelta(days=rng.randrange(-3, 4)))
+            travel_graph.update_match(old, new)
+            matches = [new if m == old else m for m in matches]
+
+        _assert_same_as_rebuild(travel_graph, matches, min_games)
@@ -0,0 +1,104 @@
+from datetime import datetime, timezone
+
+from connectors import football_data
+from data_classes import Location, Match
+from travel import match
+from venues import DistanceMatrix
+
+TEAMS = {
+    "teams": [
+        {"name": "Arsenal", "venue": "Emirates Stadium"},
+        {"name": "Chelsea", "venue": "Stamford Bridge"},
+        {"name": "Nomads", "venue": None},
+    ]
+}
+FIXTURES = {
+    "matches": [
+        {
+            "homeTeam": {"name": "Arsenal"},
+            "awayTeam": {"name": "Chelsea"},
+            "utcDate": "2025-09-01T19:00:00Z",
+        },
+        {
+            "homeTeam": {"name": "Chelsea"},
+            "awayTeam": {"name": "Arsenal"},
+            "utcDate": "2025-09-02T19:00:00Z",
+            "venue": "Wembley",
+        },
+        {
+            "homeTeam": {"name": "Nomads"},
+            "awayTeam": {"name": "Arsenal"},
+            "utcDate": "2025-09-03T19:00:00Z",
+        },
+    ]
+}
+LOCATIONS = {
+    "Emirates Stadium": Location(51.555, -0.108),
+    "Wembley": Location(51.556, -0.279),
+}
+
+
+def test_fixture_venues__prefers_fixture_venue() -> None:
+    league = football_data.LeagueData(FIXTURES, TEAMS)
+    assert match.fixture_venues(league) == ["Emirates Stadium", "Wembley", None]
+
+
+def test_parse_league_matches__sanity() -> None:
+    league = football_data.LeagueData(FIXTURES, TEAMS)
+
+    matches = match.parse_league_matches(league, LOCATIONS)
+
+    assert matches == [
+        Match(
+            "Arsenal",
+            "Chelsea",
+            datetime(2025, 9, 1, 19, tzinfo=timezone.utc),
+            LOCATIONS["Emirates Stadium"],
+        ),
+        Match(
+            "Chelsea",
+            "Arsenal",
+            datetime(2025, 9, 2, 19, tzinfo=timezone.utc),
+            LOCATIONS["Wembley"],
+        ),
+    ]
+
+
+def test_match_table__same_as_parse_league_matches() -> None:
+    league = football_data.LeagueData(FIXTURES, TEAMS)
+
+    table = match.match_table(match.fixture_rows(league, LOCATIONS))
+
+    assert table == match.parse_league_matches(league, LOCATIONS)
+    assert table.days.tolist() == [739495, 739496]
+
+
+def test_get_all_matches__prefetches_home_grounds(monkeypatch) -> None:
+    def get_leagues_data(league_ids, start_date, end_date, on_teams):
+        del start_date, end_date
+        on_teams(TEAMS)
+        return {
+            league_id: football_data.LeagueData(FIXTURES, TEAMS)
+            for league_id in league_ids
+        }
+
+    batches = []
+
+    def geocode_batch(queries):
+        batches.append(list(queries))
+        return {query: LOCATIONS.get(query) for query in batches[-1]}
+
+    monkeypatch.setattr(match.football_data, "get_leagues_data", get_leagues_data)
+    monkeypatch.setattr(match, "geocode_batch", geocode_batch)
+    distances = DistanceMatrix()
+    monkeypatch.setattr(match, "get_distance_matrix", lambda: distances)
+    today = datetime(2025, 9, 1, tzinfo=timezone.utc)
+
+    matches = match.get_all_matches(today, today)
+
+    assert len(matches) == 2 * len(football_data.LeagueId)
+    assert batches == [
+        ["Emirates Stadium", "Stamford Bridge"],
+        ["Emirates Stadium", "Wembley"] * len(football_data.LeagueId),
+    ]
+    assert len(distances) == 2
@@ -0,0 +1,57 @@
+import io
+import json
+from datetime import datetime, timezone
+
+from travel import output
+from data_classes import GroupedPath, Location, Match
+
+MATCH_A = Match("A", "B", datetime(2025, 9, 1, 19, tzinfo=timezone.utc), Location(1, 2))
+MATCH_C = Match("C", "D", datetime(2025, 9, 1, 20, tzinfo=timezone.utc), Location(3, 4))
+MATCH_E = Match("E", "F", datetime(2025, 9, 3, 19, tzinfo=timezone.utc), Location(5, 6))
+
+
+def test_write_paths__text() -> None:
+    stream = io.StringIO()
+
+    written = output.write_paths(
+        [[MATCH_A, MATCH_E], [MATCH_C, MATCH_E]], output.OutputFormat.TEXT, stream
+    )
+
+    assert written == 2
+    assert stream.getvalue() == (
+        "Option 1:\n"
+        "  2025-09-01: [A vs B]\n"
+        "  2025-09-03: [E vs F]\n"
+        "Option 2:\n"
+        "  2025-09-01: [C vs D]\n"
+        "  2025-09-03: [E vs F]\n"
+    )
+
+
+def test_write_paths__jsonl() -> None:
+    stream = io.StringIO()
+    grouped = GroupedPath(((MATCH_A, MATCH_C), (MATCH_E,)))
+
+    output.write_paths(
+        iter([[MATCH_A, MATCH_E], grouped]), output.OutputFormat.JSONL, stream
+    )
+
+    first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first == {
+        "option": 1,
+        "matches": [
+            {
+                "home_team": "A",
+                "away_team": "B",
+                "date": "2025-09-01T19:00:00+00:00",
+                "latitude": 1,
+                "longitude": 2,
+            },
+            output.match_to_dict(MATCH_E),
+        ],
+    }
+    assert second["combinations"] == 2
+    assert [[m["home_team"] for m in group] for group in second["groups"]] == [
+        ["A", "C"],
+        ["E"],
+    ]
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from data_classes import Location, Match
+from travel import travel
+from travel.ranking import PathScore, score_key
+from travel.utils import dist_between
+from .conftest import random_matches
+
+
+def _random_matches(seed: int, n: int) -> list[Match]:
+    rng = random.Random(seed)
+    # a few venues per cluster, so equivalent matches differ in travel
+    venues = [Location(51.5 + rng.random() / 10, rng.random() / 10) for _ in range(8)]
+    return random_matches(rng, n, days=8, venues=venues, hour_step=12)
+
+
+def _ranked(paths: list[list[Match]], score: PathScore) -> list[list[Match]]:
+    def key(path: list[Match]) -> tuple:
+        km = sum(dist_between(a, b) for a, b in zip(path, path[1:]))
+        return score_key(score, len(path), km)
+
+    # sorted() is stable, so ties keep the order of find_paths
+    return sorted(paths, key=key)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("score", list(PathScore))
+def test_find_top_paths__same_as_ranking_all(seed, score) -> None:
+    travel_graph = travel.TravelGraph(
+        _random_matches(seed, 25), max_dist=10, max_days=3
+    )
+    expected = _ranked(travel_graph.find_paths(2), score)
+
+    for k in (1, 5, 1000):
+        top = travel_graph.find_top_paths(k, min_games=2, score=score)
+
+        assert top.complete
+        assert top.paths == expected[:k]
+
+
+def test_find_top_paths__deadline() -> None:
+    travel_graph = travel.TravelGraph(_random_matches(0, 25), max_dist=10, max_days=3)
+
+    top = travel_graph.find_top_paths(5, min_games=2, deadline=0)
+
+    assert not top.complete
+    assert len(top.paths) <= 5
+
+
+def test_find_top_paths__none() -> None:
+    travel_graph = travel.TravelGraph(_random_matches(0, 5), max_dist=10, max_days=3)
+
+    assert travel_graph.find_top_paths(0, min_games=2) == ([], True)
+    assert travel_graph.find_top_paths(3, min_games=50) == ([], True)
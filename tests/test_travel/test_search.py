@@ -0,0 +1,150 @@
+import random
+
+import pytest
+
+from travel import search, travel
+from data_classes import Location
+from .conftest import random_matches
+
+
+def test_window_index__detours() -> None:
+    # 0 -> 1 -> 2 and 0 -> 2: the direct edge has a detour through 1
+    sparse_graph = {0: {1: 1, 2: 2}, 1: {2: 1}, 2: {}}
+    index = search.WindowIndex(sparse_graph, days=[0, 1, 2], max_span=4)
+
+    assert index.is_shortcut(0, 2)
+    assert not index.is_shortcut(0, 1)
+    assert not index.is_shortcut(1, 2)
+    assert list(index.maximal_paths(min_games=1)) == [(0, 1, 2)]
+
+
+def test_window_index__span_limits_detours() -> None:
+    sparse_graph = {0: {1: 1, 2: 3}, 1: {2: 2}, 2: {}}
+    index = search.WindowIndex(sparse_graph, days=[0, 1, 3], max_span=2)
+
+    assert not index.is_shortcut(0, 2)
+    assert list(index.maximal_paths(min_games=1)) == [(0, 1), (1, 2)]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_find_paths__dag_matches_dfs(seed) -> None:
+    rng = random.Random(seed)
+    matches = random_matches(seed, n=rng.randrange(1, 25), days=rng.randrange(2, 12))
+    travel_graph = travel.TravelGraph(
+        matches, max_dist=rng.choice([5, 10, 20]), max_days=rng.randrange(1, 6)
+    )
+
+    for min_games in (1, 2, 3, 5):
+        expected = travel_graph.find_paths(min_games, engine=search.SearchEngine.DFS)
+        paths = travel_graph.find_paths(min_games, engine=search.SearchEngine.DAG)
+        assert paths == expected
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_find_paths__chunked_matches_dag(seed) -> None:
+    rng = random.Random(seed)
+    matches = random_matches(seed, n=rng.randrange(1, 60), days=rng.randrange(2, 40))
+    travel_graph = travel.TravelGraph(
+        matches, max_dist=rng.choice([5, 10, 20]), max_days=rng.randrange(1, 6)
+    )
+    problem = travel_graph._search_problem()  # pylint: disable=protected-access
+
+    for min_games in (1, 2, 3):
+        expected = search.maximal_paths(problem, min_games, search.SearchEngine.DAG)
+        chunked = search.maximal_paths(problem, min_games, search.SearchEngine.CHUNKED)
+        assert chunked == expected
+        assert travel_graph.find_paths(
+            min_games, engine=search.SearchEngine.CHUNKED
+        ) == travel_graph.find_paths(min_games, engine=search.SearchEngine.DAG)
+
+
+def test_reach_table() -> None:
+    # 0 -> 1 -> 3 and 0 -> 2 -> 3 both take four days
+    problem = search.SearchProblem(
+        {0: {1: 1, 2: 3}, 1: {3: 3}, 2: {3: 1}, 3: {}},
+        days={0: 0, 1: 1, 2: 3, 3: 4},
+        max_span=4,
+    )
+
+    table = search.reach_table(problem)
+
+    assert table[3] == [1, 1, 1, 1, 1]
+    assert table[1] == [1, 1, 1, 2, 2]
+    assert table[2] == [1, 2, 2, 2, 2]
+    assert table[0] == [1, 2, 2, 2, 3]
+
+
+def test_dfs_paths__prunes_short_windows() -> None:
+    # no four games fit in a window from 0, so the search restarts from 1
+    problem = search.SearchProblem(
+        {0: {1: 2}, 1: {2: 1}, 2: {3: 1}, 3: {4: 1}, 4: {}},
+        days={0: 0, 1: 2, 2: 3, 3: 4, 4: 5},
+        max_span=3,
+    )
+
+    assert search.dfs_paths(problem, min_games=4) == {(1, 2, 3, 4)}
+    assert search.maximal_paths(
+        problem, 4, search.SearchEngine.DFS
+    ) == search.maximal_paths(problem, 4, search.SearchEngine.DAG)
+
+
+def test_day_chunks() -> None:
+    assert search.day_chunks([10, 11, 17, 30], max_span=2) == [
+        (10, 12),
+        (16, 18),
+        (28, 30),
+    ]
+    assert not search.day_chunks([], max_span=2)
+    assert search.day_chunks([3, 5], max_span=-1) == [(3, 3), (5, 5)]
+
+
+def test_weakly_connected_components() -> None:
+    sparse_graph = {0: {3: 1}, 1: {}, 2: {4: 1}, 3: {}, 4: {}, 5: {4: 2}}
+
+    assert search.weakly_connected_components(sparse_graph) == [
+        [0, 3],
+        [1],
+        [2, 4, 5],
+    ]
+
+
+def test_split_problem__drops_small_components() -> None:
+    problem = search.SearchProblem(
+        {0: {3: 1}, 1: {}, 2: {4: 1}, 3: {}, 4: {}, 5: {4: 2}},
+        days={0: 0, 1: 0, 2: 1, 3: 1, 4: 2, 5: 0},
+        max_span=3,
+    )
+
+    problems = search.split_problem(problem, min_games=2)
+
+    assert [sorted(p.sparse_graph) for p in problems] == [[2, 4, 5], [0, 3]]
+    assert problems[0].days == {2: 1, 4: 2, 5: 0}
+
+
+@pytest.mark.parametrize("engine", list(search.SearchEngine))
+def test_find_paths__parallel_matches_serial(engine) -> None:
+    matches = [
+        m._replace(
+            location=Location(m.location.latitude + 10 * k, m.location.longitude)
+        )
+        for k in range(3)
+        for m in random_matches(k, n=15, days=6)
+    ]
+    travel_graph = travel.TravelGraph(matches, max_dist=10, max_days=3)
+
+    for min_games in (1, 3):
+        expected = travel_graph.find_paths(min_games, engine=engine)
+        assert travel_graph.find_paths(min_games, engine=engine, workers=2) == expected
+        assert travel_graph.count_paths(min_games, engine, workers=2) == len(expected)
+
+
+@pytest.mark.parametrize("engine", list(search.SearchEngine))
+def test_find_paths__without_span(engine) -> None:
+    matches = random_matches(0, n=30, days=10)
+    travel_graph = travel.TravelGraph(matches, max_dist=10, max_days=0)
+
+    paths = travel_graph.find_paths(1, engine=engine)
+
+    assert sorted(m for [m] in paths) == sorted(matches)
+    assert len(travel_graph.find_top_paths(5).paths) == 5
+    assert sorted(m for [m] in travel_graph.iter_paths(1)) == sorted(matches)
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from travel import snapshot, travel
+from data_classes import Location, Match
+
+EMIRATES_STADIUM = Location(51.5550403, -0.1083997)
+STAMFORD_BRIDGE = Location(51.4816869, -0.1910336)
+TOTTENHAM_STADIUM = Location(51.604157, -0.0662604)
+START = datetime(2025, 9, 1, 19, tzinfo=timezone.utc)
+
+MATCHES = [
+    Match("A0", "B0", START, EMIRATES_STADIUM),
+    Match("A1", "B1", START + timedelta(days=2), STAMFORD_BRIDGE),
+    Match("A2", "B2", START + timedelta(days=2, hours=1), STAMFORD_BRIDGE),
+    Match("A3", "B3", START + timedelta(days=3), TOTTENHAM_STADIUM),
+    Match("A4", "B0", START + timedelta(days=4), EMIRATES_STADIUM),
+]
+
+
+def test_snapshot__roundtrip(tmp_path) -> None:
+    travel_graph = travel.TravelGraph(MATCHES, max_dist=12, max_days=4)
+    path = snapshot.save_snapshot(
+        travel_graph, snapshot.snapshot_path(tmp_path, travel_graph)
+    )
+
+    loaded = snapshot.load_snapshot(path)
+
+    assert loaded.matches == travel_graph.matches
+    assert [m.date.tzinfo for m in loaded.matches] == [timezone.utc] * len(MATCHES)
+    assert loaded.graph == travel_graph.graph
+    assert loaded.equiv_dict == travel_graph.equiv_dict
+    assert list(loaded.equiv_dict) == list(travel_graph.equiv_dict)
+    assert (loaded.max_dist, loaded.total_days) == (12, 4)
+    assert loaded.find_paths(min_games=2) == travel_graph.find_paths(min_games=2)
+
+
+def test_snapshot__naive_dates_and_empty_graph(tmp_path) -> None:
+    naive = [m._replace(date=m.date.replace(tzinfo=None)) for m in MATCHES[:1]]
+    for matches in (naive, []):
+        travel_graph = travel.TravelGraph(matches, max_dist=12, max_days=4)
+        loaded = snapshot.load_snapshot(
+            snapshot.save_snapshot(travel_graph, tmp_path / "graph.npz")
+        )
+        assert loaded.matches == matches
+        assert loaded.graph == travel_graph.graph
+
+
+def test_snapshot__checks_limits_and_key(tmp_path) -> None:
+    travel_graph = travel.TravelGraph(MATCHES, max_dist=12, max_days=4)
+    path = snapshot.save_snapshot(travel_graph, tmp_path / "graph.npz")
+
+    assert snapshot.load_snapshot(path, max_dist=12, max_days=4).total_days == 4
+    with pytest.raises(ValueError, match="max_dist 12, not 50"):
+        snapshot.load_snapshot(path, max_dist=50, max_days=4)
+    with pytest.raises(ValueError, match="max_days 4, not 5"):
+        snapshot.load_snapshot(path, max_dist=12, max_days=5)
+
+    with np.load(path) as npz:
+        data = dict(npz.items())
+    np.savez_compressed(path, **{**data, "max_days": np.array(5)})
+    with pytest.raises(ValueError, match="does not match its key"):
+        snapshot.load_snapshot(path)
+
+
+def test_snapshot_key__order_independent() -> None:
+    key = snapshot.snapshot_key(MATCHES, max_dist=12, max_days=4)
+
+    assert key == snapshot.snapshot_key(MATCHES[::-1], max_dist=12, max_days=4)
+    assert key != snapshot.snapshot_key(MATCHES, max_dist=12, max_days=5)
+    assert key != snapshot.snapshot_key(MATCHES[1:], max_dist=12, max_days=4)
@@ -0,0 +1,44 @@
+import pytest
+
+from travel import travel
+from travel.search import SearchEngine
+from travel.sweep import ParameterSweep, SweepPoint
+from .conftest import random_matches
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("engine", list(SearchEngine))
+def test_find_paths__same_as_separate_graphs(seed, engine) -> None:
+    matches = random_matches(seed, 30, days=10)
+    sweep = ParameterSweep(matches, max_dists=[5, 10, 20], max_days=[2, 3, 5])
+
+    results = sweep.find_paths([2, 3], engine=engine)
+
+    assert len(results) == 18
+    for (max_dist, max_days, min_games), paths in results.items():
+        travel_graph = travel.TravelGraph(matches, max_dist, max_days)
+        assert paths == travel_graph.find_paths(min_games, engine=engine)
+
+
+def test_count_paths() -> None:
+    matches = random_matches(0, 30, days=10)
+    sweep = ParameterSweep(matches, max_dists=[10], max_days=[3])
+
+    assert sweep.count_paths([3, 2]) == {
+        SweepPoint(10, 3, games): travel.TravelGraph(matches, 10, 3).count_paths(games)
+        for games in (2, 3)
+    }
+
+
+def test_graph__looser_than_sweep() -> None:
+    sweep = ParameterSweep(random_matches(0, 5, days=10), max_dists=[10], max_days=[3])
+
+    with pytest.raises(ValueError):
+        sweep.graph(20, 3)
+
+
+def test_find_paths__higher_min_games_filters_cached_paths() -> None:
+    travel_graph = travel.TravelGraph(random_matches(1, 30, days=10), 10, 3)
+    all_paths = travel_graph.find_paths(1)
+
+    assert travel_graph.find_paths(3) == [path for path in all_paths if len(path) >= 3]
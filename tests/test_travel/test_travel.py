@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 from itertools import combinations
 
 from travel import travel
-from data_classes import Location, Match, MatchGraph, NodeAdjacency
+from data_classes import GroupedPath, Location, Match, MatchGraph, NodeAdjacency
 
 
 CRAVEN_COTTAGE = Location(51.4749218, -0.2217448)
@@ -194,6 +194,76 @@ def test_find_paths__testcase_3() -> None:
     assert paths == expected
 
 
+def test_find_paths__grouped() -> None:
+    matches = [
+        _match(index=0, days=0, loc=TOTTENHAM_STADIUM),
+        _match(index=1, days=0, hours=1, loc=STAMFORD_BRIDGE),
+        _match(index=2, days=1, loc=STAMFORD_BRIDGE),
+        _match(index=3, days=2, loc=STAMFORD_BRIDGE),
+        _match(index=4, days=2, hours=1, loc=TOTTENHAM_STADIUM),
+        _match(index=5, days=3, loc=TOTTENHAM_STADIUM),
+    ]
+    travel_graph = travel.TravelGraph(matches, max_dist=50, max_days=5)
+
+    grouped = travel_graph.find_paths(min_games=3, grouped=True)
+
+    assert grouped == [
+        GroupedPath(
+            (
+                (matches[0], matches[1]),
+                (matches[2],),
+                (matches[3], matches[4]),
+                (matches[5],),
+            )
+        )
+    ]
+    assert travel_graph.count_paths(min_games=3) == 4
+    expanded = [path for grouped_path in grouped for path in grouped_path.expand()]
+    assert expanded == travel_graph.find_paths(min_games=3)
+
+
+def test_format_paths__grouped() -> None:
+    matches = [
+        _match(index=0, days=0),
+        _match(index=1, days=0, hours=1),
+        _match(index=2, days=1),
+    ]
+    travel_graph = travel.TravelGraph(matches, max_dist=10, max_days=5)
+
+    text = travel_graph.format_paths(travel_graph.find_paths(2, grouped=True))
+
+    assert text == (
+        "Option 1 (2 combinations):\n"
+        "  2025-09-01: [A0 vs B0 | A1 vs B1]\n"
+        "  2025-09-02: [A2 vs B2]"
+    )
+
+
+def test_iter_paths__same_paths_as_find_paths() -> None:
+    matches = [
+        _match(index=0, days=0, loc=TOTTENHAM_STADIUM),
+        _match(index=1, days=0, hours=1, loc=STAMFORD_BRIDGE),
+        _match(index=2, days=1, loc=STAMFORD_BRIDGE),
+        _match(index=3, days=2, loc=STAMFORD_BRIDGE),
+        _match(index=4, days=2, hours=1, loc=TOTTENHAM_STADIUM),
+        _match(index=5, days=3, loc=TOTTENHAM_STADIUM),
+        _match(index=6, days=9, loc=TOTTENHAM_STADIUM),
+        _match(index=7, days=10, loc=TOTTENHAM_STADIUM),
+    ]
+    travel_graph = travel.TravelGraph(matches, max_dist=50, max_days=3)
+
+    paths = travel_graph.iter_paths(min_games=2)
+    assert next(paths) == [matches[0], matches[2], matches[3]]
+    assert sorted(
+        [next(paths)] + list(paths), key=lambda p: [m.date for m in p]
+    ) == sorted(
+        travel_graph.find_paths(min_games=2)[1:], key=lambda p: [m.date for m in p]
+    )
+    assert list(travel_graph.iter_paths(min_games=2, grouped=True)) == (
+        travel_graph.find_paths(min_games=2, grouped=True)
+    )
+
+
 def test__sparse_graph__sanity() -> None:
     matches = [
         _match(index=0, days=0, loc=EMIRATES_STADIUM),
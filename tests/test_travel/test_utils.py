@@ -1,3 +1,4 @@
+from benchmarks import bench_remove_subsequences
 from travel import utils
 
 
@@ -6,3 +7,16 @@ def test__all_equivalent_paths__sanity() -> None:
     paths = set([(1, 3, 5)])
     expected = set([(1, 3, 5), (1, 4, 5), (2, 3, 5), (2, 4, 5)])
     assert utils.all_equivalent_paths(paths, equivalence_dict) == expected
+
+
+def test__remove_subsequences__sanity() -> None:
+    paths = {(1, 2, 3), (1, 3), (2, 3), (3, 4), (1, 2, 3, 5), (4,), (6,)}
+    expected = {(1, 2, 3, 5), (3, 4), (6,)}
+    assert utils.remove_subsequences(paths) == expected
+
+
+def test__remove_subsequences__matches_quadratic_scan() -> None:
+    for seed in range(5):
+        paths = bench_remove_subsequences.random_paths(size=400, seed=seed)
+        expected = bench_remove_subsequences.remove_subsequences_quadratic(paths)
+        assert utils.remove_subsequences(paths) == expected
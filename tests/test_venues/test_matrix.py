@@ -0,0 +1,45 @@
+import numpy as np
+
+from data_classes import Location
+from venues import matrix, haversine_distance
+
+MUNICH = Location(48.2188, 11.6236)
+MADRID = Location(40.4531, -3.6883)
+LONDON = Location(51.5550403, -0.1083997)
+
+
+def test_intern__ids_and_distances() -> None:
+    distances = matrix.DistanceMatrix()
+
+    ids = distances.intern([MUNICH, MADRID, MUNICH])
+
+    assert ids.tolist() == [0, 1, 0]
+    assert distances.intern([LONDON, MADRID]).tolist() == [2, 1]
+    assert len(distances) == 3
+    assert distances.venue(2) == LONDON
+    assert distances.distances[0, 0] == 0
+    assert distances.distances[2, 0] == haversine_distance(LONDON, MUNICH)
+    assert distances.distances[0, 2] == haversine_distance(MUNICH, LONDON)
+
+
+def test_intern__persisted_and_memory_mapped(tmp_path) -> None:
+    paths = tmp_path / "distance_matrix.npy", tmp_path / "distance_venues.npy"
+    matrix.DistanceMatrix(*paths).intern([MUNICH, MADRID])
+
+    reloaded = matrix.DistanceMatrix(*paths)
+    assert isinstance(reloaded.distances, np.memmap)
+    assert reloaded.intern([MADRID]).tolist() == [1]
+
+    reloaded.intern([LONDON])
+    assert np.load(paths[0]).shape == (3, 3)
+    assert matrix.DistanceMatrix(*paths).distances[1, 2] == haversine_distance(
+        MADRID, LONDON
+    )
+
+
+def test_intern__mismatched_files_are_ignored(tmp_path) -> None:
+    paths = tmp_path / "distance_matrix.npy", tmp_path / "distance_venues.npy"
+    matrix.DistanceMatrix(*paths).intern([MUNICH, MADRID])
+    np.save(paths[1], np.array([MUNICH], dtype=float))
+
+    assert not matrix.DistanceMatrix(*paths)
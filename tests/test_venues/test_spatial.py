@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from venues import SpatialIndex, haversine_distance
+from data_classes import Location
+
+
+def _random_locations(seed: int, n: int) -> list[Location]:
+    rng = random.Random(seed)
+    return [Location(rng.uniform(-80, 80), rng.uniform(-180, 180)) for _ in range(n)]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("max_dist", [0, 50, 800, 5000])
+def test_spatial_index__finds_every_neighbour(seed, max_dist) -> None:
+    locations = _random_locations(seed, n=300)
+    index = SpatialIndex(locations, max_dist)
+
+    for i, loc in enumerate(locations):
+        expected = [
+            j
+            for j, other in enumerate(locations)
+            if haversine_distance(loc, other) <= max_dist
+        ]
+        found = index.neighbours(i)
+        assert found == sorted(found)
+        assert set(expected) <= set(found)
+
+
+def test_spatial_index__prunes_far_locations() -> None:
+    locations = _random_locations(seed=0, n=300)
+    index = SpatialIndex(locations, max_dist=50)
+
+    assert all(len(index.neighbours(i)) <= 3 for i in range(len(locations)))
+
+
+def test_spatial_index__wraps_antimeridian() -> None:
+    locations = [Location(-17.0, 179.99), Location(-17.0, -179.99), Location(0, 0)]
+    index = SpatialIndex(locations, max_dist=10)
+
+    assert index.neighbours(0) == [0, 1]
+    assert index.neighbours(1, lo=0, hi=1) == [0]
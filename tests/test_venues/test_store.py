@@ -0,0 +1,77 @@
+import json
+import multiprocessing
+
+import pytest
+
+from data_classes import Location
+from venues import store
+
+
+def _stores(tmp_path) -> list[store.VenueStore]:
+    return [
+        store.SqliteVenueStore(tmp_path / "venues.sqlite3"),
+        store.JsonVenueStore(tmp_path / "venues.json", tmp_path / "missing.json"),
+    ]
+
+
+def test_normalize_venue() -> None:
+    assert store.normalize_venue("  St. James'  Park ") == "st james park"
+    assert store.normalize_venue("Estadio Santiago Bernabéu") == (
+        "estadio santiago bernabeu"
+    )
+    assert store.normalize_venue("ＡＬＬＩＡＮＺ Arena") == "allianz arena"
+
+
+@pytest.mark.parametrize("index", [0, 1])
+def test_venue_store__roundtrip(tmp_path, index) -> None:
+    venue_store = _stores(tmp_path)[index]
+    found = store.VenueEntry(Location(1.5, 2.5))
+    missing = store.VenueEntry(None, expires_at=123.0)
+
+    assert venue_store.get("Stade") is None
+    venue_store.put_many({"Stade de l'Abbé": found, "Nowhere": missing})
+
+    assert venue_store.get("stade de l abbe") == found
+    assert venue_store.get("Nowhere") == missing
+    assert dict(venue_store.items()) == {"Stade de l'Abbé": found, "Nowhere": missing}
+
+
+def test_json_venue_store__keeps_legacy_format(tmp_path) -> None:
+    venue_store = store.JsonVenueStore(tmp_path / "venues.json", tmp_path / "m.json")
+    venue_store.put("Test Stadium", store.VenueEntry(Location(1.2345, 6.7890)))
+
+    loaded = json.loads((tmp_path / "venues.json").read_text())
+    assert loaded == {"Test Stadium": [1.2345, 6.7890]}
+
+
+def test_sqlite_venue_store__imports_legacy(tmp_path) -> None:
+    (tmp_path / "venues.json").write_text(json.dumps({"Allianz Arena": [48.2, 11.6]}))
+    (tmp_path / "missing.json").write_text(json.dumps({"Nowhere": 99.0}))
+    legacy = store.JsonVenueStore(tmp_path / "venues.json", tmp_path / "missing.json")
+
+    venue_store = store.SqliteVenueStore(tmp_path / "venues.sqlite3", legacy=legacy)
+
+    assert venue_store.get("allianz arena") == store.VenueEntry(Location(48.2, 11.6))
+    assert venue_store.get("Nowhere") == store.VenueEntry(None, 99.0)
+
+
+def _write_venues(path, worker: int) -> None:
+    venue_store = store.SqliteVenueStore(path)
+    for i in range(50):
+        venue_store.put(f"Stadium {worker}-{i}", store.VenueEntry(Location(worker, i)))
+
+
+def test_sqlite_venue_store__concurrent_processes(tmp_path) -> None:
+    path = tmp_path / "venues.sqlite3"
+    list(store.SqliteVenueStore(path).items())  # create the schema up front
+    workers = [
+        multiprocessing.Process(target=_write_venues, args=(path, worker))
+        for worker in range(4)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in workers)
+    assert len(list(store.SqliteVenueStore(path).items())) == 4 * 50
@@ -1,13 +1,23 @@
 # pylint: disable=protected-access
 
-import json
 from unittest.mock import patch, MagicMock
+
+import pytest
+
+import profiling
 from venues import venues
 
 
-def test_geocode_with_cache__in_cache(monkeypatch):
-    venues._cache.clear()
-    venues._cache["Allianz Arena"] = (48.2188, 11.6236)
+@pytest.fixture(name="store")
+def fixture_store(tmp_path, monkeypatch) -> venues.VenueStore:
+    store = venues.SqliteVenueStore(tmp_path / "venues.sqlite3")
+    monkeypatch.setattr(venues, "_store", store)
+    monkeypatch.setattr(venues, "_limiter", MagicMock())
+    return store
+
+
+def test_geocode_with_cache__in_cache(store, monkeypatch):
+    store.put("Allianz Arena", venues.VenueEntry(venues.Location(48.2188, 11.6236)))
 
     mock_api = MagicMock()
     monkeypatch.setattr(venues.open_street_map, "venue_location", mock_api)
@@ -15,29 +25,81 @@ def test_geocode_with_cache__in_cache(monkeypatch):
     coords = venues.geocode_with_cache("Allianz Arena")
 
     assert coords == venues.Location(48.2188, 11.6236)
+    mock_api.assert_not_called()
+
+
+def test_geocode_batch__profiled(store, monkeypatch):
+    store.put("Allianz Arena", venues.VenueEntry(venues.Location(48.2188, 11.6236)))
+    api = MagicMock(return_value=[])
+    monkeypatch.setattr(venues.open_street_map, "venue_location", api)
 
+    with profiling.profile() as profiler:
+        venues.geocode_batch(["Allianz Arena", "Nowhere"])
 
-def test_geocode_with_cache__not_in_cache():
-    venues._cache.clear()
+    assert profiler.counters["geocode.cache_hits"] == 1
+    assert profiler.counters["geocode.cache_misses"] == 1
+    assert profiler.counters["geocode.not_found"] == 1
+
+
+def test_geocode_with_cache__not_in_cache(store):
     fake_response = [{"lat": "40.1235", "lon": "20.6543"}]
 
-    with patch.object(venues, "save_cache", lambda: None), patch.object(
+    with patch.object(
         venues.open_street_map, "venue_location", return_value=fake_response
     ):
         coords = venues.geocode_with_cache("Some Stadium")
 
     assert coords == venues.Location(40.1235, 20.6543)
-    assert venues._cache["Some Stadium"] == (40.1235, 20.6543)
+    assert store.get("Some Stadium") == venues.VenueEntry(
+        venues.Location(40.1235, 20.6543)
+    )
+
+
+def test_geocode_with_cache__spelling_variants(store, monkeypatch):
+    store.put(
+        "Estadio Santiago Bernabéu", venues.VenueEntry(venues.Location(40.45, -3.69))
+    )
+    monkeypatch.setattr(venues.open_street_map, "venue_location", MagicMock())
+
+    coords = venues.geocode_with_cache("estadio  santiago bernabeu")
 
+    assert coords == venues.Location(40.45, -3.69)
 
-def test_save_cache_does_not_touch_file(tmp_path, monkeypatch):
-    monkeypatch.setattr(venues, "CACHE_FILE", tmp_path / "venues.json")
-    venues._cache.clear()
-    venues._cache["Test Stadium"] = (1.2345, 6.7890)
 
-    venues.save_cache()
-    loaded = json.loads((tmp_path / "venues.json").read_text())
-    assert loaded["Test Stadium"] == [1.2345, 6.7890]
+def test_geocode_batch__dedupes_and_flushes_once(store, monkeypatch):
+    store.put("Known", venues.VenueEntry(venues.Location(1.0, 2.0)))
+    put_many = MagicMock(wraps=store.put_many)
+    monkeypatch.setattr(store, "put_many", put_many)
+    api = MagicMock(side_effect=[[{"lat": "3", "lon": "4"}], []])
+    monkeypatch.setattr(venues.open_street_map, "venue_location", api)
+
+    locations = venues.geocode_batch(["Known", "New", "Nowhere", "New", "Known", "NEW"])
+
+    assert locations == {
+        "Known": venues.Location(1.0, 2.0),
+        "New": venues.Location(3.0, 4.0),
+        "Nowhere": None,
+        "NEW": venues.Location(3.0, 4.0),
+    }
+    assert [c.args for c in api.call_args_list] == [("New",), ("Nowhere",)]
+    put_many.assert_called_once()
+    assert store.get("Nowhere").location is None
+
+
+@pytest.mark.usefixtures("store")
+def test_geocode_with_cache__negative_cache_expires(monkeypatch):
+    api = MagicMock(return_value=[])
+    monkeypatch.setattr(venues.open_street_map, "venue_location", api)
+    now = 1000.0
+    monkeypatch.setattr(venues.time, "time", lambda: now)
+
+    assert venues.geocode_with_cache("Nowhere") is None
+    assert venues.geocode_with_cache("Nowhere") is None
+    assert api.call_count == 1
+
+    now += venues.MISSING_TTL_SECONDS + 1
+    assert venues.geocode_with_cache("Nowhere") is None
+    assert api.call_count == 2
 
 
 def test_haversine_distance__sanity() -> None:
@@ -45,3 +107,17 @@ def test_haversine_distance__sanity() -> None:
     signal_iduna = venues.Location(51.4925, 7.4517)
     distance_km = venues.haversine_distance(allianz, signal_iduna)
     assert round(distance_km, 3) == 470.965
+
+
+def test_haversine_distances__matches_scalar() -> None:
+    allianz = venues.Location(48.2188, 11.6236)
+    signal_iduna = venues.Location(51.4925, 7.4517)
+    distances = venues.haversine_distances(
+        venues.np.radians([allianz.latitude]),
+        venues.np.radians([allianz.longitude]),
+        venues.np.radians([[allianz.latitude], [signal_iduna.latitude]]),
+        venues.np.radians([[allianz.longitude], [signal_iduna.longitude]]),
+    )
+    assert distances.shape == (2, 1)
+    assert distances[0, 0] == 0
+    assert round(float(distances[1, 0]), 3) == 470.965
@@ -0,0 +1,208 @@
+from bisect import bisect_left, bisect_right
+from enum import StrEnum
+from typing import Callable, Iterable, Iterator, NamedTuple, TypeAlias
+
+import numpy as np
+
+from data_classes import Location, Match, MatchGraph, MatchTable, NodeAdjacency
+from venues import (
+    SpatialIndex,
+    get_distance_matrix,
+    haversine_distance,
+    haversine_distances,
+)
+from .csr import CsrGraph
+
+# Distances this close to `max_dist` are re-checked with the scalar haversine,
+# so that ulp differences between numpy and libm never flip an edge.
+EXACT_TOLERANCE_KM = 1e-6
+
+# (source, target, days) with source before target; every edge function yields
+# them sorted, which is the insertion order the equivalence keys rely on.
+Edge: TypeAlias = tuple[int, int, int]
+EdgeFunction: TypeAlias = Callable[[MatchTable, float, int], Iterator[Edge]]
+Matches: TypeAlias = list[Match] | MatchTable
+
+
+class GraphBuilder(StrEnum):
+    PYTHON = "python"
+    NUMPY = "numpy"
+    GRID = "grid"
+    MATRIX = "matrix"
+
+
+class GraphBackend(StrEnum):
+    DICT = "dict"  # list of NodeAdjacency dicts
+    CSR = "csr"  # compressed sparse rows, see travel/csr.py
+
+
+def empty_graph(n: int) -> MatchGraph:
+    return [NodeAdjacency({}, {}) for _ in range(n)]
+
+
+def graph_from_edges(n: int, edges: Iterable[Edge]) -> MatchGraph:
+    graph = empty_graph(n)
+    for i, j, days in edges:
+        graph[i].outgoing[j] = days
+        graph[j].incoming[i] = days
+    return graph
+
+
+def build_graph_python(matches: Matches, max_dist: float, max_days: int) -> MatchGraph:
+    table = MatchTable.of(matches)
+    return graph_from_edges(len(table), python_edges(table, max_dist, max_days))
+
+
+def python_edges(table: MatchTable, max_dist: float, max_days: int) -> Iterator[Edge]:
+    days = table.days.tolist()
+    locations = table.locations()
+    n = len(table)
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            gap = days[j] - days[i]
+
+            if gap >= max_days:
+                break
+            if gap == 0:
+                continue
+            # TODO: memoization
+            if haversine_distance(locations[i], locations[j]) > max_dist:
+                continue
+
+            yield i, j, gap
+
+
+def build_graph_numpy(matches: Matches, max_dist: float, max_days: int) -> MatchGraph:
+    table = MatchTable.of(matches)
+    return graph_from_edges(len(table), numpy_edges(table, max_dist, max_days))
+
+
+def numpy_edges(table: MatchTable, max_dist: float, max_days: int) -> Iterator[Edge]:
+    """
+    Same edges as `python_edges`, found one day bucket at a time: all the
+    matches of a day share the same `max_days` window, found by binary search
+    on the sorted day ordinals, and their distances are computed as one block.
+    """
+    if not table:
+        return
+
+    days = table.days.astype(np.int64)
+    coords = _Radians(np.radians(table.latitude), np.radians(table.longitude))
+    locations = table.locations()
+    for start, end, window_end in _day_windows(days, max_days):
+        cols = slice(end, window_end)
+        within = _within_distance(locations, coords, max_dist, slice(start, end), cols)
+        gaps = (days[cols] - days[start]).tolist()
+        for i, row in zip(range(start, end), within):
+            for col in np.flatnonzero(row).tolist():
+                yield i, end + col, gaps[col]
+
+
+def _day_windows(days: np.ndarray, max_days: int) -> Iterator[tuple[int, int, int]]:
+    """
+    Yield `(start, end, window_end)` for every day bucket `days[start:end]` whose
+    `max_days` window `days[end:window_end]` is not empty.
+    """
+    bucket_days, bucket_starts = np.unique(days, return_index=True)
+    bucket_ends = np.append(bucket_starts[1:], len(days))
+    window_ends = np.searchsorted(days, bucket_days + max_days, side="left")
+    for start, end, window_end in zip(
+        bucket_starts.tolist(), bucket_ends.tolist(), window_ends.tolist()
+    ):
+        if window_end > end:
+            yield start, end, window_end
+
+
+def build_graph_grid(matches: Matches, max_dist: float, max_days: int) -> MatchGraph:
+    table = MatchTable.of(matches)
+    return graph_from_edges(len(table), grid_edges(table, max_dist, max_days))
+
+
+def grid_edges(table: MatchTable, max_dist: float, max_days: int) -> Iterator[Edge]:
+    """
+    Same edges as `python_edges`, but exact distances are only computed for
+    the candidates a `SpatialIndex` finds in neighbouring cells, so the work
+    follows the number of real edges instead of the window size squared.
+    """
+    days = table.days.tolist()
+    locations = table.locations()
+    index = SpatialIndex(locations, max_dist)
+
+    for i, day in enumerate(days):
+        lo = bisect_right(days, day, i)
+        hi = bisect_left(days, day + max_days, lo)
+        if lo >= hi:
+            continue
+        for j in index.neighbours(i, lo, hi):
+            if haversine_distance(locations[i], locations[j]) > max_dist:
+                continue
+            yield i, j, days[j] - day
+
+
+def matrix_edges(table: MatchTable, max_dist: float, max_days: int) -> Iterator[Edge]:
+    """
+    Same edges as `python_edges`, with distances looked up in the shared venue
+    `DistanceMatrix` instead of computed: a season has a few hundred venues
+    but every pair of them recurs across many match pairs.
+    """
+    if not table:
+        return
+    distances = get_distance_matrix()
+    venue_ids = distances.intern(table.venues)[table.venue_ids]
+    days = table.days.astype(np.int64)
+    for start, end, window_end in _day_windows(days, max_days):
+        cols = venue_ids[end:window_end]
+        gaps = (days[end:window_end] - days[start]).tolist()
+        for i in range(start, end):
+            within = distances.distances[venue_ids[i], cols] <= max_dist
+            for col in np.flatnonzero(within).tolist():
+                yield i, end + col, gaps[col]
+
+
+class _Radians(NamedTuple):
+    lat: np.ndarray
+    lon: np.ndarray
+
+
+def _within_distance(
+    locations: list[Location],
+    coords: _Radians,
+    max_dist: float,
+    rows: slice,
+    cols: slice,
+) -> np.ndarray:
+    dist = haversine_distances(
+        coords.lat[rows, None],
+        coords.lon[rows, None],
+        coords.lat[None, cols],
+        coords.lon[None, cols],
+    )
+    within = dist <= max_dist
+    borderline = np.abs(dist - max_dist) <= EXACT_TOLERANCE_KM
+    for row, col in zip(*np.nonzero(borderline)):
+        i, j = rows.start + int(row), cols.start + int(col)
+        within[row, col] = haversine_distance(locations[i], locations[j]) <= max_dist
+    return within
+
+
+EDGE_FUNCTIONS: dict[GraphBuilder, EdgeFunction] = {
+    GraphBuilder.PYTHON: python_edges,
+    GraphBuilder.NUMPY: numpy_edges,
+    GraphBuilder.GRID: grid_edges,
+    GraphBuilder.MATRIX: matrix_edges,
+}
+
+
+def build_graph(
+    matches: Matches,
+    max_dist: float,
+    max_days: int,
+    builder: GraphBuilder = GraphBuilder.GRID,
+    backend: GraphBackend = GraphBackend.DICT,
+) -> MatchGraph | CsrGraph:
+    table = MatchTable.of(matches)
+    edges = EDGE_FUNCTIONS[GraphBuilder(builder)](table, max_dist, max_days)
+    if GraphBackend(backend) is GraphBackend.CSR:
+        return CsrGraph.from_edges(len(table), edges)
+    return graph_from_edges(len(table), edges)
@@ -0,0 +1,129 @@
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from data_classes import MatchGraph, NodeAdjacency, WeightedAdjacencyDict
+
+NODE_DTYPE = np.int32
+DAYS_DTYPE = np.int16
+OFFSET_DTYPE = np.int64
+
+AdjacencyItems = tuple[tuple[int, int], ...]
+
+
+class CsrAdjacency(NamedTuple):
+    """
+    One direction of a CSR graph: the neighbours of node `i` and the days to
+    them are `nodes[offsets[i]:offsets[i + 1]]` and `days[...]`, sorted.
+    """
+
+    offsets: np.ndarray
+    nodes: np.ndarray
+    days: np.ndarray
+
+    def items(self, i: int) -> AdjacencyItems:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return tuple(zip(self.nodes[start:end].tolist(), self.days[start:end].tolist()))
+
+    def as_dict(self, i: int) -> WeightedAdjacencyDict:
+        return dict(self.items(i))
+
+    def sources(self) -> np.ndarray:
+        """
+        Node each entry of `nodes` belongs to.
+        """
+        return self.rows(0, len(self.offsets) - 1)[0]
+
+    def rows(self, lo: int, hi: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The entries of nodes `lo` to `hi` (excluded), as the node each belongs
+        to, the neighbour and the days.
+        """
+        offsets = self.offsets[lo : hi + 1]
+        start, end = offsets[0], offsets[-1]
+        sources = np.repeat(np.arange(lo, hi, dtype=NODE_DTYPE), np.diff(offsets))
+        return sources, self.nodes[start:end], self.days[start:end]
+
+
+class CsrGraph:
+    """
+    Compressed sparse row form of a `MatchGraph`: flat arrays of outgoing and
+    incoming edges, a few bytes per edge instead of two dict entries. Indexing
+    still gives a `NodeAdjacency` of dicts, built on demand, so code written
+    for the dict form can read it.
+    """
+
+    def __init__(self, outgoing: CsrAdjacency, incoming: CsrAdjacency):
+        self.outgoing = outgoing
+        self.incoming = incoming
+
+    @classmethod
+    def from_edges(cls, n: int, edges: Iterable[tuple[int, int, int]]) -> "CsrGraph":
+        """
+        Build from `(source, target, days)` edges sorted by source, then target.
+        """
+        flat = np.fromiter(
+            (value for edge in edges for value in edge), dtype=np.int64
+        ).reshape(-1, 3)
+        sources, targets, days = flat.T
+        outgoing = _adjacency(n, sources, targets, days)
+        # a stable sort keeps the sources of each target in ascending order
+        by_target = np.argsort(targets, kind="stable")
+        incoming = _adjacency(
+            n, targets[by_target], sources[by_target], days[by_target]
+        )
+        return cls(outgoing, incoming)
+
+    @classmethod
+    def from_match_graph(cls, graph: MatchGraph) -> "CsrGraph":
+        edges = (
+            (i, j, days)
+            for i, node in enumerate(graph)
+            for j, days in sorted(node.outgoing.items())
+        )
+        return cls.from_edges(len(graph), edges)
+
+    def to_match_graph(self) -> MatchGraph:
+        return [self[i] for i in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.outgoing.offsets) - 1
+
+    def __getitem__(self, i: int) -> NodeAdjacency:
+        return NodeAdjacency(self.incoming.as_dict(i), self.outgoing.as_dict(i))
+
+    def num_edges(self) -> int:
+        return len(self.outgoing.nodes)
+
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (*self.outgoing, *self.incoming))
+
+    def subgraph(self, nodes: Iterable[int]) -> dict[int, WeightedAdjacencyDict]:
+        """
+        Outgoing edges between `nodes`, as the dict of dicts the search takes.
+        Only the edge rows of the sources from the least to the greatest of
+        `nodes` are read, so a window of the timeline costs its own edges.
+        """
+        nodes = list(nodes)
+        subgraph: dict[int, WeightedAdjacencyDict] = {node: {} for node in nodes}
+        if not nodes:
+            return subgraph
+        lo, hi = min(nodes), max(nodes) + 1
+        keep = np.zeros(hi - lo + 1, dtype=bool)  # the last slot: outside
+        keep[np.array(nodes) - lo] = True
+        sources, targets, days = self.outgoing.rows(lo, hi)
+        inside = np.where((targets >= lo) & (targets < hi), targets - lo, hi - lo)
+        mask = keep[sources - lo] & keep[inside]
+        for i, j, d in zip(
+            sources[mask].tolist(), targets[mask].tolist(), days[mask].tolist()
+        ):
+            subgraph[i][j] = d
+        return subgraph
+
+
+def _adjacency(
+    n: int, sources: np.ndarray, targets: np.ndarray, days: np.ndarray
+) -> CsrAdjacency:
+    offsets = np.zeros(n + 1, dtype=OFFSET_DTYPE)
+    np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+    return CsrAdjacency(offsets, targets.astype(NODE_DTYPE), days.astype(DAYS_DTYPE))
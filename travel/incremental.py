@@ -0,0 +1,127 @@
+from bisect import bisect_left, bisect_right, insort
+from heapq import merge
+
+from data_classes import Match, MatchGraph, NodeAdjacency, WeightedAdjacencyDict
+from .utils import dist_between
+
+# Old node ids mapped to their new id, or None for removed nodes
+Relabel = list[int | None]
+DayInterval = tuple[int, int]
+
+
+def day_ordinal(match: Match) -> int:
+    return match.date.date().toordinal()
+
+
+def locate(matches: list[Match], days: list[int], match: Match, taken: set[int]) -> int:
+    """
+    Node id of `match` in the date-sorted `matches`, other than the `taken` ones.
+    """
+    day = day_ordinal(match)
+    for i in range(bisect_left(days, day), bisect_right(days, day)):
+        if matches[i] == match and i not in taken:
+            return i
+    raise ValueError(f"{match!r} on {match.date} is not in the graph")
+
+
+def merge_matches(
+    matches: list[Match], removed: set[int], added: list[Match]
+) -> tuple[list[Match], Relabel, list[int]]:
+    """
+    New date-sorted match list without the `removed` ids and with `added`
+    inserted after existing matches of the same date, the old-to-new id map,
+    and the new ids of the added matches.
+    """
+    kept = ((m, i) for i, m in enumerate(matches) if i not in removed)
+    new = ((m, None) for m in sorted(added, key=lambda m: m.date))
+    new_matches: list[Match] = []
+    relabel: Relabel = [None] * len(matches)
+    added_ids = []
+    for new_id, (m, old_id) in enumerate(merge(kept, new, key=lambda e: e[0].date)):
+        new_matches.append(m)
+        if old_id is None:
+            added_ids.append(new_id)
+        else:
+            relabel[old_id] = new_id
+    return new_matches, relabel, added_ids
+
+
+def relabel_graph(graph: MatchGraph, relabel: Relabel, size: int) -> MatchGraph:
+    """
+    Copy of `graph` on the new ids. Relabelling keeps the order of the ids, so
+    adjacency dicts stay sorted.
+    """
+    new_graph: MatchGraph = [NodeAdjacency({}, {}) for _ in range(size)]
+    for old_id, new_id in enumerate(relabel):
+        if new_id is not None:
+            node = graph[old_id]
+            new_graph[new_id] = NodeAdjacency(
+                _relabel(node.incoming, relabel), _relabel(node.outgoing, relabel)
+            )
+    return new_graph
+
+
+def _relabel(
+    adjacency: WeightedAdjacencyDict, relabel: Relabel
+) -> WeightedAdjacencyDict:
+    return {relabel[j]: days for j, days in adjacency.items() if relabel[j] is not None}
+
+
+def connect(  # pylint: disable=too-many-arguments
+    graph: MatchGraph,
+    matches: list[Match],
+    days: list[int],
+    i: int,
+    *,
+    max_dist: float,
+    max_days: int,
+) -> set[int]:
+    """
+    Add the edges of node `i` with the matches inside its `max_days` window on
+    either side, keeping the touched adjacency dicts sorted as the builders
+    produce them. Returns the new neighbours.
+    """
+    day = days[i]
+    before = range(bisect_right(days, day - max_days), bisect_left(days, day))
+    after = range(bisect_right(days, day), bisect_left(days, day + max_days))
+    neighbours = set()
+    for j in (*before, *after):
+        if dist_between(matches[i], matches[j]) > max_dist:
+            continue
+        src, dst = (j, i) if j < i else (i, j)
+        _insert(graph[src].outgoing, dst, days[dst] - days[src])
+        _insert(graph[dst].incoming, src, days[dst] - days[src])
+        neighbours.add(j)
+    return neighbours
+
+
+def _insert(adjacency: WeightedAdjacencyDict, node: int, days: int) -> None:
+    if node in adjacency:
+        return
+    if not adjacency or node > next(reversed(adjacency)):
+        adjacency[node] = days
+        return
+    keys = list(adjacency)
+    insort(keys, node)
+    adjacency[node] = days
+    items = {k: adjacency[k] for k in keys}
+    adjacency.clear()
+    adjacency.update(items)
+
+
+def day_intervals(changed_days: set[int], reach: int) -> list[DayInterval]:
+    """
+    Disjoint intervals covering every day within `reach` of a changed day.
+    """
+    intervals: list[DayInterval] = []
+    for day in sorted(changed_days):
+        lo, hi = day - reach, day + reach
+        if intervals and lo <= intervals[-1][1] + 1:
+            intervals[-1] = (intervals[-1][0], hi)
+        else:
+            intervals.append((lo, hi))
+    return intervals
+
+
+def in_intervals(day: int, intervals: list[DayInterval]) -> bool:
+    return any(lo <= day <= hi for lo, hi in intervals)
@@ -1,37 +1,114 @@
+from typing import Any, Iterable, Iterator, TypeAlias
 from datetime import datetime, timezone
+from concurrent.futures import Future, ThreadPoolExecutor
 
+import numpy as np
+
+import profiling
 from connectors import football_data
-from data_classes import Match
-from venues import geocode_with_cache
+from data_classes import Location, Match, MatchTable
+from venues import geocode_batch, get_distance_matrix
 
 TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# (home team, away team, utcDate, location)
+FixtureRow: TypeAlias = tuple[str, str, str, Location]
+
 
+def get_all_matches(start_date: datetime, end_date: datetime) -> MatchTable:
+    # A single geocoding worker: Nominatim allows no parallel requests, but
+    # the home grounds of a league can be geocoded while fixtures download.
+    with profiling.stage("matches.fetch"), ThreadPoolExecutor(
+        max_workers=1
+    ) as geocoder:
+        prefetched: list[Future] = []
+        leagues = football_data.get_leagues_data(
+            list(football_data.LeagueId),
+            start_date,
+            end_date,
+            on_teams=lambda teams: prefetched.append(
+                geocoder.submit(geocode_batch, home_grounds(teams).values())
+            ),
+        )
+        for future in prefetched:
+            future.result()
 
-def get_all_matches(start_date: datetime, end_date: datetime) -> None:
-    matches = []
-    for league_id in football_data.LeagueId:
-        matches.extend(get_league_matches(league_id, start_date, end_date))
+    with profiling.stage("matches.geocode"):
+        locations = geocode_batch(
+            venue
+            for league in leagues.values()
+            for venue in fixture_venues(league)
+            if venue
+        )
+    matches = match_table(
+        row for league in leagues.values() for row in fixture_rows(league, locations)
+    )
+    # Intern the venues now, so new ones get their distances computed once
+    with profiling.stage("matches.intern_venues"):
+        get_distance_matrix().intern(matches.venues)
+    profiling.gauge("matches.total", len(matches))
     return matches
 
 
+def match_table(rows: Iterable[FixtureRow]) -> MatchTable:
+    """
+    Table of `fixture_rows`, with the UTC kickoffs parsed as one array.
+    """
+    rows = list(rows)
+    kickoff = np.array([row[2].rstrip("Z") for row in rows], dtype="datetime64[us]")
+    return MatchTable.from_columns(
+        (row[0] for row in rows),
+        (row[1] for row in rows),
+        kickoff.astype(np.int64),
+        np.zeros(len(rows), dtype=np.int32),
+        (row[3] for row in rows),
+    )
+
+
 def get_league_matches(
     league_id: football_data.LeagueId, start_date: datetime, end_date: datetime
-) -> None:
+) -> list[Match]:
     params = football_data.FixturesParams(league_id, start_date, end_date)
     fixtures = football_data.get_upcoming_fixtures(params)
-    data = football_data.get_competition_teams(league_id)
-    home_grounds = {
-        team["name"]: team["venue"] for team in data["teams"] if team["venue"]
-    }
+    teams = football_data.get_competition_teams(league_id)
+    return parse_league_matches(football_data.LeagueData(fixtures, teams))
+
+
+def parse_league_matches(
+    league: football_data.LeagueData,
+    locations: dict[str, Location | None] | None = None,
+) -> list[Match]:
+    venues = fixture_venues(league)
+    if locations is None:
+        locations = geocode_batch(venue for venue in venues if venue)
 
     return [
-        Match(
-            f["homeTeam"]["name"],
-            f["awayTeam"]["name"],
-            datetime.strptime(f["utcDate"], TIME_FORMAT).replace(tzinfo=timezone.utc),
-            location,
-        )
-        for f in fixtures["matches"]
-        if (venue := f.get("venue", home_grounds.get(f["homeTeam"]["name"])))
-        and (location := geocode_with_cache(venue))
+        Match(home, away, utc_datetime(kickoff), location)
+        for home, away, kickoff, location in fixture_rows(league, locations)
+    ]
+
+
+def fixture_rows(
+    league: football_data.LeagueData, locations: dict[str, Location | None]
+) -> Iterator[FixtureRow]:
+    """
+    Rows of the fixtures whose venue was geocoded.
+    """
+    for f, venue in zip(league.fixtures["matches"], fixture_venues(league)):
+        if venue and (location := locations.get(venue)):
+            yield f["homeTeam"]["name"], f["awayTeam"]["name"], f["utcDate"], location
+
+
+def utc_datetime(kickoff: str) -> datetime:
+    return datetime.strptime(kickoff, TIME_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def home_grounds(teams: dict[str, Any]) -> dict[str, str]:
+    return {team["name"]: team["venue"] for team in teams["teams"] if team["venue"]}
+
+
+def fixture_venues(league: football_data.LeagueData) -> list[str | None]:
+    grounds = home_grounds(league.teams)
+    return [
+        f.get("venue", grounds.get(f["homeTeam"]["name"]))
+        for f in league.fixtures["matches"]
     ]
@@ -0,0 +1,79 @@
+import json
+from enum import StrEnum
+from datetime import datetime
+from typing import Any, Iterable, TextIO
+
+from data_classes import GroupedPath, Location, Match
+
+PathOption = list[Match] | GroupedPath
+
+
+class OutputFormat(StrEnum):
+    TEXT = "text"
+    JSONL = "jsonl"
+
+
+def format_option(option_idx: int, schedule: PathOption) -> list[str]:
+    if isinstance(schedule, GroupedPath):
+        return _format_grouped_option(option_idx, schedule)
+    lines = [f"Option {option_idx}:"]
+    for gd in schedule:
+        # matches_str = " | ".join(map(str, gd.matches))
+        lines.append(f"  {gd.date.strftime('%Y-%m-%d')}: [{gd}]")
+    return lines
+
+
+def _format_grouped_option(option_idx: int, schedule: GroupedPath) -> list[str]:
+    combinations = schedule.num_paths()
+    suffix = f" ({combinations} combinations)" if combinations > 1 else ""
+    lines = [f"Option {option_idx}{suffix}:"]
+    for group in schedule.groups:
+        matches_str = " | ".join(map(str, group))
+        lines.append(f"  {group[0].date.strftime('%Y-%m-%d')}: [{matches_str}]")
+    return lines
+
+
+def match_to_dict(match: Match) -> dict[str, Any]:
+    return {
+        "home_team": match.home_team,
+        "away_team": match.away_team,
+        "date": match.date.isoformat(),
+        "latitude": match.location.latitude,
+        "longitude": match.location.longitude,
+    }
+
+
+def match_from_dict(data: dict[str, Any]) -> Match:
+    return Match(
+        data["home_team"],
+        data["away_team"],
+        datetime.fromisoformat(data["date"]),
+        Location(data["latitude"], data["longitude"]),
+    )
+
+
+def option_to_dict(option_idx: int, schedule: PathOption) -> dict[str, Any]:
+    if isinstance(schedule, GroupedPath):
+        return {
+            "option": option_idx,
+            "combinations": schedule.num_paths(),
+            "groups": [[match_to_dict(m) for m in group] for group in schedule.groups],
+        }
+    return {"option": option_idx, "matches": [match_to_dict(m) for m in schedule]}
+
+
+def write_paths(
+    paths: Iterable[PathOption], output_format: OutputFormat, stream: TextIO
+) -> int:
+    """
+    Write options one by one as they come, flushing after each, so consumers see
+    the first result before the search is over. Returns the number written.
+    """
+    written = 0
+    for written, schedule in enumerate(paths, start=1):
+        if OutputFormat(output_format) is OutputFormat.JSONL:
+            stream.write(json.dumps(option_to_dict(written, schedule)) + "\n")
+        else:
+            stream.write("\n".join(format_option(written, schedule)) + "\n")
+        stream.flush()
+    return written
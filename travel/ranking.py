@@ -0,0 +1,133 @@
+import time
+from bisect import insort
+from enum import StrEnum
+from typing import Callable, NamedTuple
+
+from data_classes import Candidate, EquivalenceDict, Match
+from .search import WindowIndex
+
+# Travel in km between two matches, by index
+Distance = Callable[[int, int], float]
+# Lower is better: (-games, km) or (km, -games)
+ScoreKey = tuple[float, float]
+# Travel bounds add the legs up in another order than the final total; this
+# keeps rounding from pruning a path that ties with the worst kept one
+SLACK_KM = 1e-6
+
+
+class PathScore(StrEnum):
+    GAMES = "games"  # most games, then least total travel
+    TRAVEL = "travel"  # least total travel, then most games
+
+
+class TopPaths(NamedTuple):
+    paths: list[list[Match]]
+    complete: bool  # False when the deadline passed before the ranking was proven
+
+
+def score_key(score: PathScore, games: int, km: float) -> ScoreKey:
+    if PathScore(score) is PathScore.GAMES:
+        return -games, km
+    return km, -games
+
+
+class _Ranking:
+    """
+    The `k` best paths seen so far, best first; ties go to the earlier path,
+    as in `find_paths`.
+    """
+
+    def __init__(self, k: int, score: PathScore, stop_at: float | None):
+        self.k = k
+        self.score = score
+        self.stop_at = stop_at
+        self.timed_out = False
+        self.best: list[tuple[ScoreKey, Candidate]] = []
+
+    def expired(self) -> bool:
+        if self.stop_at is not None and time.monotonic() >= self.stop_at:
+            self.timed_out = True
+        return self.timed_out
+
+    def beaten(self, games: int, km: float) -> bool:
+        """
+        Whether a path scoring at best `(games, km)` cannot make the top `k`.
+        """
+        return len(self.best) >= self.k and (
+            score_key(self.score, games, km) > self.best[-1][0]
+        )
+
+    def offer(self, games: int, km: float, path: Candidate) -> None:
+        insort(self.best, (score_key(self.score, games, km), path))
+        del self.best[self.k :]
+
+
+def top_paths(  # pylint: disable=too-many-arguments
+    index: WindowIndex,
+    equiv_dict: EquivalenceDict,
+    distance: Distance,
+    k: int,
+    min_games: int,
+    *,
+    score: PathScore = PathScore.GAMES,
+    stop_at: float | None = None,
+) -> tuple[list[Candidate], bool]:
+    """
+    The `k` best maximal paths, expanded over `equiv_dict`, by branch and
+    bound: start nodes are tried by decreasing reach, a start is skipped once
+    its reach cannot beat the `k`-th best path, and the expansions of a
+    representative path are pruned on their least possible travel. Stops at
+    `stop_at` (a `time.monotonic()` value) with the best found so far; the
+    flag tells whether the ranking was proven.
+    """
+    if k <= 0:
+        return [], True
+    ranking = _Ranking(k, score, stop_at)
+    starts = sorted(range(len(index.nodes)), key=index.reach, reverse=True)
+    for start in starts:
+        if ranking.beaten(index.reach(start), 0.0):
+            continue
+        for path in index.paths_from(start, min_games):
+            if ranking.expired():
+                break
+            _rank_expansions(ranking, [equiv_dict[node] for node in path], distance)
+        if ranking.timed_out:
+            break
+    return [path for _, path in ranking.best], not ranking.timed_out
+
+
+def _rank_expansions(
+    ranking: _Ranking, stops: list[list[int]], distance: Distance
+) -> None:
+    """
+    Offer the paths picking one match per stop, skipping those whose travel
+    cannot beat the ranking. `to_end[j][m]` is the least travel from match `m`
+    of stop `j` to the last stop.
+    """
+    games = len(stops)
+    to_end = [dict.fromkeys(stops[-1], 0.0)]
+    for stop, following in zip(reversed(stops[:-1]), reversed(stops[1:])):
+        after = to_end[-1]
+        to_end.append(
+            {m: min(distance(m, n) + after[n] for n in following) for m in stop}
+        )
+    to_end.reverse()
+    if ranking.beaten(games, min(to_end[0].values()) - SLACK_KM):
+        return
+    chosen: list[int] = []
+
+    def visit(j: int, km: float) -> None:
+        if j == games:
+            ranking.offer(games, km, tuple(chosen))
+            return
+        for m in stops[j]:
+            leg = distance(chosen[-1], m) if chosen else 0.0
+            if ranking.beaten(games, km + leg + to_end[j][m] - SLACK_KM):
+                continue
+            if ranking.expired():
+                return
+            chosen.append(m)
+            visit(j + 1, km + leg)
+            chosen.pop()
+
+    visit(0, 0.0)
@@ -0,0 +1,396 @@
+from bisect import bisect_left, bisect_right
+from collections import deque
+from enum import StrEnum
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, Iterator, Mapping, NamedTuple
+
+import profiling
+from data_classes import Candidate, WeightedAdjacencyDict
+from .utils import remove_subsequences
+
+SparseGraph = dict[int, WeightedAdjacencyDict]
+# Tasks handed to each worker process; more tasks than workers balance the load
+TASKS_PER_WORKER = 4
+
+
+class SearchEngine(StrEnum):
+    DFS = "dfs"  # recursive window DFS followed by remove_subsequences
+    DAG = "dag"  # iterative enumeration of maximal windows over the time order
+    CHUNKED = "chunked"  # DAG over overlapping windows of the timeline, in turn
+
+
+class WindowIndex:  # pylint: disable=too-many-instance-attributes
+    """
+    Per-node tables over a sparse graph whose nodes, sorted, are in time order.
+
+    A path is feasible when its first and last match are at most `max_span`
+    days apart, and maximal when no feasible path contains it as a
+    subsequence. That happens exactly when it cannot be extended at either
+    end within the span, and none of its edges `u -> v` has a detour
+    `u -> w -> ... -> v` (a *shortcut* edge). Detours are found with
+    per-node descendant bitsets, computed in one reverse pass.
+    """
+
+    def __init__(
+        self, sparse_graph: SparseGraph, days: Mapping[int, int], max_span: int
+    ):
+        self.nodes = sorted(sparse_graph)
+        self.position = {node: pos for pos, node in enumerate(self.nodes)}
+        self.days = [days[node] for node in self.nodes]
+        self.max_span = max_span
+        self.successors = [
+            sorted(self.position[v] for v in sparse_graph[node]) for node in self.nodes
+        ]
+        self.latest_predecessor: list[int | None] = [None] * len(self.nodes)
+        for pos, successors in enumerate(self.successors):
+            for succ in successors:
+                self.latest_predecessor[succ] = self.days[pos]
+        # bit k of descendants[u]: node u + k is reachable from u within the span
+        # bit k of detours[u]: node u + k is reachable from u by 2 or more edges
+        self.descendants, self.detours = self._reachability()
+
+    def _reachability(self) -> tuple[list[int], list[int]]:
+        n = len(self.nodes)
+        descendants = [0] * n
+        detours = [0] * n
+        for u in reversed(range(n)):
+            window = bisect_right(self.days, self.days[u] + self.max_span) - u
+            # empty when max_days leaves no span
+            mask = (1 << max(window, 0)) - 1
+            reach = via = 0
+            for w in self.successors[u]:
+                offset = w - u
+                reach |= (1 | descendants[w]) << offset
+                via |= descendants[w] << offset
+            descendants[u] = reach & mask
+            detours[u] = via & mask
+        return descendants, detours
+
+    def is_shortcut(self, u: int, v: int) -> bool:
+        return bool(self.detours[u] >> (v - u) & 1)
+
+    def can_prepend(self, start: int, end: int) -> bool:
+        latest = self.latest_predecessor[start]
+        return latest is not None and self.days[end] - latest <= self.max_span
+
+    def can_append(self, start: int, end: int) -> bool:
+        successors = self.successors[end]
+        return bool(successors) and (
+            self.days[successors[0]] - self.days[start] <= self.max_span
+        )
+
+    def reach(self, start: int) -> int:
+        """
+        Upper bound on the nodes of a path starting at position `start`.
+        """
+        return self.descendants[start].bit_count() + 1
+
+    def maximal_paths(self, min_games: int) -> Iterator[Candidate]:
+        """
+        Yield every maximal path with at least `min_games` nodes, as node ids,
+        ordered by start. Paths are grown on one shared stack, so memory stays
+        proportional to the longest path rather than to the number of paths.
+        """
+        for start in range(len(self.nodes)):
+            yield from self.paths_from(start, min_games)
+
+    def paths_from(self, start: int, min_games: int) -> Iterator[Candidate]:
+        """
+        The maximal paths of `maximal_paths` starting at position `start`.
+        """
+        if self.reach(start) < min_games:
+            return
+        last_day = self.days[start] + self.max_span
+        path = [start]
+        stack = [iter(self.successors[start])]
+        while stack:
+            end = path[-1]
+            step = next(stack[-1], None)
+            if step is None:
+                if (
+                    len(path) >= min_games
+                    and not self.can_append(start, end)
+                    and not self.can_prepend(start, end)
+                ):
+                    yield tuple(self.nodes[pos] for pos in path)
+                stack.pop()
+                path.pop()
+            elif self.days[step] <= last_day and not self.is_shortcut(end, step):
+                path.append(step)
+                stack.append(iter(self.successors[step]))
+
+
+class SearchProblem(NamedTuple):
+    """
+    Everything a search needs, as plain ints so it pickles cheaply: the
+    sparse graph over representative nodes, each node's day ordinal, and the
+    largest allowed span in days.
+    """
+
+    sparse_graph: SparseGraph
+    days: dict[int, int]
+    max_span: int
+
+
+class Chunk(NamedTuple):
+    """
+    The paths starting between `first_day` and `last_day`, to be found in a
+    problem holding every node within the span of those days.
+    """
+
+    problem: SearchProblem
+    first_day: int
+    last_day: int
+
+
+def maximal_paths(
+    problem: SearchProblem, min_games: int, engine: SearchEngine, workers: int = 1
+) -> set[Candidate]:
+    """
+    Maximal paths of at least `min_games` nodes. With several `workers`, the
+    weakly connected components, or the chunks of the chunked engine, are
+    solved in a pool of processes.
+    """
+    if SearchEngine(engine) is SearchEngine.CHUNKED:
+        chunks = split_days(
+            problem, day_chunks(problem.days.values(), problem.max_span)
+        )
+        return set().union(*chunked_paths(chunks, min_games, workers))
+    if workers > 1:
+        return _parallel_maximal_paths(problem, min_games, engine, workers)
+    return _solve(problem, min_games, engine)
+
+
+def _solve(
+    problem: SearchProblem, min_games: int, engine: SearchEngine
+) -> set[Candidate]:
+    if SearchEngine(engine) is SearchEngine.DAG:
+        with profiling.stage("search.dag"):
+            index = WindowIndex(problem.sparse_graph, problem.days, problem.max_span)
+            return set(index.maximal_paths(min_games))
+    with profiling.stage("search.dfs"):
+        paths = dfs_paths(problem, min_games)
+    profiling.count("paths.raw", len(paths))
+    with profiling.stage("search.remove_subsequences"):
+        return remove_subsequences(paths)
+
+
+def day_chunks(days: Iterable[int], max_span: int) -> list[tuple[int, int]]:
+    """
+    `(first_day, last_day)` of consecutive chunks `max_span + 1` days wide
+    covering `days`, skipping the empty ones.
+    """
+    days = set(days)
+    width = max(max_span + 1, 1)
+    origin = min(days, default=0)
+    starts = sorted({day - (day - origin) % width for day in days})
+    return [(start, start + width - 1) for start in starts]
+
+
+def split_days(
+    problem: SearchProblem, chunks: Iterable[tuple[int, int]]
+) -> Iterator[Chunk]:
+    """
+    The `Chunk` of each `(first_day, last_day)`, built as they are consumed.
+    """
+    nodes = sorted(problem.days, key=problem.days.__getitem__)
+    days = [problem.days[node] for node in nodes]
+    margin = max(problem.max_span, 0)
+    for first_day, last_day in chunks:
+        lo = bisect_left(days, first_day - margin)
+        hi = bisect_right(days, last_day + margin)
+        window = set(nodes[lo:hi])
+        sparse_graph = {
+            node: {
+                v: gap for v, gap in problem.sparse_graph[node].items() if v in window
+            }
+            for node in window
+        }
+        days_in_window = {node: problem.days[node] for node in window}
+        yield Chunk(
+            SearchProblem(sparse_graph, days_in_window, problem.max_span),
+            first_day,
+            last_day,
+        )
+
+
+def chunk_paths(chunk: Chunk, min_games: int) -> list[Candidate]:
+    """
+    Maximal paths of the chunk's problem that start in the chunk, by start.
+    Only nodes within the span of a path decide whether it is maximal, so
+    they are the same as in the whole problem.
+    """
+    index = WindowIndex(*chunk.problem)
+    lo = bisect_left(index.days, chunk.first_day)
+    hi = bisect_right(index.days, chunk.last_day)
+    return [
+        path for start in range(lo, hi) for path in index.paths_from(start, min_games)
+    ]
+
+
+def chunked_paths(
+    chunks: Iterable[Chunk], min_games: int, workers: int = 1
+) -> Iterator[list[Candidate]]:
+    """
+    The paths of each chunk, in order. Chunks are built and solved one at a
+    time, or a few per worker process, so memory follows the density of the
+    timeline rather than its length.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            profiling.count("search.chunks")
+            with profiling.stage("search.chunk"):
+                paths = chunk_paths(chunk, min_games)
+            yield paths
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future] = deque()
+        for chunk in chunks:
+            profiling.count("search.chunks")
+            pending.append(executor.submit(chunk_paths, chunk, min_games))
+            if len(pending) >= workers * TASKS_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def dfs_paths(problem: SearchProblem, min_games: int) -> set[Candidate]:
+    """
+    Candidate paths of the recursive window DFS, before `remove_subsequences`.
+
+    A candidate that cannot grow to `min_games` within its days left, by
+    the `reach_table` bound, is not explored. Windows starting after its
+    first node were only reachable through it by sliding, so the search
+    starts again from its second node (or successors) instead.
+    """
+    sparse_graph, days = problem.sparse_graph, problem.days
+    reach = reach_table(problem)
+    paths: set[Candidate] = set()
+    visited: set[Candidate] = set()
+    calls = pruned = 0
+
+    def dfs(candidate: Candidate, days_left: int) -> bool:
+        nonlocal calls, pruned
+        calls += 1
+        if not candidate or candidate in visited:
+            return False
+
+        last_match = candidate[-1]
+        # no bound without a span: a window then holds single matches only
+        if (
+            days_left >= 0
+            and len(candidate) - 1 + reach[last_match][days_left] < min_games
+        ):
+            pruned += 1
+            restart = candidate[1:2] or sparse_graph[candidate[0]]
+            roots.extend(node for node in restart if node not in rooted)
+            rooted.update(restart)
+            return False
+        success = len(candidate) >= min_games
+        found_extension = False
+
+        for next_match, gap in sparse_graph[last_match].items():
+            if gap <= days_left:
+                new_candidate = candidate + (next_match,)
+                if dfs(new_candidate, days_left - gap):
+                    found_extension = True
+            else:
+                assert len(candidate) > 1
+                sub_candidate = candidate[1:]
+                if sub_candidate in visited:
+                    continue
+                dfs(sub_candidate, days_left + days[candidate[1]] - days[candidate[0]])
+
+        if success and not found_extension:
+            paths.add(tuple(candidate))
+        visited.add(candidate)
+        return success or found_extension
+
+    has_incoming = {v for outgoing in sparse_graph.values() for v in outgoing}
+    roots = deque(node for node in sparse_graph if node not in has_incoming)
+    rooted = set(roots)
+    while roots:
+        dfs((roots.popleft(),), problem.max_span)
+    profiling.count("dfs.calls", calls)
+    profiling.count("dfs.visited", len(visited))
+    profiling.count("dfs.pruned", pruned)
+    return paths
+
+
+def reach_table(problem: SearchProblem) -> dict[int, list[int]]:
+    """
+    `table[node][d]`: the most nodes a path from `node` can visit within `d`
+    days of it, `node` included, for `d` up to the span; one pass over the
+    nodes in reverse time order.
+    """
+    table: dict[int, list[int]] = {}
+    for node in sorted(problem.sparse_graph, key=problem.days.__getitem__)[::-1]:
+        after = [0] * (problem.max_span + 1)
+        for succ, gap in problem.sparse_graph[node].items():
+            after[gap:] = map(max, after[gap:], table[succ])
+        table[node] = [1 + n for n in after]
+    return table
+
+
+def weakly_connected_components(sparse_graph: SparseGraph) -> list[list[int]]:
+    """
+    Node sets of the components, each sorted, ordered by their smallest node.
+    """
+    parent = {node: node for node in sparse_graph}
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for u, outgoing in sparse_graph.items():
+        for v in outgoing:
+            root_u, root_v = find(u), find(v)
+            if root_u != root_v:
+                parent[max(root_u, root_v)] = min(root_u, root_v)
+
+    components: dict[int, list[int]] = {}
+    for node in sorted(sparse_graph):
+        components.setdefault(find(node), []).append(node)
+    return list(components.values())
+
+
+def split_problem(problem: SearchProblem, min_games: int) -> list[SearchProblem]:
+    """
+    One sub-problem per weakly connected component that can hold a path of
+    `min_games` matches, largest first. Maximal paths never cross components,
+    so the sub-problems' results simply add up.
+    """
+    components = [
+        component
+        for component in weakly_connected_components(problem.sparse_graph)
+        if len(component) >= min_games
+    ]
+    components.sort(key=len, reverse=True)
+    return [
+        SearchProblem(
+            {node: problem.sparse_graph[node] for node in component},
+            {node: problem.days[node] for node in component},
+            problem.max_span,
+        )
+        for component in components
+    ]
+
+
+def _parallel_maximal_paths(
+    problem: SearchProblem, min_games: int, engine: SearchEngine, workers: int
+) -> set[Candidate]:
+    problems = split_problem(problem, min_games)
+    if len(problems) <= 1:
+        return set().union(*(_solve(p, min_games, engine) for p in problems))
+    chunksize = max(1, len(problems) // (workers * TASKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _solve,
+            problems,
+            [min_games] * len(problems),
+            [engine] * len(problems),
+            chunksize=chunksize,
+        )
+        return set().union(*results)
@@ -0,0 +1,145 @@
+import hashlib
+from typing import Iterable
+from pathlib import Path
+
+import numpy as np
+
+import profiling
+from data_classes import Location, Match, MatchGraph, MatchTable
+from .builders import empty_graph
+from .csr import CsrGraph
+from .travel import TravelGraph
+
+SNAPSHOT_VERSION = 1
+SUFFIX = ".npz"
+
+
+def fixture_set_hash(matches: Iterable[Match]) -> str:
+    """
+    Order-independent digest of a fixture list.
+    """
+    digest = hashlib.sha256()
+    for m in sorted(matches, key=lambda m: (m.date, m.home_team, m.away_team)):
+        digest.update(
+            repr(
+                (m.home_team, m.away_team, m.date.isoformat(), tuple(m.location))
+            ).encode("utf-8")
+        )
+    return digest.hexdigest()[:16]
+
+
+def snapshot_key(matches: Iterable[Match], max_dist: float, max_days: int) -> str:
+    return f"{fixture_set_hash(matches)}-d{max_dist:g}-t{max_days}"
+
+
+def snapshot_path(directory: Path, travel_graph: TravelGraph) -> Path:
+    key = snapshot_key(
+        travel_graph.matches, travel_graph.max_dist, travel_graph.total_days
+    )
+    return directory / f"{key}{SUFFIX}"
+
+
+@profiling.profiled("snapshot.save")
+def save_snapshot(travel_graph: TravelGraph, path: Path) -> Path:
+    """
+    Write a built graph as compressed arrays: interned team names, kickoff
+    times, coordinates, the edge list and the equivalence groups.
+    """
+    matches = travel_graph.matches
+    sources, targets, days = _edges(travel_graph.graph)
+    groups = list(travel_graph.equiv_dict.values())
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        np.savez_compressed(
+            f,
+            version=np.array(SNAPSHOT_VERSION),
+            key=np.array(
+                snapshot_key(matches, travel_graph.max_dist, travel_graph.total_days)
+            ),
+            max_dist=np.array(travel_graph.max_dist, dtype=np.float64),
+            max_days=np.array(travel_graph.total_days),
+            teams=np.array(matches.teams, dtype=str),
+            home=matches.home,
+            away=matches.away,
+            kickoff=matches.kickoff,
+            utc_offset=matches.utc_offset,
+            coords=np.stack([matches.latitude, matches.longitude], axis=1),
+            edges=np.array([sources, targets, days], dtype=np.int32).reshape(3, -1),
+            group_members=np.array([i for g in groups for i in g], dtype=np.int32),
+            group_sizes=np.array([len(g) for g in groups], dtype=np.int32),
+        )
+    return path
+
+
+@profiling.profiled("snapshot.load")
+def load_snapshot(
+    path: Path, max_dist: float | None = None, max_days: int | None = None
+) -> TravelGraph:
+    """
+    Read a graph written by `save_snapshot`. Raises `ValueError` when it was
+    built with other limits than `max_dist` and `max_days`, where given, or
+    when its contents no longer match its key.
+    """
+    with np.load(path, allow_pickle=False) as npz:
+        data: dict[str, np.ndarray] = dict(npz.items())
+    if int(data["version"]) != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version in {path}")
+    coords, venue_ids = np.unique(data["coords"], axis=0, return_inverse=True)
+    matches = MatchTable(
+        data["teams"].tolist(),
+        data["home"],
+        data["away"],
+        data["kickoff"],
+        data["utc_offset"],
+        [Location(lat, lon) for lat, lon in coords.tolist()],
+        venue_ids.reshape(-1),
+    )
+    graph = empty_graph(len(matches))
+    for i, j, days in zip(*data["edges"].tolist()):
+        graph[i].outgoing[j] = days
+        graph[j].incoming[i] = days
+    members = data["group_members"].tolist()
+    bounds = np.cumsum(data["group_sizes"]).tolist()
+    groups = [members[start:end] for start, end in zip([0] + bounds, bounds)]
+    _check_limits(path, data, matches, max_dist, max_days)
+    return TravelGraph.from_parts(
+        matches,
+        graph,
+        {min(group): group for group in groups},
+        max_dist=float(data["max_dist"]),
+        max_days=int(data["max_days"]),
+    )
+
+
+def _check_limits(
+    path: Path,
+    data: dict[str, np.ndarray],
+    matches: MatchTable,
+    max_dist: float | None,
+    max_days: int | None,
+) -> None:
+    stored_dist, stored_days = float(data["max_dist"]), int(data["max_days"])
+    if max_dist is not None and stored_dist != max_dist:
+        raise ValueError(
+            f"Snapshot {path} was built with max_dist {stored_dist:g}, not {max_dist:g}"
+        )
+    if max_days is not None and stored_days != max_days:
+        raise ValueError(
+            f"Snapshot {path} was built with max_days {stored_days}, not {max_days}"
+        )
+    if snapshot_key(matches, stored_dist, stored_days) != str(data["key"]):
+        raise ValueError(f"Snapshot {path} does not match its key")
+
+
+def _edges(graph: MatchGraph | CsrGraph) -> tuple[list[int], list[int], list[int]]:
+    if isinstance(graph, CsrGraph):
+        out = graph.outgoing
+        return out.sources().tolist(), out.nodes.tolist(), out.days.tolist()
+    # Sorted by (source, target), which replays the builders' insertion order
+    edges = sorted(
+        (i, j, days)
+        for i, node in enumerate(graph)
+        for j, days in node.outgoing.items()
+    )
+    return [e[0] for e in edges], [e[1] for e in edges], [e[2] for e in edges]
@@ -0,0 +1,112 @@
+from itertools import product
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+import profiling
+from data_classes import GroupedPath, Match, MatchTable
+from venues import haversine_distance
+from .builders import EDGE_FUNCTIONS, GraphBuilder, Matches, graph_from_edges
+from .search import SearchEngine
+from .travel import TravelGraph
+
+
+class SweepPoint(NamedTuple):
+    max_dist: float
+    max_days: int
+    min_games: int
+
+
+class ParameterSweep:
+    """
+    Every combination of a few `max_dist`, `max_days` and `min_games` values
+    over one fixture list. The edges are found once, at the loosest limits,
+    and kept with their distance and day gap; the graph of tighter limits is
+    a filter of them. Each graph is searched once, at its lowest
+    `min_games`, and the higher ones filter those paths.
+    """
+
+    def __init__(
+        self,
+        matches: Matches,
+        max_dists: Iterable[float],
+        max_days: Iterable[int],
+        builder: GraphBuilder = GraphBuilder.GRID,
+    ):
+        self.matches = MatchTable.of(matches).sorted()
+        self.max_dists = sorted(set(max_dists))
+        self.max_days = sorted(set(max_days))
+        with profiling.stage("sweep.edges"):
+            edges = EDGE_FUNCTIONS[builder](
+                self.matches, self.max_dists[-1], self.max_days[-1]
+            )
+            table = np.array(list(edges), dtype=np.int64).reshape(-1, 3)
+            self.sources, self.targets, self.gaps = table.T
+            # the builders' own distance, so filtering gives exactly their edges
+            locations = self.matches.locations()
+            self.km = np.fromiter(
+                (
+                    haversine_distance(locations[i], locations[j])
+                    for i, j in zip(self.sources.tolist(), self.targets.tolist())
+                ),
+                float,
+                len(table),
+            )
+        profiling.gauge("sweep.edges", len(self.km))
+
+    def graph(self, max_dist: float, max_days: int) -> TravelGraph:
+        if max_dist > self.max_dists[-1] or max_days > self.max_days[-1]:
+            raise ValueError(
+                f"Limits {max_dist} km, {max_days} days are looser than the sweep's"
+            )
+        with profiling.stage("sweep.graph"):
+            keep = (self.km <= max_dist) & (self.gaps < max_days)
+            edges = zip(
+                self.sources[keep].tolist(),
+                self.targets[keep].tolist(),
+                self.gaps[keep].tolist(),
+            )
+            travel_graph = TravelGraph.from_parts(
+                self.matches,
+                graph_from_edges(len(self.matches), edges),
+                {},
+                max_dist=max_dist,
+                max_days=max_days,
+            )
+            groups = travel_graph.group_equivalent_nodes()
+            travel_graph.equiv_dict = {min(group): group for group in groups}
+        return travel_graph
+
+    def graphs(self) -> Iterator[tuple[float, int, TravelGraph]]:
+        """
+        One graph per `(max_dist, max_days)` pair, built as they are consumed.
+        """
+        for max_dist, max_days in product(self.max_dists, self.max_days):
+            yield max_dist, max_days, self.graph(max_dist, max_days)
+
+    def find_paths(
+        self,
+        min_games: Iterable[int],
+        engine: SearchEngine = SearchEngine.DAG,
+        grouped: bool = False,
+    ) -> dict[SweepPoint, list[list[Match]] | list[GroupedPath]]:
+        min_games = sorted(set(min_games))
+        return {
+            SweepPoint(max_dist, max_days, games): travel_graph.find_paths(
+                games, engine=engine, grouped=grouped
+            )
+            for max_dist, max_days, travel_graph in self.graphs()
+            for games in min_games
+        }
+
+    def count_paths(
+        self, min_games: Iterable[int], engine: SearchEngine = SearchEngine.DAG
+    ) -> dict[SweepPoint, int]:
+        min_games = sorted(set(min_games))
+        return {
+            SweepPoint(max_dist, max_days, games): travel_graph.count_paths(
+                games, engine=engine
+            )
+            for max_dist, max_days, travel_graph in self.graphs()
+            for games in min_games
+        }
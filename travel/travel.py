@@ -1,54 +1,110 @@
-from typing import TypeAlias
+import math
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable, Iterator, TypeAlias
 from collections import defaultdict
-from datetime import date
 
+import profiling
 from data_classes import (
     Match,
     MatchGraph,
-    NodeAdjacency,
+    MatchTable,
     Candidate,
     EquivalenceDict,
     WeightedAdjacencyDict,
+    GroupedPath,
 )
-from .utils import days_between, dist_between, remove_subsequences, all_equivalent_paths
+from venues import haversine_distance
+from .builders import GraphBackend, GraphBuilder, Matches, build_graph
+from .csr import CsrGraph
+from . import incremental
+from .output import format_option
+from .ranking import PathScore, TopPaths, top_paths
+from .search import (
+    Chunk,
+    SearchEngine,
+    SearchProblem,
+    WindowIndex,
+    chunked_paths,
+    day_chunks,
+    maximal_paths,
+)
+from .utils import all_equivalent_paths
 
 AdjacencyTuple: TypeAlias = tuple[tuple[int, int], ...]
-EquivalenceKey: TypeAlias = tuple[date, int, AdjacencyTuple, AdjacencyTuple]
+# (day ordinal, isolated node id or -1, incoming, outgoing)
+EquivalenceKey: TypeAlias = tuple[int, int, AdjacencyTuple, AdjacencyTuple]
+PathCacheKey: TypeAlias = tuple[int, SearchEngine]
 
 
 class TravelGraph:
-    matches: list[Match]
+    matches: MatchTable
+    max_dist: float
     total_days: int
-    graph: MatchGraph
+    graph: MatchGraph | CsrGraph
     equiv_dict: EquivalenceDict
+    _path_cache: dict[PathCacheKey, set[Candidate]]
 
-    def __init__(self, matches: list[Match], max_dist: int, max_days: int):
-        self.matches: list[Match] = sorted(matches, key=lambda m: m.date)
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        matches: Matches,
+        max_dist: int,
+        max_days: int,
+        builder: GraphBuilder = GraphBuilder.GRID,
+        *,
+        backend: GraphBackend = GraphBackend.DICT,
+    ):
+        self.matches = MatchTable.of(matches).sorted()
+        self.max_dist: float = max_dist
         self.total_days: int = max_days
-        self._init_graph(max_dist)
-        self.equiv_dict = {min(group): group for group in self.group_equivalent_nodes()}
-
-    def _init_graph(self, max_dist: int) -> None:
-        n = len(self.matches)
-        graph: list[NodeAdjacency] = [NodeAdjacency({}, {}) for _ in range(n)]
+        with profiling.stage("graph.build"):
+            self._init_graph(max_dist, builder, backend)
+        with profiling.stage("graph.group"):
+            groups = self.group_equivalent_nodes()
+        self.equiv_dict = {min(group): group for group in groups}
+        self._path_cache = {}
+        self._gauge_size()
 
-        for i, match_i in enumerate(self.matches):
-            for j in range(i + 1, n):
-                match_j = self.matches[j]
-                days = days_between(match_i, match_j)
+    @classmethod
+    def from_parts(  # pylint: disable=too-many-arguments
+        cls,
+        matches: Matches,
+        graph: MatchGraph | CsrGraph,
+        equiv_dict: EquivalenceDict,
+        *,
+        max_dist: float,
+        max_days: int,
+    ) -> "TravelGraph":
+        """
+        Reassemble an already built graph, e.g. from a snapshot.
+        `matches` must already be sorted by date.
+        """
+        travel_graph = cls.__new__(cls)
+        travel_graph.matches = MatchTable.of(matches)
+        travel_graph.max_dist = max_dist
+        travel_graph.total_days = max_days
+        travel_graph.graph = graph
+        travel_graph.equiv_dict = equiv_dict
+        travel_graph._path_cache = {}
+        travel_graph._gauge_size()
+        return travel_graph
 
-                if days >= self.total_days:
-                    break
-                if days == 0:
-                    continue
-                # TODO: memoization
-                if dist_between(match_i, match_j) > max_dist:
-                    continue
+    def _init_graph(
+        self, max_dist: int, builder: GraphBuilder, backend: GraphBackend
+    ) -> None:
+        self.graph = build_graph(
+            self.matches, max_dist, self.total_days, builder, backend
+        )
 
-                graph[i].outgoing[j] = days
-                graph[j].incoming[i] = days
+    def _gauge_size(self) -> None:
+        profiling.gauge("graph.matches", len(self.matches))
+        profiling.gauge("graph.edges", self.num_edges())
+        profiling.gauge("graph.equivalence_classes", len(self.equiv_dict))
 
-        self.graph = graph
+    def num_edges(self) -> int:
+        if isinstance(self.graph, CsrGraph):
+            return self.graph.num_edges()
+        return sum(len(node.outgoing) for node in self.graph)
 
     def group_equivalent_nodes(self) -> list[list[int]]:
         groups: dict[EquivalenceKey, list[int]] = defaultdict(list)
@@ -56,70 +112,311 @@ class TravelGraph:
             groups[self._equivalence_key(i)].append(i)
         return list(groups.values())
 
-    def find_paths(self, min_games: int) -> list[list[Match]]:
-        paths: set[Candidate] = set()
-        visited: set[Candidate] = set()
-        sparse_graph = self._sparse_graph()
+    def add_matches(self, matches: list[Match]) -> None:
+        self._update(removed=[], added=matches)
+
+    def remove_matches(self, matches: list[Match]) -> None:
+        self._update(removed=matches, added=[])
+
+    def update_match(self, old: Match, new: Match) -> None:
+        """
+        Replace `old`, e.g. with its rescheduled or relocated version.
+        """
+        self._update(removed=[old], added=[new])
+
+    def _update(self, removed: list[Match], added: list[Match]) -> None:
+        """
+        Apply a fixture change in place. Only the changed matches and their
+        neighbours get their edges and equivalence keys recomputed, and cached
+        paths are only searched again around the changed days; the rest of the
+        graph is just relabelled to the new match order. A CSR graph is edited
+        in its dict form and packed again.
+        """
+        days = self.matches.days.tolist()
+        removed_ids = self._locate(removed, days)
+        changed_days = {days[i] for i in removed_ids}
+        changed_days.update(incremental.day_ordinal(m) for m in added)
+        old_neighbours = {
+            j
+            for i in removed_ids
+            for j in (*self.graph[i].incoming, *self.graph[i].outgoing)
+        }
+
+        matches, relabel, added_ids = incremental.merge_matches(
+            self.matches, removed_ids, added
+        )
+        graph = incremental.relabel_graph(self.graph, relabel, len(matches))
+        days = [incremental.day_ordinal(m) for m in matches]
+        affected = {relabel[j] for j in old_neighbours if relabel[j] is not None}
+        affected.update(added_ids)
+        for i in added_ids:
+            affected |= incremental.connect(
+                graph,
+                matches,
+                days,
+                i,
+                max_dist=self.max_dist,
+                max_days=self.total_days,
+            )
+
+        groups = [
+            [relabel[m] for m in group if relabel[m] is not None]
+            for group in self.equiv_dict.values()
+        ]
+        csr = isinstance(self.graph, CsrGraph)
+        self.matches, self.graph = MatchTable.from_matches(matches), graph
+        self._regroup(groups, affected)
+        if csr:
+            self.graph = CsrGraph.from_match_graph(graph)
+        self._repair_paths(relabel, days, changed_days)
+
+    def _locate(self, matches: list[Match], days: list[int]) -> set[int]:
+        ids: set[int] = set()
+        for m in matches:
+            ids.add(incremental.locate(self.matches, days, m, ids))
+        return ids
+
+    def _regroup(self, groups: list[list[int]], affected: set[int]) -> None:
+        group_of: dict[int, list[int]] = {}
+        for group in groups:
+            members = [m for m in group if m not in affected]
+            for m in members:
+                group_of[m] = members
+        for node in sorted(affected):
+            key = self._equivalence_key(node)
+            group = next(
+                (
+                    group_of[other]
+                    for other in self._equivalence_candidates(node)
+                    if other in group_of and self._equivalence_key(other) == key
+                ),
+                [],
+            )
+            insort(group, node)
+            group_of[node] = group
+        self.equiv_dict = dict(sorted((group[0], group) for group in group_of.values()))
 
-        def dfs(candidate: Candidate, days_left: int) -> bool:
-            if not candidate or candidate in visited:
-                return False
+    def _equivalence_candidates(self, i: int) -> Iterable[int]:
+        """
+        Nodes that can share `i`'s equivalence key: equivalent nodes have the
+        same neighbours, so they all share any neighbour of `i`.
+        """
+        node = self.graph[i]
+        if node.outgoing:
+            return self.graph[next(iter(node.outgoing))].incoming
+        if node.incoming:
+            return self.graph[next(iter(node.incoming))].outgoing
+        return ()
 
-            last_match = candidate[-1]
-            success = len(candidate) >= min_games
-            found_extension = False
+    def _repair_paths(
+        self, relabel: incremental.Relabel, days: list[int], changed_days: set[int]
+    ) -> None:
+        """
+        A maximal path's status only depends on matches within `max_days` of
+        it, so cached paths near a changed day are dropped and searched again
+        on the graph around it; paths further away are only relabelled.
+        """
+        # without a span only the changed days themselves are searched again
+        span = max(self.total_days - 1, 0)
+        zones = incremental.day_intervals(changed_days, span)
+        for (min_games, engine), paths in self._path_cache.items():
+            kept = set()
+            for path in paths:
+                new_path = tuple(relabel[node] for node in path)
+                if None not in new_path and not any(
+                    incremental.in_intervals(days[node], zones) for node in new_path
+                ):
+                    kept.add(new_path)
+            for lo, hi in zones:
+                problem = self._search_problem(days, lo - span, hi + span)
+                kept.update(
+                    path
+                    for path in maximal_paths(problem, min_games, engine)
+                    if any(lo <= days[node] <= hi for node in path)
+                )
+            self._path_cache[(min_games, engine)] = kept
 
-            for next_match, days in sparse_graph[last_match].items():
-                if days <= days_left:
-                    new_candidate = candidate + (next_match,)
-                    if dfs(new_candidate, days_left - days):
-                        found_extension = True
+    def find_paths(
+        self,
+        min_games: int,
+        engine: SearchEngine = SearchEngine.DFS,
+        grouped: bool = False,
+        workers: int = 1,
+    ) -> list[list[Match]] | list[GroupedPath]:
+        """
+        Maximal paths of at least `min_games` matches. With `grouped`, each path
+        is returned once as a `GroupedPath` of interchangeable matches instead
+        of once per combination. With several `workers`, independent parts of
+        the graph are searched in parallel processes. Paths are sorted by their
+        match ids, which follow kickoff order.
+        """
+        paths = self._maximal_paths(min_games, engine, workers)
+        if grouped:
+            paths = sorted(paths)
+            return [self._grouped_path(path) for path in paths]
+        with profiling.stage("search.expand"):
+            paths = all_equivalent_paths(paths, self.equiv_dict)
+        profiling.count("paths.expanded", len(paths))
+        paths = sorted(paths)
+        return [[self.matches[m] for m in path] for path in paths]
+
+    def count_paths(
+        self,
+        min_games: int,
+        engine: SearchEngine = SearchEngine.DFS,
+        workers: int = 1,
+    ) -> int:
+        """
+        Number of paths `find_paths` would return, without expanding them.
+        """
+        paths = self._maximal_paths(min_games, engine, workers)
+        return sum(
+            math.prod(len(self.equiv_dict[node]) for node in path) for path in paths
+        )
+
+    def find_top_paths(
+        self,
+        k: int,
+        min_games: int = 1,
+        score: PathScore = PathScore.GAMES,
+        deadline: float | None = None,
+    ) -> TopPaths:
+        """
+        The first `k` paths of `find_paths` once ranked by `score`, found by
+        branch and bound instead of enumerating and expanding every path. If
+        `deadline` seconds pass first, the best paths found so far are
+        returned, marked incomplete.
+        """
+        stop_at = None if deadline is None else time.monotonic() + deadline
+        with profiling.stage("search.top"):
+            paths, complete = top_paths(
+                self._window_index(),
+                self.equiv_dict,
+                self._distance,
+                k,
+                min_games,
+                score=score,
+                stop_at=stop_at,
+            )
+        return TopPaths([[self.matches[m] for m in path] for path in paths], complete)
+
+    def _distance(self, i: int, j: int) -> float:
+        return haversine_distance(self.matches.location(i), self.matches.location(j))
+
+    def iter_paths(
+        self, min_games: int, grouped: bool = False
+    ) -> Iterator[list[Match]] | Iterator[GroupedPath]:
+        """
+        Stream the paths of `find_paths`, each yielded as soon as the chunked
+        engine has confirmed it is maximal. Paths come ordered by their first
+        representative match rather than fully sorted.
+        """
+        for paths in chunked_paths(self._chunks(), min_games):
+            for path in paths:
+                if grouped:
+                    yield self._grouped_path(path)
                 else:
-                    assert len(candidate) > 1
-                    sub_candidate = candidate[1:]
-                    if sub_candidate in visited:
-                        continue
-                    gap = self._days_between(candidate[0], candidate[1])
-                    dfs(sub_candidate, days_left + gap)
-
-            if success and not found_extension:
-                paths.add(tuple(candidate))
-            visited.add(candidate)
-            return success or found_extension
-
-        root_matches = [x for x in sparse_graph.keys() if not self.graph[x].incoming]
-        for match_index in root_matches:
-            dfs((match_index,), self.total_days - 1)
-
-        paths = remove_subsequences(paths)
-        paths = all_equivalent_paths(paths, self.equiv_dict)
-        match_paths = [[self.matches[m] for m in path] for path in paths]
-        return sorted(match_paths, key=lambda path: path[0].date)
-
-    def format_paths(self, schedule_options: list[list[Match]]) -> str:
+                    yield from self._grouped_path(path).expand()
+
+    def _maximal_paths(
+        self, min_games: int, engine: SearchEngine, workers: int
+    ) -> set[Candidate]:
+        """
+        Maximality does not depend on `min_games`, so the paths cached for a
+        lower `min_games` only need filtering.
+        """
+        key = (min_games, SearchEngine(engine))
+        if key not in self._path_cache:
+            lower = [m for m, e in self._path_cache if e is key[1] and m < min_games]
+            if lower:
+                cached = self._path_cache[(max(lower), key[1])]
+                paths = {path for path in cached if len(path) >= min_games}
+            else:
+                with profiling.stage("search"):
+                    paths = self._search(min_games, engine, workers)
+            self._path_cache[key] = paths
+            profiling.count("paths.maximal", len(paths))
+        return self._path_cache[key]
+
+    def _search(
+        self, min_games: int, engine: SearchEngine, workers: int
+    ) -> set[Candidate]:
+        if SearchEngine(engine) is SearchEngine.CHUNKED:
+            chunks = chunked_paths(self._chunks(), min_games, workers)
+            return set().union(*chunks)
+        return maximal_paths(self._search_problem(), min_games, engine, workers)
+
+    def _chunks(self) -> Iterator[Chunk]:
+        """
+        Chunks of the timeline, each built from the graph around its own days,
+        so the search problem of the whole horizon never exists at once.
+        """
+        days = self.matches.days.tolist()
+        span = self.total_days - 1
+        margin = max(span, 0)
+        for first_day, last_day in day_chunks(days, span):
+            problem = self._search_problem(days, first_day - margin, last_day + margin)
+            yield Chunk(problem, first_day, last_day)
+
+    def _window_index(self) -> WindowIndex:
+        return WindowIndex(*self._search_problem())
+
+    def _search_problem(
+        self,
+        days: list[int] | None = None,
+        first_day: int | None = None,
+        last_day: int | None = None,
+    ) -> SearchProblem:
+        """
+        Search input over the representative nodes, optionally only those
+        between `first_day` and `last_day` (day ordinals, given `days`).
+        """
+        nodes: Iterable[int] = self.equiv_dict.keys()
+        if days is not None:
+            window = range(bisect_left(days, first_day), bisect_right(days, last_day))
+            nodes = [node for node in window if node in self.equiv_dict]
+        all_days = self.matches.days
+        node_days = {node: int(all_days[node]) for node in nodes}
+        return SearchProblem(
+            self._sparse_graph(node_days.keys()), node_days, self.total_days - 1
+        )
+
+    def format_paths(
+        self, schedule_options: list[list[Match]] | list[GroupedPath]
+    ) -> str:
         lines = []
         for option_idx, schedule in enumerate(schedule_options, start=1):
-            lines.append(f"Option {option_idx}:")
-            for gd in schedule:
-                # matches_str = " | ".join(map(str, gd.matches))
-                lines.append(f"  {gd.date.strftime('%Y-%m-%d')}: [{gd}]")
+            lines.extend(format_option(option_idx, schedule))
         return "\n".join(lines)
 
-    def _days_between(self, i: int, j: int) -> int:
-        return days_between(self.matches[i], self.matches[j])
+    def _grouped_path(self, path: Candidate) -> GroupedPath:
+        return GroupedPath(
+            tuple(
+                tuple(self.matches[m] for m in self.equiv_dict[node]) for node in path
+            )
+        )
 
     def _equivalence_key(self, i: int) -> EquivalenceKey:
-        incoming = tuple(self.graph[i].incoming.items())
-        outgoing = tuple(self.graph[i].outgoing.items())
+        if isinstance(self.graph, CsrGraph):
+            incoming = self.graph.incoming.items(i)
+            outgoing = self.graph.outgoing.items(i)
+        else:
+            incoming = tuple(self.graph[i].incoming.items())
+            outgoing = tuple(self.graph[i].outgoing.items())
         isolated_key = i if not (incoming or outgoing) else -1
-        return (self.matches[i].date.date(), isolated_key, incoming, outgoing)
+        return (int(self.matches.days[i]), isolated_key, incoming, outgoing)
 
-    def _sparse_graph(self) -> dict[int, WeightedAdjacencyDict]:
+    def _sparse_graph(
+        self, nodes: Iterable[int] | None = None
+    ) -> dict[int, WeightedAdjacencyDict]:
+        nodes = self.equiv_dict.keys() if nodes is None else nodes
+        if isinstance(self.graph, CsrGraph):
+            return self.graph.subgraph(nodes)
         return {
             node: {
                 neighbour: weight
                 for neighbour, weight in self.graph[node].outgoing.items()
-                if neighbour in self.equiv_dict.keys()
+                if neighbour in nodes
             }
-            for node in self.equiv_dict.keys()
+            for node in nodes
         }
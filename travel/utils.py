@@ -1,6 +1,7 @@
 from typing import Iterable
 from datetime import datetime
 from itertools import product
+from collections import defaultdict
 
 from venues import haversine_distance
 from data_classes import Match, EquivalenceDict, Candidate
@@ -19,13 +20,32 @@ def dist_between(m1: Match, m2: Match) -> float:
 
 
 def remove_subsequences(tuples_set: set[Candidate]) -> set[Candidate]:
-    result = set()
-    tuples_list = sorted(tuples_set, key=len, reverse=True)
-    for tpl in tuples_list:
-        if any(is_subsequence(tpl, other) for other in result):
+    """
+    Keep the tuples that are not a subsequence of another one. Accepted tuples
+    are indexed by element, so a candidate is only compared with the accepted
+    tuples that contain all of its elements.
+    """
+    accepted: list[Candidate] = []
+    containing: dict[int, set[int]] = defaultdict(set)
+    for tpl in sorted(tuples_set, key=len, reverse=True):
+        if any(is_subsequence(tpl, accepted[i]) for i in _supersets(tpl, containing)):
             continue
-        result.add(tpl)
-    return result
+        for element in tpl:
+            containing[element].add(len(accepted))
+        accepted.append(tpl)
+    return set(accepted)
+
+
+def _supersets(tpl: Candidate, containing: dict[int, set[int]]) -> set[int]:
+    if not tpl:
+        return set().union(*containing.values())
+    postings = sorted((containing.get(x, set()) for x in set(tpl)), key=len)
+    found = set(postings[0])
+    for posting in postings[1:]:
+        if not found:
+            break
+        found &= posting
+    return found
 
 
 def is_subsequence(list1: Iterable[int], list2: Iterable[int]) -> bool:
@@ -1 +1,18 @@
-from .venues import geocode_with_cache, haversine_distance
+from .venues import (
+    geocode_with_cache,
+    geocode_batch,
+    get_store,
+    set_store,
+    set_rate_limit,
+    haversine_distance,
+    haversine_distances,
+)
+from .spatial import SpatialIndex
+from .store import (
+    VenueEntry,
+    VenueStore,
+    SqliteVenueStore,
+    JsonVenueStore,
+    normalize_venue,
+)
+from .matrix import DistanceMatrix, get_distance_matrix, set_distance_matrix
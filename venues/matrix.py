@@ -0,0 +1,113 @@
+import os
+import threading
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from data_classes import Location
+from .venues import PROJECT_ROOT, haversine_distance
+
+MATRIX_FILE = PROJECT_ROOT / "venues" / "distance_matrix.npy"
+MATRIX_VENUES_FILE = PROJECT_ROOT / "venues" / "distance_venues.npy"
+
+_matrix: "DistanceMatrix | None" = None
+
+
+class DistanceMatrix:
+    """
+    Interns venues to integer ids, in order of first appearance, and keeps the
+    km distance between every pair of them. Entries are computed with the
+    scalar `haversine_distance(venues[i], venues[j])`, so a lookup gives
+    exactly what `dist_between` would.
+
+    With a `path`, the matrix is saved as `.npy` files and read back
+    memory-mapped, so processes share one copy of it through the page cache.
+    New venues only add their rows and columns; the file is then rewritten
+    atomically.
+    """
+
+    def __init__(self, path: Path | None = None, venues_path: Path | None = None):
+        self.path = path
+        self.venues_path = venues_path
+        self._lock = threading.Lock()
+        self._venues: list[Location] = []
+        self._ids: dict[Location, int] = {}
+        self._distances = np.zeros((0, 0))
+        if path and venues_path and path.exists() and venues_path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._venues)
+
+    @property
+    def distances(self) -> np.ndarray:
+        return self._distances
+
+    def venue(self, venue_id: int) -> Location:
+        return self._venues[venue_id]
+
+    def intern(self, locations: Iterable[Location]) -> np.ndarray:
+        """
+        Ids of `locations`, adding the unknown ones to the matrix.
+        """
+        locations = [Location(*loc) for loc in locations]
+        with self._lock:
+            new = [loc for loc in dict.fromkeys(locations) if loc not in self._ids]
+            if new:
+                self._extend(new)
+            return np.array([self._ids[loc] for loc in locations], dtype=np.int32)
+
+    def _extend(self, new: list[Location]) -> None:
+        old_size = len(self._venues)
+        venues = self._venues + new
+        distances = np.empty((len(venues), len(venues)))
+        distances[:old_size, :old_size] = self._distances
+        for i in range(old_size, len(venues)):
+            for j, other in enumerate(venues):
+                distances[i, j] = haversine_distance(venues[i], other)
+                distances[j, i] = haversine_distance(other, venues[i])
+        self._venues = venues
+        self._ids.update((loc, i) for i, loc in enumerate(new, start=old_size))
+        self._distances = distances
+        if self.path and self.venues_path:
+            self._save()
+
+    def _load(self) -> None:
+        coords = np.load(self.venues_path)
+        distances = np.load(self.path, mmap_mode="r")
+        if distances.shape != (len(coords), len(coords)):
+            return
+        self._venues = [Location(lat, lon) for lat, lon in coords.tolist()]
+        self._ids = {loc: i for i, loc in enumerate(self._venues)}
+        self._distances = distances
+
+    def _save(self) -> None:
+        # venues first: a reader that sees the new venues with the old matrix
+        # finds the shapes disagree and starts afresh instead of misreading
+        _save_npy(self.venues_path, np.array(self._venues, dtype=float).reshape(-1, 2))
+        _save_npy(self.path, self._distances)
+        self._distances = np.load(self.path, mmap_mode="r")
+
+
+def _save_npy(path: Path, array: np.ndarray) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp.npy")
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+def get_distance_matrix() -> DistanceMatrix:
+    global _matrix  # pylint: disable=global-statement
+    if _matrix is None:
+        _matrix = DistanceMatrix(MATRIX_FILE, MATRIX_VENUES_FILE)
+    return _matrix
+
+
+def set_distance_matrix(matrix: DistanceMatrix | None) -> None:
+    """
+    Swap the shared matrix, e.g. for an in-memory one; `None` reopens the
+    default files on next use.
+    """
+    global _matrix  # pylint: disable=global-statement
+    _matrix = matrix
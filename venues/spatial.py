@@ -0,0 +1,92 @@
+import math
+from bisect import bisect_left
+from collections import defaultdict
+from heapq import merge
+
+from data_classes import Location
+from .venues import EARTH_RADIUS_KM
+
+# Cells never get narrower than this (radians), so `max_dist == 0` still works.
+MIN_CELL_RAD = 1e-9
+# Slack on the reject thresholds, so float rounding never drops a real neighbour.
+REJECT_SLACK = 1e-9
+
+GridCell = tuple[int, int]
+
+
+class SpatialIndex:  # pylint: disable=too-many-instance-attributes
+    """
+    Lat/lon grid over a list of locations. Cells are sized from `max_dist` so
+    that any two locations at most `max_dist` km apart fall in the same or in
+    neighbouring cells, and each cell keeps its location indices sorted.
+    """
+
+    def __init__(self, locations: list[Location], max_dist: float):
+        self.max_dist = max_dist
+        self._lat = [math.radians(loc.latitude) for loc in locations]
+        self._lon = [math.radians(loc.longitude) for loc in locations]
+
+        max_angle = max(max_dist, 0.0) / EARTH_RADIUS_KM
+        self.lat_reach = max_angle * (1 + REJECT_SLACK) + REJECT_SLACK
+        self.lon_reach = _longitude_reach(max_angle, self._lat)
+        self._cell_lat = max(self.lat_reach, MIN_CELL_RAD)
+        lon_cells = int(2 * math.pi / max(self.lon_reach, MIN_CELL_RAD))
+        self._lon_cells = lon_cells if lon_cells >= 3 else 1
+
+        self._cells: dict[GridCell, list[int]] = defaultdict(list)
+        for i in range(len(locations)):
+            self._cells[self.cell(i)].append(i)
+
+    def cell(self, i: int) -> GridCell:
+        lat_cell = math.floor(self._lat[i] / self._cell_lat)
+        lon_cell = math.floor(
+            (self._lon[i] + math.pi) / (2 * math.pi) * self._lon_cells
+        )
+        return lat_cell, lon_cell % self._lon_cells
+
+    def neighbour_cells(self, i: int) -> set[GridCell]:
+        lat_cell, lon_cell = self.cell(i)
+        return {
+            (lat_cell + d_lat, (lon_cell + d_lon) % self._lon_cells)
+            for d_lat in (-1, 0, 1)
+            for d_lon in (-1, 0, 1)
+        }
+
+    def neighbours(self, i: int, lo: int = 0, hi: int | None = None) -> list[int]:
+        """
+        Sorted indices `j` in `[lo, hi)` that may lie within `max_dist` of `i`:
+        every true neighbour is returned, most far-away locations are not.
+        """
+        hi = len(self._lat) if hi is None else hi
+        candidates = []
+        for cell in self.neighbour_cells(i):
+            members = self._cells.get(cell)
+            if members:
+                start = bisect_left(members, lo)
+                candidates.append(members[start : bisect_left(members, hi, start)])
+        return [j for j in merge(*candidates) if not self.rejects(i, j)]
+
+    def rejects(self, i: int, j: int) -> bool:
+        """
+        Cheap bounding-box test: True only if `i` and `j` are certainly more than
+        `max_dist` apart.
+        """
+        if abs(self._lat[i] - self._lat[j]) > self.lat_reach:
+            return True
+        dlon = abs(self._lon[i] - self._lon[j]) % (2 * math.pi)
+        return min(dlon, 2 * math.pi - dlon) > self.lon_reach
+
+
+def _longitude_reach(max_angle: float, latitudes: list[float]) -> float:
+    """
+    Largest longitude difference two of the given latitudes can have while still
+    being `max_angle` apart on the sphere, from the haversine bound
+    `sin(d / 2) >= cos(lat) * sin(dlon / 2)` at the most poleward latitude.
+    """
+    min_cos = min((math.cos(lat) for lat in latitudes), default=1.0)
+    if max_angle / 2 >= math.pi / 2 or min_cos <= 0:
+        return math.pi
+    ratio = math.sin(max_angle / 2) / min_cos
+    if ratio >= 1:
+        return math.pi
+    return 2 * math.asin(ratio) * (1 + REJECT_SLACK) + REJECT_SLACK
@@ -0,0 +1,216 @@
+import os
+import json
+import sqlite3
+import threading
+import unicodedata
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from data_classes import Location
+
+
+class VenueEntry(NamedTuple):
+    location: Location | None  # None: the geocoder found nothing
+    expires_at: float | None = None  # when a negative entry may be retried
+
+
+def normalize_venue(query: str) -> str:
+    """
+    Index key of a venue query: accents, case, punctuation and whitespace are
+    dropped, so that spelling variants of one stadium share an entry.
+    """
+    decomposed = unicodedata.normalize("NFKD", query)
+    chars = (
+        c if c.isalnum() else " "
+        for c in decomposed.casefold()
+        if not unicodedata.combining(c)
+    )
+    return " ".join("".join(chars).split())
+
+
+class VenueStore(ABC):
+    @abstractmethod
+    def get(self, query: str) -> VenueEntry | None: ...
+
+    @abstractmethod
+    def put_many(self, entries: dict[str, VenueEntry]) -> None: ...
+
+    @abstractmethod
+    def items(self) -> Iterator[tuple[str, VenueEntry]]:
+        """
+        All entries, as (query as first seen, entry).
+        """
+
+    def put(self, query: str, entry: VenueEntry) -> None:
+        self.put_many({query: entry})
+
+
+class SqliteVenueStore(VenueStore):
+    """
+    SQLite-backed store: point lookups, batched upserts in one transaction, and
+    WAL journaling so several processes can read and write it at once. The
+    database is opened on first use, importing `legacy` entries if it is empty.
+    """
+
+    def __init__(self, path: Path, legacy: VenueStore | None = None):
+        self.path = path
+        self._legacy = legacy
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def get(self, query: str) -> VenueEntry | None:
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT latitude, longitude, expires_at FROM venues WHERE key = ?",
+                    (normalize_venue(query),),
+                )
+                .fetchone()
+            )
+        return _entry(*row) if row else None
+
+    def put_many(self, entries: dict[str, VenueEntry]) -> None:
+        if not entries:
+            return
+        with self._lock:
+            _upsert(self._connection(), entries)
+
+    def items(self) -> Iterator[tuple[str, VenueEntry]]:
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT query, latitude, longitude, expires_at FROM venues "
+                    "ORDER BY key"
+                )
+                .fetchall()
+            )
+        for query, *row in rows:
+            yield query, _entry(*row)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is not None:
+            return self._db
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        with db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS venues (
+                    key TEXT PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    latitude REAL,
+                    longitude REAL,
+                    expires_at REAL
+                )
+                """)
+        if self._legacy and not db.execute("SELECT 1 FROM venues").fetchone():
+            _upsert(db, dict(self._legacy.items()))
+        self._db = db
+        return db
+
+
+class JsonVenueStore(VenueStore):
+    """
+    The original whole-file format: `{query: [lat, lon]}` plus a file of
+    `{query: expires_at}` for negative entries. Loaded on first use and fully
+    rewritten on every batch, so only suited to a single process.
+    """
+
+    def __init__(self, path: Path, missing_path: Path):
+        self.path = path
+        self.missing_path = missing_path
+        self._entries: dict[str, tuple[str, VenueEntry]] | None = None
+        self._lock = threading.Lock()
+
+    def get(self, query: str) -> VenueEntry | None:
+        with self._lock:
+            found = self._load().get(normalize_venue(query))
+        return found[1] if found else None
+
+    def put_many(self, entries: dict[str, VenueEntry]) -> None:
+        if not entries:
+            return
+        with self._lock:
+            loaded = self._load()
+            for query, entry in entries.items():
+                first_seen = loaded.get(normalize_venue(query), (query, entry))[0]
+                loaded[normalize_venue(query)] = (first_seen, entry)
+            found = {q: list(e.location) for q, e in loaded.values() if e.location}
+            missing = {q: e.expires_at for q, e in loaded.values() if not e.location}
+            _write_json(self.path, found)
+            _write_json(self.missing_path, missing)
+
+    def items(self) -> Iterator[tuple[str, VenueEntry]]:
+        with self._lock:
+            entries = list(self._load().values())
+        yield from entries
+
+    def _load(self) -> dict[str, tuple[str, VenueEntry]]:
+        if self._entries is None:
+            self._entries = {}
+            for query, (lat, lon) in _read_json(self.path).items():
+                self._entries[normalize_venue(query)] = (
+                    query,
+                    VenueEntry(Location(lat, lon)),
+                )
+            for query, expires_at in _read_json(self.missing_path).items():
+                self._entries.setdefault(
+                    normalize_venue(query), (query, VenueEntry(None, expires_at))
+                )
+        return self._entries
+
+
+def _upsert(db: sqlite3.Connection, entries: dict[str, VenueEntry]) -> None:
+    with db:
+        db.executemany(
+            """
+            INSERT INTO venues (key, query, latitude, longitude, expires_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                latitude = excluded.latitude,
+                longitude = excluded.longitude,
+                expires_at = excluded.expires_at
+            """,
+            [(normalize_venue(q), q, *_row(e)) for q, e in entries.items()],
+        )
+
+
+def _entry(
+    latitude: float | None, longitude: float | None, expires_at: float | None
+) -> VenueEntry:
+    if latitude is None or longitude is None:
+        return VenueEntry(None, expires_at)
+    return VenueEntry(Location(latitude, longitude))
+
+
+def _row(entry: VenueEntry) -> tuple[float | None, float | None, float | None]:
+    if entry.location is None:
+        return None, None, entry.expires_at
+    return entry.location.latitude, entry.location.longitude, None
+
+
+def _read_json(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        return {}
+
+
+def _write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
+    os.replace(tmp_path, path)
@@ -1,52 +1,125 @@
-import json
 import time
 import logging
 import math
 from pathlib import Path
+from typing import Iterable
 
+import numpy as np
+
+import profiling
 from connectors import open_street_map
+from connectors.rate_limit import TokenBucket
 from data_classes import Location
+from .store import (
+    JsonVenueStore,
+    SqliteVenueStore,
+    VenueEntry,
+    VenueStore,
+    normalize_venue,
+)
 
 # Locate project root (TRAVEL_FOOT) from this file’s location
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STORE_FILE = PROJECT_ROOT / "venues" / "venues.sqlite3"
+# Legacy JSON caches, imported into the store the first time it is opened
 CACHE_FILE = PROJECT_ROOT / "venues" / "venues.json"
+MISSING_FILE = PROJECT_ROOT / "venues" / "missing_venues.json"
+MISSING_TTL_SECONDS = 7 * 24 * 3600.0
+# Nominatim's usage policy allows 1 request/sec
+REQUESTS_PER_SECOND = 1.0
+# Batches are flushed to the store after this many geocoder calls
+FLUSH_EVERY = 20
+EARTH_RADIUS_KM = 6371.0
 
 
 logger = logging.getLogger(__name__)
-_cache: dict[str, tuple[float, float]] = {}
+_store: VenueStore | None = None
+_limiter = TokenBucket(rate=REQUESTS_PER_SECOND, capacity=1)
+
+
+def get_store() -> VenueStore:
+    global _store  # pylint: disable=global-statement
+    if _store is None:
+        _store = SqliteVenueStore(
+            STORE_FILE, legacy=JsonVenueStore(CACHE_FILE, MISSING_FILE)
+        )
+    return _store
 
-if CACHE_FILE.exists():
-    try:
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            _cache = json.load(f)
-    except json.JSONDecodeError:
-        _cache = {}
+
+def set_store(store: VenueStore | None) -> None:
+    """
+    Swap the venue store, e.g. for a `JsonVenueStore`; `None` reopens the default
+    SQLite store on next lookup.
+    """
+    global _store  # pylint: disable=global-statement
+    _store = store
 
 
-def save_cache() -> None:
-    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(CACHE_FILE, "w", encoding="utf-8") as cf:
-        json.dump(_cache, cf, indent=2, sort_keys=True, ensure_ascii=False)
+def set_rate_limit(requests_per_second: float | None) -> None:
+    """
+    Replace the geocoder throttle, e.g. for a local stub; `None` restores
+    `REQUESTS_PER_SECOND`.
+    """
+    global _limiter  # pylint: disable=global-statement
+    _limiter = TokenBucket(rate=requests_per_second or REQUESTS_PER_SECOND, capacity=1)
 
 
 def geocode_with_cache(query: str) -> Location | None:
-    # TODO: consider unicoded query
-    if query in _cache:
-        lat, lon = _cache[query]
-        return Location(lat, lon)
+    found, location = _lookup(query)
+    if found:
+        return location
+
+    entry = _geocode(query)
+    get_store().put(query, entry)
+    return entry.location
 
-    # Throttle: respect Nominatim's 1 request/sec
-    time.sleep(1)
+
+def geocode_batch(queries: Iterable[str]) -> dict[str, Location | None]:
+    """
+    Geocode many venues at once: duplicates and spelling variants are looked up
+    once, cache misses go to Nominatim through the shared rate limiter, and new
+    entries are written to the store in batches rather than one by one.
+    """
+    locations: dict[str, Location | None] = {}
+    misses: dict[str, list[str]] = {}
+    for query in dict.fromkeys(queries):
+        found, locations[query] = _lookup(query)
+        if not found:
+            misses.setdefault(normalize_venue(query), []).append(query)
+
+    pending: dict[str, VenueEntry] = {}
+    for variants in misses.values():
+        pending[variants[0]] = entry = _geocode(variants[0])
+        locations.update((query, entry.location) for query in variants)
+        if len(pending) >= FLUSH_EVERY:
+            get_store().put_many(pending)
+            pending = {}
+    get_store().put_many(pending)
+    return locations
+
+
+def _lookup(query: str) -> tuple[bool, Location | None]:
+    entry = get_store().get(query)
+    if entry is None or (
+        entry.location is None and (entry.expires_at or 0.0) <= time.time()
+    ):
+        profiling.count("geocode.cache_misses")
+        return False, None
+    profiling.count("geocode.cache_hits")
+    return True, entry.location
+
+
+def _geocode(query: str) -> VenueEntry:
+    profiling.count("geocode.rate_limit_wait_seconds", _limiter.acquire())
     data = open_street_map.venue_location(query)
 
     if not data:
+        profiling.count("geocode.not_found")
         logger.error("No geocoding data found for query: %s", query)
-        return None
+        return VenueEntry(None, expires_at=time.time() + MISSING_TTL_SECONDS)
 
     lat, lon = (float(data[0]["lat"]), float(data[0]["lon"]))
-    _cache[query] = (lat, lon)
-    save_cache()
-    return Location(lat, lon)
+    return VenueEntry(Location(lat, lon))
 
 
 def haversine_distance(loc1: Location, loc2: Location) -> float:
@@ -63,5 +136,19 @@ def haversine_distance(loc1: Location, loc2: Location) -> float:
         + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
     )
     c = 2 * math.asin(math.sqrt(a))
-    radius_earth_km = 6371.0
-    return radius_earth_km * c
+    return EARTH_RADIUS_KM * c
+
+
+def haversine_distances(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized haversine over coordinates given in radians, in kilometers.
+    Inputs broadcast against each other, so passing column and row vectors
+    yields the full pairwise distance block.
+    """
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    c = 2 * np.arcsin(np.sqrt(a))
+    return EARTH_RADIUS_KM * c